@@ -0,0 +1,241 @@
+#!/usr/bin/python
+# ================================
+# (C)2026 Dmytro Holub
+# heap3d@gmail.com
+# --------------------------------
+# kit benchmark
+# EMAG
+# time every kit command listed in index.cfg on synthetic headless scenes
+# usage:
+# python -m bench.run --scenes wide deep --sizes 1000 10000 --output bench.json
+# python -m bench.run --sizes 1000 --baseline bench.json
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import re
+import sys
+import tempfile
+import time
+from typing import Any, Callable
+
+import headless
+
+headless.install()
+
+from headless.fake_modo import Item  # noqa: E402
+from bench.scenes import SCENES, build_scene  # noqa: E402
+
+
+INDEX_CFG = os.path.join(headless.KIT_ROOT, 'index.cfg')
+COMMAND_PATTERN = re.compile(r'val="cmd @scripts/(\w+)\.py ?([^"]*)"')
+SAVE_MODULE = 'scripts.save_all_items_info'
+LOAD_MODULES = ('scripts.load_item_info', 'scripts.load_selected_item_info')
+UNPARENT_MODULE = 'scripts.meshref_hierarchy_unparent'
+DELTA_ARG = 'delta'
+USER_VALUES = {
+    'h3d_irr_pattern': r'_(\d+)$',
+    'h3d_irr_replacement': r'.\1',
+}
+THRESHOLD = 1.25
+SELECTION_STEP = 10
+EDIT_STEP = 10
+EDIT_OFFSET = 1.0
+
+
+def select_leaves(items: list[Item]) -> list[Item]:
+    return [item for item in items if not item._data.children]
+
+
+def select_some(items: list[Item]) -> list[Item]:
+    """Partial selection: every SELECTION_STEP item of the scene"""
+    return items[::SELECTION_STEP]
+
+
+SELECTIONS: dict[str, Callable[[list[Item]], list[Item]]] = {
+    'scripts.parent_to_new_loc': select_leaves,
+    'scripts.save_item_info': select_some,
+    'scripts.load_selected_item_info': select_some,
+    'scripts.select_meshref_meshes': select_some,
+}
+
+
+def edit_items(items: list[Item]):
+    """Move every EDIT_STEP item, so the next delta save has changed records"""
+    for item in items[::EDIT_STEP]:
+        item._data.pos = [value + EDIT_OFFSET for value in item._data.pos]
+
+
+def unparent_scene(module: str, args: tuple[str, ...], filename: str, selected: list[Item]):
+    """Flatten the scene hierarchies, so the reparent command has meshes to restore"""
+    headless.run(UNPARENT_MODULE, user_values=USER_VALUES)
+
+
+def save_delta_base(module: str, args: tuple[str, ...], filename: str, selected: list[Item]):
+    """Save the full info file of the selection with the same command and edit it, the delta save appends changes"""
+    headless.run(module, *(arg for arg in args if arg != DELTA_ARG), user_values=USER_VALUES, fileSave=filename)
+    edit_items(selected)
+
+
+def save_delta_log(module: str, args: tuple[str, ...], filename: str, selected: list[Item]):
+    """Save the base info file and a delta log of edits, so the compact command has a log to fold"""
+    save_delta_base(SAVE_MODULE, (DELTA_ARG,), filename, selected)
+    headless.run(SAVE_MODULE, DELTA_ARG, user_values=USER_VALUES, fileSave=filename)
+
+
+SETUPS: dict[str, Callable[[str, tuple[str, ...], str, list[Item]], None]] = {
+    'scripts.meshref_hierarchy_reparent': unparent_scene,
+    'scripts.compact_item_info': save_delta_log,
+}
+
+
+def get_kit_commands(filename: str = INDEX_CFG) -> list[tuple[str, tuple[str, ...]]]:
+    """Get unique (module, args) entry points from the kit config in the order of appearance"""
+    with open(filename) as file:
+        config = file.read()
+
+    commands: dict[tuple[str, tuple[str, ...]], None] = dict()
+    for script, args in COMMAND_PATTERN.findall(config):
+        commands[(f'scripts.{script}', tuple(args.split()))] = None
+
+    return list(commands)
+
+
+def get_command_name(module: str, args: tuple[str, ...]) -> str:
+    return ' '.join((module.split('.')[-1], *args))
+
+
+def prepare_info_file(kind: str, size: int, seed: int, info_filename: str, scene_filename: str):
+    if os.path.exists(info_filename):
+        return
+    build_scene(kind, size, seed, scene_filename)
+    with contextlib.redirect_stdout(io.StringIO()):
+        headless.run(SAVE_MODULE, user_values=USER_VALUES, fileSave=info_filename)
+
+
+def run_command(
+    kind: str, size: int, seed: int, module: str, args: tuple[str, ...], workdir: str
+) -> dict[str, Any]:
+    scene_filename = os.path.join(workdir, f'{kind}_{size}.lxo')
+    info_filename = os.path.join(workdir, f'{kind}_{size}_info.txt')
+    saved_filename = os.path.join(workdir, f'{kind}_{size}_saved.txt')
+    if module in LOAD_MODULES:
+        prepare_info_file(kind, size, seed, info_filename, scene_filename)
+    else:
+        info_filename = saved_filename
+
+    items = build_scene(kind, size, seed, scene_filename)
+    selected = SELECTIONS.get(module, list)(items)
+    headless.select(selected)
+    setup = save_delta_base if DELTA_ARG in args else SETUPS.get(module)
+    if setup:
+        with contextlib.redirect_stdout(io.StringIO()):
+            setup(module, args, saved_filename, selected)
+        headless.select(selected)
+    headless.reset_calls()
+
+    output = io.StringIO()
+    error = ''
+    start = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(output):
+            headless.run(
+                module, *args, user_values=USER_VALUES, fileSave=saved_filename, fileOpen=info_filename,
+            )
+    except Exception as exception:
+        error = f'{type(exception).__name__}: {exception}'
+    wall_time = time.perf_counter() - start
+
+    calls = dict(headless.calls)
+    return {
+        'scene': kind,
+        'size': size,
+        'command': get_command_name(module, args),
+        'wall_time': wall_time,
+        'items_per_second': size / wall_time if wall_time else 0.0,
+        'calls_total': sum(calls.values()),
+        'lx_eval': calls.get('lx.eval', 0),
+        'printed_lines': output.getvalue().count('\n'),
+        'error': error,
+        'calls': calls,
+    }
+
+
+def get_result_key(result: dict[str, Any]) -> tuple[str, int, str]:
+    return (result['scene'], result['size'], result['command'])
+
+
+def compare(results: list[dict[str, Any]], baseline: list[dict[str, Any]], threshold: float) -> list[str]:
+    """Compare results with the baseline, return regression messages for wall time and total calls"""
+    baseline_results = {get_result_key(result): result for result in baseline}
+    regressions: list[str] = []
+    for result in results:
+        base = baseline_results.get(get_result_key(result))
+        if not base:
+            continue
+        for metric in ('wall_time', 'calls_total'):
+            if not base[metric]:
+                continue
+            ratio = result[metric] / base[metric]
+            line = f'{result["scene"]:>8} {result["size"]:>7} {result["command"]:<40} {metric:<12} x{ratio:.2f}'
+            print(line)
+            if ratio > threshold:
+                regressions.append(line)
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark kit commands on synthetic headless scenes.')
+    parser.add_argument('--scenes', nargs='+', default=list(SCENES), choices=list(SCENES))
+    parser.add_argument('--sizes', nargs='+', type=int, default=[1000])
+    parser.add_argument('--commands', nargs='+', default=[], help='filter commands by name substring')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='')
+    parser.add_argument('--baseline', default='')
+    parser.add_argument('--threshold', type=float, default=THRESHOLD)
+    options = parser.parse_args()
+
+    commands = [
+        (module, args)
+        for module, args in get_kit_commands()
+        if not options.commands or any(name in get_command_name(module, args) for name in options.commands)
+    ]
+
+    results: list[dict[str, Any]] = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in options.sizes:
+            for kind in options.scenes:
+                for module, args in commands:
+                    result = run_command(kind, size, options.seed, module, args, workdir)
+                    results.append(result)
+                    print(
+                        f'{kind:>8} {size:>7} {result["command"]:<40} {result["wall_time"]:>9.3f}s '
+                        f'{result["calls_total"]:>10} calls {result["lx_eval"]:>9} lx.eval {result["error"]}'
+                    )
+
+    report = {
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'seed': options.seed,
+        'results': results,
+    }
+    if options.output:
+        with open(options.output, 'w') as file:
+            json.dump(report, file, indent=2)
+
+    if options.baseline:
+        with open(options.baseline) as file:
+            baseline = json.load(file)['results']
+        regressions = compare(results, baseline, options.threshold)
+        if regressions:
+            print(f'{len(regressions)} regression(s) over x{options.threshold:.2f}:')
+            print('\n'.join(regressions))
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
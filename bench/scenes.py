@@ -0,0 +1,105 @@
+#!/usr/bin/python
+# ================================
+# (C)2026 Dmytro Holub
+# heap3d@gmail.com
+# --------------------------------
+# kit benchmark
+# EMAG
+# parametrised synthetic scenes for the headless benchmark
+
+import math
+import random
+from typing import Callable, Optional
+
+import headless
+from headless.fake_modo import Item
+
+
+DEPTH = 50
+MESHREF_SCENE_SIZE = 40
+HIERARCHY_SIZE = 100
+
+
+def random_transforms(rng: random.Random, nonzero_ratio: float) -> dict[str, tuple[float, float, float]]:
+    if rng.random() >= nonzero_ratio:
+        return dict()
+    return dict(
+        pos=(rng.uniform(-10, 10), rng.uniform(-10, 10), rng.uniform(-10, 10)),
+        rot=(math.radians(rng.choice((0, 90, 180))), math.radians(rng.choice((0, 45, 90))), 0.0),
+        scl=(1.0, 1.0, 1.0),
+    )
+
+
+def build_wide(size: int, rng: random.Random) -> list[Item]:
+    """Flat scene: root level meshes and instances, half of them transformed, many sharing transforms"""
+    items: list[Item] = []
+    shared = [random_transforms(rng, 1.0) for _ in range(max(1, size // 20))]
+    for index in range(size):
+        itype = headless.MESH_TYPE if index % 4 else headless.MESHINST_TYPE
+        transforms = rng.choice(shared) if index % 2 else dict()
+        items.append(headless.add_item(itype, f'wide_{index}', **transforms))
+    return items
+
+
+def build_deep(size: int, rng: random.Random) -> list[Item]:
+    """Mesh chains of DEPTH meshes under root locators"""
+    items: list[Item] = []
+    while len(items) < size:
+        parent = headless.add_item(headless.LOCATOR_TYPE, f'chain_{len(items)}')
+        items.append(parent)
+        for _ in range(min(DEPTH, size - len(items))):
+            parent = headless.add_item(
+                headless.MESH_TYPE, f'link_{len(items)}', parent=parent, **random_transforms(rng, 0.5)
+            )
+            items.append(parent)
+    return items
+
+
+def build_meshref(size: int, rng: random.Random) -> list[Item]:
+    """Many meshref sub-scenes: a root locator per sub-scene with nested meshref meshes and instances"""
+    items: list[Item] = []
+    while len(items) < size:
+        scene_name = f'ref_{len(items) // MESHREF_SCENE_SIZE:05d}'
+        root = headless.add_item(headless.LOCATOR_TYPE, f'{scene_name}_root', meshref_scene=scene_name)
+        items.append(root)
+        group: Optional[Item] = None
+        for index in range(min(MESHREF_SCENE_SIZE - 1, size - len(items))):
+            if index % 10 == 0:
+                group = headless.add_item(headless.LOCATOR_TYPE, f'{scene_name}_group_{index}', parent=root,
+                                          meshref_scene=scene_name, **random_transforms(rng, 0.5))
+                items.append(group)
+                continue
+            itype = headless.MESH_TYPE if index % 3 else headless.MESHINST_TYPE
+            items.append(headless.add_item(itype, f'{scene_name}_part_{index}', parent=group, meshref_scene=scene_name,
+                                           **random_transforms(rng, 0.3)))
+    return items
+
+
+def build_mixed(size: int, rng: random.Random) -> list[Item]:
+    """Hierarchies of locators, meshes with children and instances, about 40% of items transformed"""
+    items: list[Item] = []
+    while len(items) < size:
+        root = headless.add_item(headless.LOCATOR_TYPE, f'asset_{len(items)}')
+        items.append(root)
+        parents = [root]
+        for index in range(min(HIERARCHY_SIZE - 1, size - len(items))):
+            itype = (headless.LOCATOR_TYPE, headless.MESH_TYPE, headless.MESH_TYPE, headless.MESHINST_TYPE)[index % 4]
+            item = headless.add_item(itype, f'node_{len(items)}', parent=rng.choice(parents),
+                                     **random_transforms(rng, 0.4))
+            items.append(item)
+            if itype != headless.MESHINST_TYPE:
+                parents.append(item)
+    return items
+
+
+SCENES: dict[str, Callable[[int, random.Random], list[Item]]] = {
+    'wide': build_wide,
+    'deep': build_deep,
+    'meshref': build_meshref,
+    'mixed': build_mixed,
+}
+
+
+def build_scene(kind: str, size: int, seed: int = 0, filename: str = '') -> list[Item]:
+    headless.new_scene(f'{kind}_{size}.lxo', filename or None)
+    return SCENES[kind](size, random.Random(seed))
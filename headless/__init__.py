@@ -0,0 +1,142 @@
+#!/usr/bin/python
+# ================================
+# (C)2026 Dmytro Holub
+# heap3d@gmail.com
+# --------------------------------
+# headless modo stand-in
+# EMAG
+# in-memory modo / lx backend to import, run and profile the kit scripts on plain python without modo
+# usage:
+# import headless
+# headless.install()
+# headless.new_scene('scene.lxo')
+# headless.add_item(headless.MESH_TYPE, 'mesh', pos=(1, 0, 0))
+# headless.run('scripts.select_nonzero_transform_items')
+# print(headless.calls)
+
+import importlib
+import importlib.abc
+import importlib.machinery
+import os
+import sys
+import types
+from typing import Any, Iterable, Optional, Union
+
+from headless import state
+from headless.state import calls, reset_calls
+from headless.fake_modo import (
+    LOCATOR_TYPE, MESH_TYPE, MESHINST_TYPE, GROUPLOCATOR_TYPE, Item, SceneData, current,
+)
+
+__all__ = [
+    'LOCATOR_TYPE', 'MESH_TYPE', 'MESHINST_TYPE', 'GROUPLOCATOR_TYPE',
+    'calls', 'reset_calls', 'install', 'new_scene', 'add_item', 'select', 'run',
+]
+
+KIT_NAME = 'h3d_meshref_hierarchy_setup'
+KIT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class KitAliasFinder(importlib.abc.MetaPathFinder, importlib.abc.Loader):
+    """Resolve h3d_meshref_hierarchy_setup.scripts.* to the same module objects as scripts.*"""
+
+    def find_spec(self, fullname: str, path=None, target=None):
+        if not fullname.startswith(f'{KIT_NAME}.'):
+            return None
+        return importlib.machinery.ModuleSpec(fullname, self, is_package=fullname.count('.') == 1)
+
+    def create_module(self, spec):
+        return importlib.import_module(spec.name[len(KIT_NAME) + 1:])
+
+    def exec_module(self, module):
+        pass
+
+
+def install():
+    """Register the fake modo, lx, lxu and h3d_utilites modules and make the kit importable"""
+    from headless import fake_modo, fake_lx, fake_h3d_utils
+
+    modo = types.ModuleType('modo')
+    for name in ('Scene', 'Item', 'Mesh', 'Locator', 'Vector3'):
+        setattr(modo, name, getattr(fake_modo, name))
+    modo.constants = fake_modo.constants  # type: ignore
+    modo.dialogs = fake_modo.dialogs  # type: ignore
+
+    lx = types.ModuleType('lx')
+    for name in ('eval', 'args', 'out'):
+        setattr(lx, name, getattr(fake_lx, name))
+    lx.symbol = fake_lx.symbol  # type: ignore
+    lx.object = fake_lx.lx_object  # type: ignore
+
+    lxu = types.ModuleType('lxu')
+    lxu.select = fake_lx.lxu_select  # type: ignore
+
+    h3d_utilites = types.ModuleType('h3d_utilites')
+    h3d_utilites.__path__ = []  # type: ignore
+    h3d_utilites_scripts = types.ModuleType('h3d_utilites.scripts')
+    h3d_utilites_scripts.__path__ = []  # type: ignore
+    h3d_utilites_scripts.h3d_utils = fake_h3d_utils  # type: ignore
+    h3d_utilites.scripts = h3d_utilites_scripts  # type: ignore
+
+    kit = types.ModuleType(KIT_NAME)
+    kit.__path__ = []  # type: ignore
+
+    sys.modules.update({
+        'modo': modo,
+        'modo.constants': fake_modo.constants,
+        'modo.dialogs': fake_modo.dialogs,
+        'lx': lx,
+        'lx.symbol': fake_lx.symbol,
+        'lx.object': fake_lx.lx_object,
+        'lxu': lxu,
+        'lxu.select': fake_lx.lxu_select,
+        'h3d_utilites': h3d_utilites,
+        'h3d_utilites.scripts': h3d_utilites_scripts,
+        'h3d_utilites.scripts.h3d_utils': fake_h3d_utils,
+        KIT_NAME: kit,
+    })
+    if not any(isinstance(finder, KitAliasFinder) for finder in sys.meta_path):
+        sys.meta_path.insert(0, KitAliasFinder())
+    if KIT_ROOT not in sys.path:
+        sys.path.insert(0, KIT_ROOT)
+
+    state.user_values.update(state.load_user_values())
+
+
+def new_scene(name: str = 'headless.lxo', filename: Optional[str] = None) -> SceneData:
+    state.scene = SceneData(name, filename)
+    return state.scene
+
+
+def add_item(
+    itype: Union[int, str],
+    name: str = '',
+    parent: Optional[Item] = None,
+    meshref_scene: str = '',
+    pos: Iterable[float] = (0.0, 0.0, 0.0),
+    rot: Iterable[float] = (0.0, 0.0, 0.0),
+    scl: Iterable[float] = (1.0, 1.0, 1.0),
+) -> Item:
+    """Add item to the current fake scene without counting calls, rotation is in radians"""
+    scene = current()
+    data = scene.add(itype, name, meshref_scene)
+    if parent:
+        scene.set_parent(data, parent._data)
+    data.pos, data.rot, data.scl = list(pos), list(rot), list(scl)
+    return Item(data)
+
+
+def select(items: Iterable[Item], replace: bool = True):
+    selection = current().selection
+    if replace:
+        selection.clear()
+    selection.update((item._data, None) for item in items)
+
+
+def run(module_name: str, *args: str, user_values: Optional[dict[str, Any]] = None, **dialog_results) -> Any:
+    """Run main() of the kit script with the specified command arguments, user values and dialog results"""
+    state.args[:] = list(args)
+    state.user_values.update(user_values or {})
+    state.dialog_results.clear()
+    state.dialog_results.update(dialog_results)
+    return importlib.import_module(module_name).main()
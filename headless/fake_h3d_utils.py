@@ -0,0 +1,97 @@
+#!/usr/bin/python
+# ================================
+# (C)2026 Dmytro Holub
+# heap3d@gmail.com
+# --------------------------------
+# headless modo stand-in
+# EMAG
+# fake of the h3d_utilites.scripts.h3d_utils helpers used by the kit, implemented on top of the fake lx / modo
+
+from typing import Any, Iterable, Optional
+
+from headless import state
+from headless import fake_lx as lx
+from headless.fake_modo import Item, Vector3, get_type_int
+
+
+DESCRIPTION_TAG = 'DESC'
+
+
+def get_user_value(name: str) -> Any:
+    state.count('h3d_utils.get_user_value')
+    return lx.eval(f'user.value {name} ?')
+
+
+def itype_int(type_name: str) -> int:
+    state.count('h3d_utils.itype_int')
+    return get_type_int(type_name)
+
+
+def get_parent_index(item: Item) -> int:
+    state.count('h3d_utils.get_parent_index')
+    return item._data.parent_index()
+
+
+def parent_items_to(items: Iterable[Item], parent: Optional[Item], index: int = 0, inplace: bool = True):
+    state.count('h3d_utils.parent_items_to')
+    parent_id = parent.id if parent else ''
+    for offset, item in enumerate(items):
+        lx.eval(
+            f'item.parent item:{{{item.id}}} parent:{{{parent_id}}} '
+            f'position:{{{index + offset}}} inPlace:{{{int(inplace)}}}'
+        )
+
+
+def item_get_vector(item: Item, channel: str) -> Vector3:
+    return Vector3([lx.eval(f'transform.channel {channel}.{axis} ? item:{{{item.id}}}') for axis in 'XYZ'])
+
+
+def item_set_vector(item: Item, channel: str, values: Iterable[float]):
+    for axis, value in zip('XYZ', values):
+        lx.eval(f'transform.channel {channel}.{axis} {value} item:{{{item.id}}}')
+
+
+def item_get_position(item: Item) -> Vector3:
+    state.count('h3d_utils.item_get_position')
+    return item_get_vector(item, 'pos')
+
+
+def item_get_rotation(item: Item) -> Vector3:
+    state.count('h3d_utils.item_get_rotation')
+    return item_get_vector(item, 'rot')
+
+
+def item_get_scale(item: Item) -> Vector3:
+    state.count('h3d_utils.item_get_scale')
+    return item_get_vector(item, 'scl')
+
+
+def item_set_position(item: Item, values: Iterable[float]):
+    state.count('h3d_utils.item_set_position')
+    item_set_vector(item, 'pos', values)
+
+
+def item_set_rotation(item: Item, values: Iterable[float]):
+    state.count('h3d_utils.item_set_rotation')
+    item_set_vector(item, 'rot', values)
+
+
+def item_set_scale(item: Item, values: Iterable[float]):
+    state.count('h3d_utils.item_set_scale')
+    item_set_vector(item, 'scl', values)
+
+
+def match_pos_rot(item: Item, itemto: Item):
+    state.count('h3d_utils.match_pos_rot')
+    lx.eval(f'item.match item pos average:false item:{{{item.id}}} itemTo:{{{itemto.id}}}')
+    lx.eval(f'item.match item rot average:false item:{{{item.id}}} itemTo:{{{itemto.id}}}')
+
+
+def set_description_tag(item: Item, text: str):
+    state.count('h3d_utils.set_description_tag')
+    item.setTag(DESCRIPTION_TAG, text)
+
+
+def get_description_tag(item: Item) -> str:
+    state.count('h3d_utils.get_description_tag')
+    return item.readTag(DESCRIPTION_TAG)
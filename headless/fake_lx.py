@@ -0,0 +1,192 @@
+#!/usr/bin/python
+# ================================
+# (C)2026 Dmytro Holub
+# heap3d@gmail.com
+# --------------------------------
+# headless modo stand-in
+# EMAG
+# in-memory fake of the lx / lxu module surface used by the kit
+
+from __future__ import annotations
+
+import math
+import re
+import types
+from typing import Any, Optional
+
+from headless import state
+from headless import xform
+from headless.fake_modo import ItemData, current
+
+
+XFRM_POSITION = 0
+XFRM_ROTATION = 1
+XFRM_SCALE = 2
+XFRM_ATTRIBUTES = {XFRM_POSITION: 'pos', XFRM_ROTATION: 'rot', XFRM_SCALE: 'scl'}
+AXES = {'X': 0, 'Y': 1, 'Z': 2}
+ORDER_CHANNEL = 'order'
+ORDER_INDEX = 3
+
+NAMED_ARG = re.compile(r'(\w+):(?:\{([^}]*)\}|(\S+))')
+
+symbol = types.ModuleType('lx.symbol')
+symbol.iXFRM_POSITION = XFRM_POSITION  # type: ignore
+symbol.iXFRM_ROTATION = XFRM_ROTATION  # type: ignore
+symbol.iXFRM_SCALE = XFRM_SCALE  # type: ignore
+symbol.s_ACTIONLAYER_EDIT = 'edit'  # type: ignore
+symbol.sGRAPH_XFRMCORE = 'xfrmCore'  # type: ignore
+
+
+def args() -> list[str]:
+    state.count('lx.args')
+    return list(state.args)
+
+
+def out(*values):
+    state.count('lx.out')
+    state.event_log.append(' '.join(str(i) for i in values))
+
+
+def get_items(named: dict[str, str]) -> list[ItemData]:
+    scene = current()
+    if 'item' in named:
+        return [scene.find(named['item'])]
+    return list(scene.selection)
+
+
+def eval(command: str) -> Any:
+    state.count('lx.eval')
+    name, _, rest = command.strip().partition(' ')
+    state.count(f'lx.eval:{name}')
+    named = {key: braced if braced is not None else plain for key, braced, plain in NAMED_ARG.findall(rest)}
+    positional = NAMED_ARG.sub('', rest).split()
+    handler = COMMANDS.get(name)
+    if not handler:
+        raise RuntimeError(f'Unknown command <{name}>')
+    return handler(positional, named)
+
+
+def transform_channel(positional: list[str], named: dict[str, str]) -> Optional[float]:
+    channel, value = positional[0], positional[1]
+    attribute, axis = channel.split('.')
+    query = value == '?'
+    for data in get_items(named):
+        values = getattr(data, attribute)
+        if query:
+            result = values[AXES[axis]]
+            return math.degrees(result) if attribute == 'rot' else result
+        new_value = float(value)
+        values[AXES[axis]] = math.radians(new_value) if attribute == 'rot' else new_value
+    return None
+
+
+def item_parent(positional: list[str], named: dict[str, str]) -> None:
+    scene = current()
+    parent = scene.find(named['parent']) if named.get('parent') else None
+    index = int(named['position']) if named.get('position') else -1
+    inplace = named.get('inPlace', '1') in ('1', 'true')
+    for offset, data in enumerate(get_items(named)):
+        scene.set_parent(data, parent, index + offset if index >= 0 else -1, inplace)
+
+
+def item_match(positional: list[str], named: dict[str, str]) -> None:
+    attribute = positional[1]
+    data = current().find(named['item'])
+    target = current().find(named['itemTo'])
+    world = list(xform.decompose(data.world_matrix()))
+    target_world = xform.decompose(target.world_matrix())
+    component = ('pos', 'rot', 'scl').index(attribute)
+    world[component] = target_world[component]
+    data.set_world_matrix(xform.compose(*world))
+
+
+def item_editor_color(positional: list[str], named: dict[str, str]) -> None:
+    for data in get_items(named):
+        data.color = positional[0]
+
+
+def user_value(positional: list[str], named: dict[str, str]) -> Any:
+    name, value = positional[0], positional[1] if len(positional) > 1 else '?'
+    if value == '?':
+        return state.user_values.get(name)
+    state.user_values[name] = type(state.user_values.get(name, ''))(value)
+    return None
+
+
+COMMANDS = {
+    'transform.channel': transform_channel,
+    'item.parent': item_parent,
+    'item.match': item_match,
+    'item.editorColor': item_editor_color,
+    'user.value': user_value,
+}
+
+
+class TransformItem():
+    def __init__(self, data: ItemData, xfrm_type: int):
+        self.data = data
+        self.xfrm_type = xfrm_type
+
+    def Type(self) -> int:
+        state.count('lx.object.Item.Type')
+        return self.xfrm_type
+
+    def ChannelLookup(self, name: str) -> int:
+        state.count('lx.object.Item.ChannelLookup')
+        if name == ORDER_CHANNEL:
+            return ORDER_INDEX
+        return AXES[name.split('.')[1]]
+
+
+class Locator():
+    def __init__(self, item):
+        state.count('lx.object.Locator')
+        self.data: ItemData = item._data
+
+    def GetTransformItem(self, xfrm_type: int) -> TransformItem:
+        state.count('lx.object.Locator.GetTransformItem')
+        return TransformItem(self.data, xfrm_type)
+
+
+class ChannelRead():
+    def Double(self, xfrm: TransformItem, index: int) -> float:
+        state.count('lx.object.ChannelRead.Double')
+        return getattr(xfrm.data, XFRM_ATTRIBUTES[xfrm.xfrm_type])[index]
+
+    def Integer(self, xfrm: TransformItem, index: int) -> int:
+        state.count('lx.object.ChannelRead.Integer')
+        return xfrm.data.rot_order if index == ORDER_INDEX else 0
+
+
+class ItemGraph():
+    def __init__(self, graph: str):
+        self.graph = graph
+
+    def RevCount(self, item) -> int:
+        state.count('lx.object.ItemGraph.RevCount')
+        return len(XFRM_ATTRIBUTES) + item._data.extra_transforms
+
+
+class SceneObject():
+    def GraphLookup(self, name: str) -> str:
+        state.count('lx.object.Scene.GraphLookup')
+        return name
+
+    def Channels(self, layer: str, time: float) -> ChannelRead:
+        state.count('lx.object.Scene.Channels')
+        return ChannelRead()
+
+
+class SceneSelection():
+    def current(self) -> SceneObject:
+        state.count('lxu.select.SceneSelection.current')
+        return SceneObject()
+
+
+lx_object = types.ModuleType('lx.object')
+lx_object.Locator = Locator  # type: ignore
+lx_object.ChannelRead = ChannelRead  # type: ignore
+lx_object.ItemGraph = ItemGraph  # type: ignore
+
+lxu_select = types.ModuleType('lxu.select')
+lxu_select.SceneSelection = SceneSelection  # type: ignore
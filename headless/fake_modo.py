@@ -0,0 +1,394 @@
+#!/usr/bin/python
+# ================================
+# (C)2026 Dmytro Holub
+# heap3d@gmail.com
+# --------------------------------
+# headless modo stand-in
+# EMAG
+# in-memory fake of the modo module surface used by the kit
+
+from __future__ import annotations
+
+import types
+from typing import Iterable, Optional, Union
+
+from headless import state
+from headless import xform
+
+
+LOCATOR_TYPE = 1
+MESH_TYPE = 2
+MESHINST_TYPE = 3
+GROUPLOCATOR_TYPE = 4
+
+TYPE_NAMES = {
+    LOCATOR_TYPE: 'locator',
+    MESH_TYPE: 'mesh',
+    MESHINST_TYPE: 'meshInst',
+    GROUPLOCATOR_TYPE: 'groupLocator',
+}
+TYPE_INTS = {name: itype for itype, name in TYPE_NAMES.items()}
+
+constants = types.ModuleType('modo.constants')
+constants.LOCATOR_TYPE = LOCATOR_TYPE  # type: ignore
+constants.MESH_TYPE = MESH_TYPE  # type: ignore
+constants.MESHINST_TYPE = MESHINST_TYPE  # type: ignore
+constants.GROUPLOCATOR_TYPE = GROUPLOCATOR_TYPE  # type: ignore
+
+
+def get_type_int(itype: Union[int, str]) -> int:
+    if isinstance(itype, int):
+        return itype
+    return TYPE_INTS[itype]
+
+
+class Vector3():
+    def __init__(self, *values):
+        if len(values) == 1:
+            values = tuple(values[0])
+        if not values:
+            values = (0.0, 0.0, 0.0)
+        self.values = [float(i) for i in values]
+
+    @property
+    def x(self) -> float:
+        return self.values[0]
+
+    @x.setter
+    def x(self, value: float):
+        self.values[0] = float(value)
+
+    @property
+    def y(self) -> float:
+        return self.values[1]
+
+    @y.setter
+    def y(self, value: float):
+        self.values[1] = float(value)
+
+    @property
+    def z(self) -> float:
+        return self.values[2]
+
+    @z.setter
+    def z(self, value: float):
+        self.values[2] = float(value)
+
+    def __iter__(self):
+        return iter(self.values)
+
+    def __getitem__(self, index: int) -> float:
+        return self.values[index]
+
+    def __len__(self) -> int:
+        return 3
+
+    def __eq__(self, other) -> bool:
+        return list(self) == list(other)
+
+    def __repr__(self) -> str:
+        return f'Vector3({self.values[0]}, {self.values[1]}, {self.values[2]})'
+
+    def equals(self, other: Iterable[float], tolerance: float = 0.0) -> bool:
+        return all(abs(a - b) <= tolerance for a, b in zip(self.values, other))
+
+
+class ItemData():
+    """Storage of the fake item, the modo.Item wrappers below are thin views like in modo"""
+
+    def __init__(self, scene: SceneData, ident: str, name: str, itype: int):
+        self.scene = scene
+        self.ident = ident
+        self.name = name
+        self.itype = itype
+        self.parent: Optional[ItemData] = None
+        self.children: list[ItemData] = []
+        self.pos = [0.0, 0.0, 0.0]
+        self.rot = [0.0, 0.0, 0.0]
+        self.scl = [1.0, 1.0, 1.0]
+        self.rot_order = 0
+        # transform items stacked beyond pos/rot/scl, counted only, they are not part of the matrices
+        self.extra_transforms = 0
+        self.tags: dict[str, str] = {}
+        self.color = ''
+
+    def local_matrix(self) -> xform.Matrix:
+        return xform.compose(tuple(self.pos), tuple(self.rot), tuple(self.scl))  # type: ignore
+
+    def world_matrix(self) -> xform.Matrix:
+        matrix = self.local_matrix()
+        parent = self.parent
+        while parent:
+            matrix = xform.multiply(parent.local_matrix(), matrix)
+            parent = parent.parent
+        return matrix
+
+    def set_world_matrix(self, matrix: xform.Matrix):
+        if self.parent:
+            matrix = xform.multiply(xform.inverse(self.parent.world_matrix()), matrix)
+        pos, rot, scl = xform.decompose(matrix)
+        self.pos, self.rot, self.scl = list(pos), list(rot), list(scl)
+
+    def siblings(self) -> list[ItemData]:
+        return self.parent.children if self.parent else self.scene.roots
+
+    def parent_index(self) -> int:
+        return self.scene.get_index(self)
+
+    def descendants(self) -> list[ItemData]:
+        result: list[ItemData] = []
+        stack = list(reversed(self.children))
+        while stack:
+            current = stack.pop()
+            result.append(current)
+            stack.extend(reversed(current.children))
+        return result
+
+
+class SceneData():
+    def __init__(self, name: str = 'headless.lxo', filename: Optional[str] = None):
+        self.name = name
+        self.filename = filename
+        self.items: list[ItemData] = []
+        self.roots: list[ItemData] = []
+        self.by_id: dict[str, ItemData] = {}
+        self.by_name: dict[str, list[ItemData]] = {}
+        self.selection: dict[ItemData, None] = {}
+        self.type_counters: dict[str, int] = {}
+        self.index_cache: dict[int, dict[ItemData, int]] = {}
+
+    def new_ident(self, type_name: str, meshref_scene: str = '') -> str:
+        self.type_counters[type_name] = self.type_counters.get(type_name, 0) + 1
+        ident = f'{type_name}{self.type_counters[type_name]:03d}'
+        if meshref_scene:
+            ident = f'{meshref_scene}:{ident}'
+        return ident
+
+    def add(self, itype: Union[int, str], name: str = '', meshref_scene: str = '') -> ItemData:
+        itype = get_type_int(itype)
+        type_name = TYPE_NAMES[itype]
+        ident = self.new_ident(type_name, meshref_scene)
+        if not name:
+            name = type_name.capitalize()
+        if meshref_scene:
+            name = f'{name} ({meshref_scene})'
+        data = ItemData(self, ident, name, itype)
+        self.items.append(data)
+        self.roots.append(data)
+        self.by_id[ident] = data
+        self.by_name.setdefault(name, []).append(data)
+        self.invalidate(None)
+        return data
+
+    def rename(self, data: ItemData, name: str):
+        same_name = self.by_name.get(data.name, [])
+        if data in same_name:
+            same_name.remove(data)
+        data.name = name
+        self.by_name.setdefault(name, []).append(data)
+
+    def invalidate(self, parent: Optional[ItemData]):
+        self.index_cache.pop(id(parent), None)
+
+    def get_index(self, data: ItemData) -> int:
+        key = id(data.parent)
+        if key not in self.index_cache:
+            self.index_cache[key] = {child: index for index, child in enumerate(data.siblings())}
+        return self.index_cache[key][data]
+
+    def set_parent(self, data: ItemData, parent: Optional[ItemData], index: int = -1, inplace: bool = False):
+        ancestor = parent
+        while ancestor:
+            if ancestor is data:
+                raise RuntimeError(f'Can\'t parent <{data.name}> to itself or its descendant')
+            ancestor = ancestor.parent
+        world = data.world_matrix() if inplace else None
+        data.siblings().remove(data)
+        self.invalidate(data.parent)
+        data.parent = parent
+        siblings = data.siblings()
+        if index < 0 or index > len(siblings):
+            siblings.append(data)
+        else:
+            siblings.insert(index, data)
+        self.invalidate(parent)
+        if world is not None:
+            data.set_world_matrix(world)
+
+    def find(self, name: str) -> ItemData:
+        if name in self.by_id:
+            return self.by_id[name]
+        if self.by_name.get(name):
+            return self.by_name[name][0]
+        raise LookupError(f'Item <{name}> not found')
+
+
+def current() -> SceneData:
+    if state.scene is None:
+        state.scene = SceneData()
+    return state.scene
+
+
+def wrap(data: Optional[ItemData]) -> Optional[Item]:
+    if data is None:
+        return None
+    return Item(data)
+
+
+def is_type(data: ItemData, itype: Optional[Union[int, str]], super_type: bool) -> bool:
+    if itype is None:
+        return True
+    itype = get_type_int(itype)
+    if super_type and itype == LOCATOR_TYPE:
+        return True
+    return data.itype == itype
+
+
+class Item():
+    def __init__(self, data: ItemData):
+        self._data = data
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Item) and other._data is self._data
+
+    def __hash__(self) -> int:
+        return hash(self._data)
+
+    def __repr__(self) -> str:
+        return f'modo.item.Item({self._data.ident!r})'
+
+    @property
+    def internalItem(self) -> Item:
+        state.count('modo.Item.internalItem')
+        return self
+
+    @property
+    def id(self) -> str:
+        state.count('modo.Item.id')
+        return self._data.ident
+
+    @property
+    def name(self) -> str:
+        state.count('modo.Item.name')
+        return self._data.name
+
+    @name.setter
+    def name(self, value: str):
+        state.count('modo.Item.name.set')
+        self._data.scene.rename(self._data, value)
+
+    @property
+    def type(self) -> str:
+        state.count('modo.Item.type')
+        return TYPE_NAMES[self._data.itype]
+
+    @property
+    def parent(self) -> Optional[Item]:
+        state.count('modo.Item.parent')
+        return wrap(self._data.parent)
+
+    @property
+    def parents(self) -> list[Item]:
+        state.count('modo.Item.parents')
+        parents: list[Item] = []
+        parent = self._data.parent
+        while parent:
+            parents.append(Item(parent))
+            parent = parent.parent
+        return parents
+
+    def children(self, recursive: bool = False, itemType: Optional[Union[int, str]] = None) -> list[Item]:
+        state.count('modo.Item.children')
+        candidates = self._data.descendants() if recursive else self._data.children
+        return [Item(i) for i in candidates if is_type(i, itemType, False)]
+
+    def setParent(self, newParent: Optional[Item] = None, index: Optional[int] = None):
+        state.count('modo.Item.setParent')
+        parent_data = newParent._data if newParent else None
+        self._data.scene.set_parent(self._data, parent_data, -1 if index is None else index)
+
+    def select(self, replace: bool = False):
+        state.count('modo.Item.select')
+        selection = self._data.scene.selection
+        if replace:
+            selection.clear()
+        selection[self._data] = None
+
+    def readTag(self, tag: str) -> str:
+        state.count('modo.Item.readTag')
+        return self._data.tags.get(tag, '')
+
+    def setTag(self, tag: str, value: str):
+        state.count('modo.Item.setTag')
+        self._data.tags[tag] = value
+
+
+Mesh = Item
+Locator = Item
+
+
+class Scene():
+    def __init__(self):
+        state.count('modo.Scene')
+        self._data = current()
+
+    @property
+    def name(self) -> str:
+        return self._data.name
+
+    @property
+    def filename(self) -> Optional[str]:
+        return self._data.filename
+
+    @property
+    def selected(self) -> list[Item]:
+        state.count('modo.Scene.selected')
+        return [Item(i) for i in self._data.selection]
+
+    @property
+    def meshes(self) -> list[Item]:
+        state.count('modo.Scene.meshes')
+        return [Item(i) for i in self._data.items if i.itype == MESH_TYPE]
+
+    def items(self, itype: Optional[Union[int, str]] = None, superType: bool = False) -> list[Item]:
+        state.count('modo.Scene.items')
+        return [Item(i) for i in self._data.items if is_type(i, itype, superType)]
+
+    def selectedByType(self, itype: Optional[Union[int, str]] = None, superType: bool = False) -> list[Item]:
+        state.count('modo.Scene.selectedByType')
+        return [Item(i) for i in self._data.selection if is_type(i, itype, superType)]
+
+    def item(self, name: str) -> Item:
+        state.count('modo.Scene.item')
+        return Item(self._data.find(name))
+
+    def addItem(self, itype: Union[int, str], name: str = '') -> Item:
+        state.count('modo.Scene.addItem')
+        return Item(self._data.add(itype, name))
+
+    def deselect(self, *args):
+        state.count('modo.Scene.deselect')
+        self._data.selection.clear()
+
+
+dialogs = types.ModuleType('modo.dialogs')
+
+
+def alert(title: str, message: str = '', dtype: str = 'warning'):
+    state.count('modo.dialogs.alert')
+    state.event_log.append(f'{title}: {message}')
+
+
+def fileOpen(ftype: str = '', title: str = '', multi: bool = False, path: str = ''):
+    state.count('modo.dialogs.fileOpen')
+    return state.dialog_results.get('fileOpen')
+
+
+def fileSave(ftype: str = '', fformat: str = '', fspec: str = '', title: str = '', path: str = ''):
+    state.count('modo.dialogs.fileSave')
+    return state.dialog_results.get('fileSave')
+
+
+dialogs.alert = alert  # type: ignore
+dialogs.fileOpen = fileOpen  # type: ignore
+dialogs.fileSave = fileSave  # type: ignore
@@ -0,0 +1,52 @@
+#!/usr/bin/python
+# ================================
+# (C)2026 Dmytro Holub
+# heap3d@gmail.com
+# --------------------------------
+# headless modo stand-in
+# EMAG
+# shared state of the headless backend: current scene, command args, user values, dialogs and call counters
+
+from collections import Counter
+import os
+import re
+from typing import Any, Optional
+
+
+INDEX_CFG = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'index.cfg')
+
+calls: Counter[str] = Counter()
+args: list[str] = []
+user_values: dict[str, Any] = {}
+dialog_results: dict[str, Any] = {}
+event_log: list[str] = []
+scene: Optional[Any] = None
+
+
+def count(name: str):
+    calls[name] += 1
+
+
+def reset_calls():
+    calls.clear()
+
+
+def load_user_values(filename: str = INDEX_CFG) -> dict[str, Any]:
+    """Read user value defaults from the kit config, booleans are stored as ints like modo does"""
+    with open(filename) as file:
+        config = file.read()
+
+    types = dict(re.findall(r'<hash type="Definition" key="(\w+)">\s*<atom type="Type">(\w+)</atom>', config))
+    values: dict[str, Any] = {}
+    for name, raw in re.findall(r'<hash type="RawValue" key="(\w+)">([^<]*)</hash>', config):
+        value_type = types.get(name, 'string')
+        if value_type == 'boolean':
+            values[name] = int(raw.strip().lower() in ('true', '1'))
+        elif value_type in ('distance', 'float', 'percent', 'angle'):
+            values[name] = float(raw or 0.0)
+        elif value_type == 'integer':
+            values[name] = int(raw or 0)
+        else:
+            values[name] = raw
+
+    return values
@@ -0,0 +1,85 @@
+#!/usr/bin/python
+# ================================
+# (C)2026 Dmytro Holub
+# heap3d@gmail.com
+# --------------------------------
+# headless modo stand-in
+# EMAG
+# 4x4 matrix helpers for the fake scene: local/world transforms with XYZ rotation order
+
+import math
+
+Matrix = list[list[float]]
+Vector = tuple[float, float, float]
+
+
+def compose(pos: Vector, rot: Vector, scl: Vector) -> Matrix:
+    """Compose T * Rz * Ry * Rx * S matrix, rotation in radians"""
+    cx, cy, cz = (math.cos(a) for a in rot)
+    sx, sy, sz = (math.sin(a) for a in rot)
+    r = [
+        [cy * cz, sx * sy * cz - cx * sz, cx * sy * cz + sx * sz],
+        [cy * sz, sx * sy * sz + cx * cz, cx * sy * sz - sx * cz],
+        [-sy, sx * cy, cx * cy],
+    ]
+    return [
+        [r[0][0] * scl[0], r[0][1] * scl[1], r[0][2] * scl[2], pos[0]],
+        [r[1][0] * scl[0], r[1][1] * scl[1], r[1][2] * scl[2], pos[1]],
+        [r[2][0] * scl[0], r[2][1] * scl[1], r[2][2] * scl[2], pos[2]],
+        [0.0, 0.0, 0.0, 1.0],
+    ]
+
+
+def decompose(m: Matrix) -> tuple[Vector, Vector, Vector]:
+    """Decompose matrix without shear into pos, rot (radians) and scl"""
+    pos = (m[0][3], m[1][3], m[2][3])
+    scl = tuple(math.sqrt(m[0][i] ** 2 + m[1][i] ** 2 + m[2][i] ** 2) for i in range(3))
+    r = [[m[row][col] / scl[col] if scl[col] else 0.0 for col in range(3)] for row in range(3)]
+    ry = math.asin(max(-1.0, min(1.0, -r[2][0])))
+    if abs(math.cos(ry)) > 1e-9:
+        rx = math.atan2(r[2][1], r[2][2])
+        rz = math.atan2(r[1][0], r[0][0])
+    else:
+        rx = math.atan2(-r[1][2], r[1][1])
+        rz = 0.0
+    return pos, (rx, ry, rz), scl  # type: ignore
+
+
+def multiply(a: Matrix, b: Matrix) -> Matrix:
+    return [[sum(a[row][k] * b[k][col] for k in range(4)) for col in range(4)] for row in range(4)]
+
+
+def inverse(m: Matrix) -> Matrix:
+    """Invert affine matrix"""
+    a = [row[:3] for row in m[:3]]
+    det = (
+        a[0][0] * (a[1][1] * a[2][2] - a[1][2] * a[2][1])
+        - a[0][1] * (a[1][0] * a[2][2] - a[1][2] * a[2][0])
+        + a[0][2] * (a[1][0] * a[2][1] - a[1][1] * a[2][0])
+    )
+    if not det:
+        det = 1e-12
+    inv = [
+        [
+            (a[1][1] * a[2][2] - a[1][2] * a[2][1]) / det,
+            (a[0][2] * a[2][1] - a[0][1] * a[2][2]) / det,
+            (a[0][1] * a[1][2] - a[0][2] * a[1][1]) / det,
+        ],
+        [
+            (a[1][2] * a[2][0] - a[1][0] * a[2][2]) / det,
+            (a[0][0] * a[2][2] - a[0][2] * a[2][0]) / det,
+            (a[0][2] * a[1][0] - a[0][0] * a[1][2]) / det,
+        ],
+        [
+            (a[1][0] * a[2][1] - a[1][1] * a[2][0]) / det,
+            (a[0][1] * a[2][0] - a[0][0] * a[2][1]) / det,
+            (a[0][0] * a[1][1] - a[0][1] * a[1][0]) / det,
+        ],
+    ]
+    t = [m[0][3], m[1][3], m[2][3]]
+    return [
+        [*inv[0], -sum(inv[0][k] * t[k] for k in range(3))],
+        [*inv[1], -sum(inv[1][k] * t[k] for k in range(3))],
+        [*inv[2], -sum(inv[2][k] * t[k] for k in range(3))],
+        [0.0, 0.0, 0.0, 1.0],
+    ]
@@ -10,11 +10,13 @@
 import lx
 
 import scripts.select_nonzero_transform_items as select_nonzero_items
+from scripts.profiling import profile_command
 
 
 COLOR = 'yellow'
 
 
+@profile_command
 def main():
     select_nonzero_items.main()
     lx.eval(f'item.editorColor {COLOR}')
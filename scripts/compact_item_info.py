@@ -0,0 +1,51 @@
+#!/usr/bin/python
+# ================================
+# (C)2026 Dmytro Holub
+# heap3d@gmail.com
+# --------------------------------
+# EMAG
+# modo python
+# fold the delta log of the info file back into the base file
+
+import os
+
+import modo
+
+from scripts.save_item_info import write_items_info
+from scripts.load_selected_item_info import load_items_info, is_gzip_info
+from scripts.item_info_binary import is_binary_info
+from scripts.item_info_delta import has_delta
+from scripts.profiling import profile_command, phase
+
+
+@profile_command
+def main():
+    try:
+        path = os.path.dirname(modo.Scene().filename)
+    except TypeError:
+        path = ''
+    filename = modo.dialogs.fileOpen('text', path=path)
+    if isinstance(filename, list):
+        raise ValueError('Multiple files selected. Please select one file only.')
+    if not filename:
+        return
+
+    if not has_delta(filename):
+        modo.dialogs.alert('Nothing to compact', 'The info file has no delta log.')
+        return
+
+    compact_items_info(filename)
+
+
+def compact_items_info(filename: str):
+    with phase('read'):
+        binary = is_binary_info(filename)
+        compress = is_gzip_info(filename)
+        items_info = load_items_info(filename)
+
+    with phase('write', len(items_info)):
+        write_items_info(filename, items_info, binary, compress)
+
+
+if __name__ == '__main__':
+    main()
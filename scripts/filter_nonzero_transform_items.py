@@ -11,8 +11,10 @@ import modo
 import modo.constants as c
 
 from scripts.select_nonzero_transform_items import get_nonzero_items
+from scripts.profiling import profile_command
 
 
+@profile_command
 def main():
     items = get_nonzero_items(modo.Scene().selectedByType(itype=c.LOCATOR_TYPE, superType=True))
 
@@ -11,8 +11,10 @@ import modo
 import modo.constants as c
 
 from scripts.select_zero_transform_items import get_zero_items
+from scripts.profiling import profile_command
 
 
+@profile_command
 def main():
     items = get_zero_items(modo.Scene().selectedByType(c.LOCATOR_TYPE, superType=True))
 
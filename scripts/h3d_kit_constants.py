@@ -12,7 +12,13 @@ MESH_PREFIX = '[M]'
 
 CMD_SELECTED = 'selected'
 CMD_HIERARCHY = 'hierarchy'
+CMD_INCREMENTAL = 'incremental'
+CMD_BINARY = 'binary'
+CMD_GZIP = 'gzip'
+CMD_DELTA = 'delta'
+CMD_DRY_RUN = 'dryrun'
 
 PROCESSED_MARK = 'processed'
+PROCESSED_TAG = 'MHSP'
 
 PARENT_LOC_SFX = 'loc'
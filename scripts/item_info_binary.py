@@ -0,0 +1,255 @@
+#!/usr/bin/python
+# ================================
+# (C)2026 Dmytro Holub
+# heap3d@gmail.com
+# --------------------------------
+# EMAG
+# modo python
+# versioned binary columnar item info format
+# layout, little-endian, every section aligned to 8 bytes so the file can be memory-mapped:
+#   header: magic, version, flags, items count, strings count
+#   string table: uint32 offsets (strings count + 1), utf-8 blob
+#   columns: uint32 name, scene, type string indices; uint8 flags: is_meshref, recorded, parent recorded;
+#            int32 parent row, -1 for the scene root; int32 parent_index;
+#            float64 transforms, 9 per item: px py pz rx ry rz sx sy sz
+# version 1 files stored the full ancestor path per item, they are still readable:
+#   columns: uint32 name, scene, type string indices; uint8 is_meshref; int32 parent_index;
+#            uint32 hierarchy offsets (items count + 1), uint32 hierarchy name string indices;
+#            float64 transforms
+
+from array import array
+import mmap
+import struct
+import sys
+from typing import Callable, Iterable
+
+from scripts.item_info_table import ItemInfoTable, NO_PARENT
+from scripts.transforms_reader import WIDTH
+from scripts.profiling import open_file
+
+
+MAGIC = b'H3DMHSI\x00'
+VERSION = 2
+LEGACY_VERSION = 1
+HEADER = struct.Struct('<8sHHII')
+ALIGNMENT = 8
+MESHREF_FLAG = 1
+RECORDED_FLAG = 2
+PARENT_FLAG = 4
+# typecode and values per row of the version 2 columns in the file order
+COLUMN_LAYOUT = (('I', 1), ('I', 1), ('I', 1), ('B', 1), ('i', 1), ('i', 1), ('d', WIDTH))
+
+
+def get_padding(size: int) -> bytes:
+    return bytes(-size % ALIGNMENT)
+
+
+def get_aligned(size: int) -> int:
+    return size + len(get_padding(size))
+
+
+def to_little_endian(column: array) -> array:
+    if sys.byteorder == 'little':
+        return column
+    swapped = array(column.typecode, column)
+    swapped.byteswap()
+    return swapped
+
+
+def write_info_binary(filename: str, table: ItemInfoTable):
+    flags = array('B', (
+        meshref * MESHREF_FLAG | recorded * RECORDED_FLAG | parent_recorded * PARENT_FLAG
+        for meshref, recorded, parent_recorded in zip(table.meshrefs, table.recorded, table.hierarchy_recorded)
+    ))
+    columns = (
+        table.names,
+        table.scenes,
+        table.types,
+        flags,
+        table.parents,
+        table.parent_indices,
+        table.transforms,
+    )
+
+    blobs = [text.encode('utf-8') for text in table.strings]
+    string_offsets = array('I', (0,))
+    for blob in blobs:
+        string_offsets.append(string_offsets[-1] + len(blob))
+
+    with open_file(filename, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, VERSION, 0, len(table), len(table.strings)))
+        file.write(get_padding(HEADER.size))
+        for section in (to_little_endian(string_offsets), b''.join(blobs), *map(to_little_endian, columns)):
+            data = section.tobytes() if isinstance(section, array) else section
+            file.write(data)
+            file.write(get_padding(len(data)))
+
+
+def is_binary_info(filename: str) -> bool:
+    with open_file(filename, 'rb') as file:
+        return file.read(len(MAGIC)) == MAGIC
+
+
+def read_info_binary(filename: str) -> ItemInfoTable:
+    """Read item info table from the binary info file
+
+    Args:
+        filename (str): binary info file name
+
+    Raises:
+        ValueError: if the file is not a binary info file or its version is not supported
+
+    Returns:
+        ItemInfoTable: item info table
+    """
+    with open_file(filename, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        view = memoryview(data)
+        try:
+            return read_table(view, filename)
+        finally:
+            view.release()
+
+
+def read_table(view: memoryview, filename: str) -> ItemInfoTable:
+    if len(view) < HEADER.size:
+        raise ValueError(f'<{filename}> is not a binary info file.')
+    magic, version, _, items_count, strings_count = HEADER.unpack_from(view)
+    if magic != MAGIC:
+        raise ValueError(f'<{filename}> is not a binary info file.')
+    if version not in (VERSION, LEGACY_VERSION):
+        raise ValueError(f'<{filename}>: unsupported binary info version {version}.')
+
+    position = get_aligned(HEADER.size)
+
+    def read_section(typecode: str, count: int) -> array:
+        nonlocal position
+        column = array(typecode)
+        size = count * column.itemsize
+        if position + size > len(view):
+            raise ValueError(f'<{filename}>: binary info file is truncated.')
+        column.frombytes(view[position:position + size])
+        if sys.byteorder != 'little':
+            column.byteswap()
+        position += size + len(get_padding(size))
+        return column
+
+    string_offsets = read_section('I', strings_count + 1)
+    blob = bytes(read_section('B', string_offsets[-1]))
+    strings = [blob[start:end].decode('utf-8') for start, end in zip(string_offsets, string_offsets[1:])]
+
+    table = ItemInfoTable()
+    for index, text in enumerate(strings):
+        table.string_indices.setdefault(text, index)
+    table.strings.extend(strings)
+
+    names = read_section('I', items_count)
+    scenes = read_section('I', items_count)
+    types = read_section('I', items_count)
+    if version == LEGACY_VERSION:
+        read_legacy_rows(table, names, scenes, types, read_section)
+        return table
+
+    flags = read_section('B', items_count)
+    parents = read_section('i', items_count)
+    parent_indices = read_section('i', items_count)
+    transforms = read_section('d', items_count * WIDTH)
+    if any(not NO_PARENT <= parent < items_count for parent in parents):
+        raise ValueError(f'<{filename}>: binary info file has broken parent links.')
+
+    table.names = names
+    table.scenes = scenes
+    table.types = types
+    table.meshrefs = array('B', (bool(flag & MESHREF_FLAG) for flag in flags))
+    table.recorded = array('B', (bool(flag & RECORDED_FLAG) for flag in flags))
+    table.hierarchy_recorded = array('B', (bool(flag & PARENT_FLAG) for flag in flags))
+    table.parents = parents
+    table.parent_indices = parent_indices
+    table.transforms = transforms
+    table.rows_by_name = {strings[name]: row for row, name in enumerate(names)}
+
+    return table
+
+
+def read_legacy_rows(
+    table: ItemInfoTable, names: array, scenes: array, types: array, read_section: Callable[[str, int], array]
+):
+    """Add rows of the version 1 file, rebuild parent links from the stored ancestor paths"""
+    items_count = len(names)
+    meshrefs = read_section('B', items_count)
+    parent_indices = read_section('i', items_count)
+    hierarchy_offsets = read_section('I', items_count + 1)
+    hierarchy_names = read_section('I', hierarchy_offsets[-1])
+    transforms = read_section('d', items_count * WIDTH)
+    strings = table.strings
+    for file_row in range(items_count):
+        row = table.add_record(strings[names[file_row]])
+        table.scenes[row] = scenes[file_row]
+        table.types[row] = types[file_row]
+        table.meshrefs[row] = meshrefs[file_row]
+        table.parent_indices[row] = parent_indices[file_row]
+        table.transforms[row * WIDTH:(row + 1) * WIDTH] = transforms[file_row * WIDTH:(file_row + 1) * WIDTH]
+        start, end = hierarchy_offsets[file_row], hierarchy_offsets[file_row + 1]
+        if start != end:
+            table.set_hierarchy(row, (strings[i] for i in hierarchy_names[start:end]))
+
+
+def read_info_binary_rows(
+    data: mmap.mmap, filename: str, table: ItemInfoTable, file_rows: Iterable[int]
+) -> list[int]:
+    """Copy the rows of the memory-mapped binary info file into the table without reading the whole file
+
+    Args:
+        data (mmap.mmap): binary info file mapped by the caller, current version only
+        filename (str): binary info file name for the messages
+        table (ItemInfoTable): table to add the records to
+        file_rows (Iterable[int]): rows of the file
+
+    Raises:
+        ValueError: if the file is not a binary info file of the current version
+
+    Returns:
+        list[int]: table rows of the copied records
+    """
+    magic, version, _, items_count, strings_count = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f'<{filename}>: unsupported binary info version {version}.')
+
+    strings_position = get_aligned(HEADER.size)
+    blob_position = get_aligned(strings_position + (strings_count + 1) * 4)
+    blob_size = struct.unpack_from('<I', data, strings_position + strings_count * 4)[0]
+    position = get_aligned(blob_position + blob_size)
+    columns: list[tuple[int, struct.Struct]] = []
+    for typecode, width in COLUMN_LAYOUT:
+        column_format = struct.Struct(f'<{width}{typecode}')
+        columns.append((position, column_format))
+        position = get_aligned(position + items_count * column_format.size)
+    if position > len(data):
+        raise ValueError(f'<{filename}>: binary info file is truncated.')
+
+    def get_string(index: int) -> str:
+        start, end = struct.unpack_from('<II', data, strings_position + index * 4)
+        return data[blob_position + start:blob_position + end].decode('utf-8')
+
+    names_position = columns[0][0]
+
+    def get_name(file_row: int) -> str:
+        return get_string(struct.unpack_from('<I', data, names_position + file_row * 4)[0])
+
+    rows: list[int] = []
+    for file_row in file_rows:
+        _, scene, itype, flags, parent, parent_index, transforms = (
+            column_format.unpack_from(data, column_position + file_row * column_format.size)
+            for column_position, column_format in columns
+        )
+        row = table.add_row(get_name(file_row))
+        table.recorded[row] = bool(flags[0] & RECORDED_FLAG)
+        table.scenes[row] = table.intern(get_string(scene[0]))
+        table.types[row] = table.intern(get_string(itype[0]))
+        table.meshrefs[row] = bool(flags[0] & MESHREF_FLAG)
+        table.parent_indices[row] = parent_index[0]
+        table.transforms[row * WIDTH:(row + 1) * WIDTH] = array('d', transforms)
+        if flags[0] & PARENT_FLAG and parent[0] != NO_PARENT:
+            table.set_parent(row, get_name(parent[0]))
+        rows.append(row)
+
+    return rows
@@ -0,0 +1,74 @@
+#!/usr/bin/python
+# ================================
+# (C)2026 Dmytro Holub
+# heap3d@gmail.com
+# --------------------------------
+# EMAG
+# modo python
+# delta save support: per record fingerprints of the last save and the append-only delta log of the info file
+# fingerprints sidecar lines: 'fingerprint hex' 'item name'
+# delta log: text info records changed since the base save and 'name::removed::' lines, replayed in order
+
+import hashlib
+import os
+
+from scripts.item_info_table import ItemInfoTable, InfoRecord
+from scripts.profiling import open_file
+
+
+DELTA_SUFFIX = '.delta'
+FINGERPRINTS_SUFFIX = '.fp'
+TRANSFORMS_DIGITS = 6
+
+
+def get_delta_filename(filename: str) -> str:
+    return f'{filename}{DELTA_SUFFIX}'
+
+
+def get_fingerprints_filename(filename: str) -> str:
+    return f'{filename}{FINGERPRINTS_SUFFIX}'
+
+
+def has_delta(filename: str) -> bool:
+    return os.path.exists(get_delta_filename(filename))
+
+
+def is_delta_base(filename: str) -> bool:
+    """Check the info file was saved with fingerprints, so the next save can be appended as delta"""
+    return os.path.exists(filename) and os.path.exists(get_fingerprints_filename(filename))
+
+
+def remove_delta(filename: str):
+    try:
+        os.remove(get_delta_filename(filename))
+    except FileNotFoundError:
+        pass
+
+
+def get_record_fingerprint(record: InfoRecord) -> int:
+    """Hash name, scene, type, parent, parent index and transforms rounded to TRANSFORMS_DIGITS of the record"""
+    *fields, transforms = record
+    # + 0.0 folds the negative zero left by rounding
+    key = (*fields, tuple(round(value, TRANSFORMS_DIGITS) + 0.0 for value in transforms))
+    return int.from_bytes(hashlib.blake2b(repr(key).encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def get_fingerprints(table: ItemInfoTable) -> dict[str, int]:
+    return {
+        table.get_name(row): get_record_fingerprint(table.get_info_record(row)) for row in table.get_recorded_rows()
+    }
+
+
+def read_fingerprints(filename: str) -> dict[str, int]:
+    fingerprints: dict[str, int] = dict()
+    with open_file(get_fingerprints_filename(filename), encoding='utf-8') as file:
+        for line in file:
+            fingerprint, _, name = line.rstrip('\n').partition(' ')
+            fingerprints[name] = int(fingerprint, 16)
+
+    return fingerprints
+
+
+def write_fingerprints(filename: str, fingerprints: dict[str, int]):
+    with open_file(get_fingerprints_filename(filename), 'w', encoding='utf-8', newline='\n') as file:
+        file.writelines(f'{fingerprint:016x} {name}\n' for name, fingerprint in fingerprints.items())
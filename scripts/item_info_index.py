@@ -0,0 +1,145 @@
+#!/usr/bin/python
+# ================================
+# (C)2026 Dmytro Holub
+# heap3d@gmail.com
+# --------------------------------
+# EMAG
+# modo python
+# sidecar index of the info file records for random access by item name
+# layout, little-endian:
+#   header: magic, version, flags, entries count, info file size, info file modification time
+#   entries sorted by key hash: uint64 key hash, uint64 record offset, uint32 record length, int32 parent entry
+# text info records are addressed by byte offset and length, binary info records by row with zero length
+
+import hashlib
+import mmap
+import os
+import struct
+from typing import Iterator, Mapping
+
+from scripts.item_info_table import NO_PARENT
+from scripts.profiling import open_file
+
+
+MAGIC = b'H3DMHSX\x00'
+VERSION = 1
+HEADER = struct.Struct('<8sHHIQQ')
+ENTRY = struct.Struct('<QQIi')
+INDEX_SUFFIX = '.idx'
+
+Span = tuple[int, int]
+
+
+def get_index_filename(filename: str) -> str:
+    return f'{filename}{INDEX_SUFFIX}'
+
+
+def get_key_hash(name: str) -> int:
+    return int.from_bytes(hashlib.blake2b(name.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def get_info_stamp(filename: str) -> tuple[int, int]:
+    stat = os.stat(filename)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def write_info_index(filename: str, spans: Mapping[str, Span], parents: Mapping[str, str]):
+    """Write the sidecar index for the info file
+
+    Args:
+        filename (str): info file name, the index is written next to it
+        spans (Mapping[str, Span]): record offset and length by item name
+        parents (Mapping[str, str]): parent name by item name, empty for the scene root
+    """
+    names = sorted(spans, key=get_key_hash)
+    entries = {name: entry for entry, name in enumerate(names)}
+    size, mtime = get_info_stamp(filename)
+    with open_file(get_index_filename(filename), 'wb') as file:
+        file.write(HEADER.pack(MAGIC, VERSION, 0, len(names), size, mtime))
+        for name in names:
+            offset, length = spans[name]
+            file.write(ENTRY.pack(get_key_hash(name), offset, length, entries.get(parents.get(name, ''), NO_PARENT)))
+
+
+def remove_info_index(filename: str):
+    """Remove the index left from the previous save of the info file"""
+    try:
+        os.remove(get_index_filename(filename))
+    except FileNotFoundError:
+        pass
+
+
+def is_index_valid(filename: str) -> bool:
+    """Check the info file has an index written for its current content"""
+    try:
+        with open_file(get_index_filename(filename), 'rb') as file:
+            header = file.read(HEADER.size)
+        stamp = get_info_stamp(filename)
+    except OSError:
+        return False
+    if len(header) != HEADER.size:
+        return False
+    magic, version, _, _, size, mtime = HEADER.unpack(header)
+    return magic == MAGIC and version == VERSION and (size, mtime) == stamp
+
+
+class InfoIndex():
+    """Memory-mapped info file index, entries are found by binary search over the key hashes"""
+
+    def __init__(self, filename: str):
+        self.file = open_file(get_index_filename(filename), 'rb')
+        try:
+            self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self.file.close()
+            raise ValueError(f'<{filename}>: info index is empty.') from None
+        magic, version, _, self.count, _, _ = HEADER.unpack_from(self.data)
+        if magic != MAGIC or version != VERSION or len(self.data) < HEADER.size + self.count * ENTRY.size:
+            self.close()
+            raise ValueError(f'<{filename}>: info index is not supported.')
+
+    def __enter__(self) -> 'InfoIndex':
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def close(self):
+        self.data.close()
+        self.file.close()
+
+    def get_entry(self, entry: int) -> tuple[int, int, int, int]:
+        return ENTRY.unpack_from(self.data, HEADER.size + entry * ENTRY.size)
+
+    def find(self, name: str) -> list[int]:
+        """Get entries with the key hash of the name, colliding names are told apart by the record itself"""
+        key_hash = get_key_hash(name)
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self.get_entry(middle)[0] < key_hash:
+                low = middle + 1
+            else:
+                high = middle
+        entries: list[int] = []
+        while low < self.count and self.get_entry(low)[0] == key_hash:
+            entries.append(low)
+            low += 1
+
+        return entries
+
+    def get_span(self, entry: int) -> Span:
+        _, offset, length, _ = self.get_entry(entry)
+        return offset, length
+
+    def iter_ancestors(self, entry: int) -> Iterator[int]:
+        """Yield parent entries of the entry, the nearest parent first, cycles are cut"""
+        parent = self.get_entry(entry)[3]
+        for _ in range(self.count):
+            if parent == NO_PARENT:
+                return
+            yield parent
+            parent = self.get_entry(parent)[3]
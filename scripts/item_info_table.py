@@ -0,0 +1,237 @@
+#!/usr/bin/python
+# ================================
+# (C)2026 Dmytro Holub
+# heap3d@gmail.com
+# --------------------------------
+# EMAG
+# modo python
+# structure-of-arrays item info store: interned strings, integer parent links and contiguous transforms
+
+from array import array
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator, Optional, Sequence
+
+import modo
+
+from scripts.transforms_reader import WIDTH, IDENTITY, POS, ROT, SCL, Transforms, split_row
+
+
+NO_PARENT = -1
+POS_COLUMN = POS.start
+ROT_COLUMN = ROT.start
+SCL_COLUMN = SCL.start
+
+# name, scene, type, is meshref, parent name, empty for the scene root, parent index, 9 transforms values
+InfoRecord = tuple[str, str, str, bool, str, int, Sequence[float]]
+
+
+@dataclass
+class ItemInfoTable():
+    """Item info records keyed by item name
+
+    Rows are created for every name seen, parent names included, the recorded flag marks rows
+    with their own info record. Every row keeps a link to its direct parent row, the hierarchy of
+    a row is rebuilt by following the parent links, available only for the rows recorded with parent.
+    """
+    strings: list[str] = field(default_factory=list)
+    string_indices: dict[str, int] = field(default_factory=dict)
+    names: array = field(default_factory=lambda: array('I'))
+    scenes: array = field(default_factory=lambda: array('I'))
+    types: array = field(default_factory=lambda: array('I'))
+    meshrefs: array = field(default_factory=lambda: array('B'))
+    recorded: array = field(default_factory=lambda: array('B'))
+    hierarchy_recorded: array = field(default_factory=lambda: array('B'))
+    parents: array = field(default_factory=lambda: array('i'))
+    parent_indices: array = field(default_factory=lambda: array('i'))
+    transforms: array = field(default_factory=lambda: array('d'))
+    rows_by_name: dict[str, int] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: str) -> bool:
+        row = self.rows_by_name.get(name)
+        return row is not None and bool(self.recorded[row])
+
+    def __getitem__(self, name: str) -> 'ItemInfoRow':
+        return ItemInfoRow(self, self.get_row(name))
+
+    def __iter__(self) -> Iterator[str]:
+        return (self.get_name(row) for row in self.get_recorded_rows())
+
+    def close(self):
+        """Release the files the records are read from, the in-memory table reads none"""
+
+    def intern(self, text: str) -> int:
+        index = self.string_indices.get(text)
+        if index is None:
+            index = self.string_indices[text] = len(self.strings)
+            self.strings.append(text)
+        return index
+
+    def get_row(self, name: str) -> int:
+        if name not in self:
+            raise KeyError(name)
+        return self.rows_by_name[name]
+
+    def add_row(self, name: str) -> int:
+        """Get row of the named item, add an empty not recorded row if there is no such name"""
+        row = self.rows_by_name.get(name)
+        if row is not None:
+            return row
+
+        row = self.rows_by_name[name] = len(self.names)
+        empty = self.intern('')
+        self.names.append(self.intern(name))
+        self.scenes.append(empty)
+        self.types.append(empty)
+        self.meshrefs.append(False)
+        self.recorded.append(False)
+        self.hierarchy_recorded.append(False)
+        self.parents.append(NO_PARENT)
+        self.parent_indices.append(0)
+        self.transforms.extend(IDENTITY)
+        return row
+
+    def add_record(self, name: str) -> int:
+        row = self.add_row(name)
+        self.recorded[row] = True
+        return row
+
+    def copy_record(self, source: 'ItemInfoTable', source_row: int) -> int:
+        """Add or overwrite the record with the record of the source table, the parent is linked by name"""
+        row = self.add_record(source.get_name(source_row))
+        self.scenes[row] = self.intern(source.get_scene(source_row))
+        self.types[row] = self.intern(source.get_type(source_row))
+        self.meshrefs[row] = source.meshrefs[source_row]
+        self.parent_indices[row] = source.parent_indices[source_row]
+        self.transforms[row * WIDTH:(row + 1) * WIDTH] = source.transforms[source_row * WIDTH:(source_row + 1) * WIDTH]
+        parent = source.parents[source_row]
+        has_parent = source.hierarchy_recorded[source_row] and parent != NO_PARENT
+        self.set_parent(row, source.get_name(parent) if has_parent else '')
+        return row
+
+    def add_info_record(self, record: InfoRecord) -> int:
+        """Add or overwrite the record, the parent is linked by name"""
+        name, scene, itype, meshref, parent_name, parent_index, transforms = record
+        row = self.add_record(name)
+        self.scenes[row] = self.intern(scene)
+        self.types[row] = self.intern(itype)
+        self.meshrefs[row] = meshref
+        self.parent_indices[row] = parent_index
+        self.transforms[row * WIDTH:(row + 1) * WIDTH] = array('d', transforms)
+        self.set_parent(row, parent_name)
+        return row
+
+    def get_info_record(self, row: int) -> InfoRecord:
+        parent = self.parents[row]
+        return (
+            self.get_name(row),
+            self.get_scene(row),
+            self.get_type(row),
+            bool(self.meshrefs[row]),
+            self.get_name(parent) if parent != NO_PARENT else '',
+            self.parent_indices[row],
+            self.transforms[row * WIDTH:(row + 1) * WIDTH],
+        )
+
+    def get_recorded_rows(self) -> list[int]:
+        return [row for row, recorded in enumerate(self.recorded) if recorded]
+
+    def get_name(self, row: int) -> str:
+        return self.strings[self.names[row]]
+
+    def get_scene(self, row: int) -> str:
+        return self.strings[self.scenes[row]]
+
+    def get_type(self, row: int) -> str:
+        return self.strings[self.types[row]]
+
+    def set_hierarchy(self, row: int, hierarchy: Iterable[str]):
+        """Link the row to the chain of parent names, the nearest parent first, empty chain is not recorded"""
+        child = row
+        for parent_name in hierarchy:
+            parent = self.add_row(parent_name)
+            self.parents[child] = parent
+            self.hierarchy_recorded[row] = True
+            child = parent
+
+    def set_parent(self, row: int, parent_name: str):
+        """Link the row to its direct parent, empty name stands for the scene root"""
+        self.parents[row] = self.add_row(parent_name) if parent_name else NO_PARENT
+        self.hierarchy_recorded[row] = bool(parent_name)
+
+    def iter_hierarchy(self, row: int) -> Iterator[int]:
+        """Yield ancestor rows of the row recorded with parent, the nearest parent first, cycles are cut"""
+        if not self.hierarchy_recorded[row]:
+            return
+        parent = self.parents[row]
+        for _ in range(len(self)):
+            if parent == NO_PARENT:
+                return
+            yield parent
+            parent = self.parents[parent]
+
+    def get_hierarchy(self, row: int) -> list[int]:
+        """Get ancestor rows of the row recorded with parent, the nearest parent first"""
+        return list(self.iter_hierarchy(row))
+
+    def get_hierarchy_names(self, row: int) -> list[str]:
+        return [self.get_name(parent) for parent in self.get_hierarchy(row)]
+
+    def set_transforms(self, row: int, column: int, values: Iterable[float]):
+        offset = row * WIDTH + column
+        self.transforms[offset:offset + 3] = array('d', values)
+
+    def get_transforms(self, row: int) -> Transforms:
+        return split_row(self.transforms, row)
+
+
+class ItemInfoRow():
+    """Lightweight view of the item info table row"""
+    __slots__ = ('table', 'row')
+
+    def __init__(self, table: ItemInfoTable, row: int):
+        self.table = table
+        self.row = row
+
+    @property
+    def name(self) -> str:
+        return self.table.get_name(self.row)
+
+    @property
+    def scene(self) -> str:
+        return self.table.get_scene(self.row)
+
+    @property
+    def itype(self) -> str:
+        return self.table.get_type(self.row)
+
+    @property
+    def is_meshref(self) -> bool:
+        return bool(self.table.meshrefs[self.row])
+
+    @property
+    def parent_index(self) -> int:
+        return self.table.parent_indices[self.row]
+
+    @property
+    def hierarchy(self) -> list[str]:
+        return self.table.get_hierarchy_names(self.row)
+
+    @property
+    def parent(self) -> Optional['ItemInfoRow']:
+        parent = self.table.parents[self.row]
+        return ItemInfoRow(self.table, parent) if parent != NO_PARENT else None
+
+    @property
+    def pos(self) -> modo.Vector3:
+        return modo.Vector3(self.table.get_transforms(self.row)[0])
+
+    @property
+    def rot(self) -> modo.Vector3:
+        return modo.Vector3(self.table.get_transforms(self.row)[1])
+
+    @property
+    def scl(self) -> modo.Vector3:
+        return modo.Vector3(self.table.get_transforms(self.row)[2])
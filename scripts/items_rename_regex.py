@@ -12,11 +12,14 @@ import re
 
 from h3d_utilites.scripts.h3d_utils import get_user_value
 
+from scripts.profiling import profile_command
+
 
 USERVAL_PATTERN = 'h3d_irr_pattern'
 USERVAL_REPLACEMENT = 'h3d_irr_replacement'
 
 
+@profile_command
 def main():
     pattern = get_user_value(USERVAL_PATTERN)
     if not pattern:
@@ -13,11 +13,16 @@ import modo
 import modo.constants as c
 
 from scripts.load_selected_item_info import (
-    load_items_info, process_items, meshref_transform_to_locator, get_working_items,
+    load_merged_items_info, get_info_filenames, is_first_wins, process_items, meshref_transform_to_locator,
+    get_working_items, report_missed_lookups, get_hierarchy_items, print_load_plan,
     TOLERANCE, FULL_HIERARCHY,
 )
+from scripts.save_item_info import ItemKeyCache
+from scripts.scene_operations import is_dry_run_arg
+from scripts.profiling import profile_command, phase
 
 
+@profile_command
 def main():
     items: list[modo.Item] = modo.Scene().items(itype=c.LOCATOR_TYPE, superType=True)
     if not items:
@@ -27,25 +32,30 @@ def main():
         path = os.path.dirname(modo.Scene().filename)
     except TypeError:
         path = ''
-    filename = modo.dialogs.fileOpen('text', path=path)
-    if isinstance(filename, list):
-        raise ValueError('Multiple files selected. Please select one file only.')
-    if not filename:
+    filenames = get_info_filenames(path)
+    if not filenames:
         return
 
-    items_info = load_items_info(filename)
-    working_items = get_working_items(items, items_info)
+    with phase('read'):
+        items_info = load_merged_items_info(filenames, is_first_wins())
+    item_keys = ItemKeyCache()
+    with phase('collect', len(items)):
+        working_items = get_working_items(items, items_info, item_keys)
     if not working_items:
         modo.dialogs.alert('Aborted', 'No info for items in the scene found.')
         return
 
-    process_items(working_items, items_info, FULL_HIERARCHY)
+    if is_dry_run_arg():
+        print_load_plan(working_items, items_info, get_hierarchy_items(items), item_keys)
+        return
+
+    with phase('apply', len(working_items)):
+        name_index = process_items(working_items, items_info, FULL_HIERARCHY, item_keys=item_keys)
+    report_missed_lookups(name_index)
 
-    hierarchy_items: list[modo.Item] = items[:]
-    for selected_item in items:
-        if selected_item.parents:
-            hierarchy_items.extend(selected_item.parents)
-    meshref_transform_to_locator(hierarchy_items, TOLERANCE)
+    hierarchy_items = get_hierarchy_items(items)
+    with phase('normalize', len(hierarchy_items)):
+        meshref_transform_to_locator(hierarchy_items, TOLERANCE, item_keys)
 
 
 if __name__ == '__main__':
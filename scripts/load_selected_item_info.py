@@ -7,37 +7,55 @@
 # modo python
 # load items info from file
 
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import closing
+from dataclasses import dataclass, field
+from itertools import chain, islice
+import gzip
+import locale
+import mmap
+import multiprocessing
 import os
-from typing import Iterable
+from typing import BinaryIO, Callable, Iterable, Iterator, Optional, Sequence, TextIO
 
-import lx
 import modo
 import modo.constants as c
 
-from h3d_utilites.scripts.h3d_utils import (
-    item_set_position, item_set_rotation, item_set_scale,
-    parent_items_to, get_parent_index,
-    get_user_value,
-)
+from h3d_utilites.scripts.h3d_utils import get_parent_index, get_user_value
 
 from scripts.save_item_info import (
-    ItemInfo, POS, ROT, SCL, SCENE, TYPE, IS_MESHREF, HIERARCHY, PARENT_INDEX,
-    NAME_SEPARATOR, TAG_SEPARATOR, strip_meshref_name
+    POS, ROT, SCL, REMOVED, SCENE, TYPE, IS_MESHREF, HIERARCHY, PARENT, PARENT_INDEX,
+    NAME_SEPARATOR, TAG_SEPARATOR, FORMAT, FORMAT_VERSION, ItemKeyCache
 )
-from scripts.select_meshref_meshes import is_meshref
+from scripts.transforms_reader import read_transforms, read_rotation_orders, read_custom_stacks, split_row
+from scripts.transforms_math import IDENTITY_TRANSFORMS, convert_rotation_order
+from scripts.item_info_table import ItemInfoTable, POS_COLUMN, ROT_COLUMN, SCL_COLUMN
+from scripts.item_info_binary import is_binary_info, read_info_binary, read_info_binary_rows
+from scripts.item_info_index import InfoIndex, is_index_valid
+from scripts.item_info_delta import get_delta_filename, has_delta
+from scripts.transforms_classify import get_zero_mask
+from scripts.scene_operations import ItemRef, OperationPlan, execute_plan, is_dry_run_arg, print_plan
+from scripts.profiling import profile_command, phase, open_file
 
 
-ItemsInfo = dict[str, ItemInfo]
-Transforms = tuple[modo.Vector3, modo.Vector3, modo.Vector3]
+ItemsInfo = ItemInfoTable
 
 LOCATOR_SUFFIX = ' loc'
+CHUNK_SIZE = 1 << 20
+MAX_PARSE_WORKERS = 8
+COMMENT_PREFIX = '#'
+GZIP_MAGIC = b'\x1f\x8b'
 USERVAL_NAME_HIERARCHY = 'h3d_mhs_full_hierarchy'
 USERVAL_NAME_TOLERANCE = 'h3d_mhs_tolerance'
+USERVAL_NAME_FIRST_WINS = 'h3d_mhs_first_wins'
 
 TOLERANCE = get_user_value(USERVAL_NAME_TOLERANCE)
 FULL_HIERARCHY = get_user_value(USERVAL_NAME_HIERARCHY) == 1
 
 
+@profile_command
 def main():
     selected: list[modo.Item] = modo.Scene().selectedByType(itype=c.LOCATOR_TYPE, superType=True)
     if not selected:
@@ -48,178 +66,628 @@ def main():
     except TypeError:
         path = ''
 
-    filename = modo.dialogs.fileOpen('text', path=path)
-    if isinstance(filename, list):
-        raise ValueError('Multiple files selected. Please select one file only.')
-
-    if not filename:
+    filenames = get_info_filenames(path)
+    if not filenames:
         return
 
-    items_info = load_items_info(filename)
-    working_items = get_working_items(selected, items_info)
+    with phase('read'):
+        items_info = open_items_info_files(filenames, is_first_wins())
+    with closing(items_info):
+        load_selected_items_info(selected, items_info)
+
+
+def load_selected_items_info(selected: list[modo.Item], items_info: ItemsInfo):
+    item_keys = ItemKeyCache()
+    with phase('collect', len(selected)):
+        working_items = get_working_items(selected, items_info, item_keys)
     if not working_items:
         modo.dialogs.alert('Aborted', 'No info for selected items found.')
         return
 
-    process_items(working_items, items_info, FULL_HIERARCHY)
+    if is_dry_run_arg():
+        print_load_plan(working_items, items_info, get_hierarchy_items(selected), item_keys)
+        return
+
+    with phase('apply', len(working_items)):
+        name_index = process_items(working_items, items_info, FULL_HIERARCHY, item_keys=item_keys)
+    report_missed_lookups(name_index)
+
+    hierarchy_items = get_hierarchy_items(selected)
+    with phase('normalize', len(hierarchy_items)):
+        meshref_transform_to_locator(hierarchy_items, TOLERANCE, item_keys)
+
+
+def get_hierarchy_items(items: Sequence[modo.Item]) -> list[modo.Item]:
+    hierarchy_items: list[modo.Item] = list(items)
+    for item in items:
+        if item.parents:
+            hierarchy_items.extend(item.parents)
+
+    return hierarchy_items
 
-    hierarchy_items: list[modo.Item] = selected[:]
-    for selected_item in selected:
-        if selected_item.parents:
-            hierarchy_items.extend(selected_item.parents)
 
-    meshref_transform_to_locator(hierarchy_items, TOLERANCE)
+def print_load_plan(
+    items: Sequence[modo.Item], items_info: ItemsInfo, hierarchy_items: Iterable[modo.Item], item_keys: ItemKeyCache
+):
+    """Print the load plans without changing the scene
+
+    The meshref locators are planned for the current transforms, the applied info may change them.
+    """
+    name_index = get_item_name_index(items)
+    print_plan('Load', get_process_operations(items, items_info, FULL_HIERARCHY, name_index, item_keys))
+    report_missed_lookups(name_index)
+    print_plan('Meshref locators', get_meshref_locator_operations(hierarchy_items, TOLERANCE, item_keys))
 
 
 def load_items_info(filename: str) -> ItemsInfo:
     if not filename:
         raise ValueError('File name is not specified.')
 
-    info_lines = [line.strip() for line in load_info_lines(filename)]
+    if is_binary_info(filename):
+        items_info = read_info_binary(filename)
+    else:
+        items_info = ItemsInfo()
+        parse_info_lines(items_info, read_info_lines(filename), filename)
 
-    items_info: ItemsInfo = dict()
-    for info_line in info_lines:
-        if not info_line:
-            continue
-        extract_info_line(info_line, items_info)
+    if has_delta(filename):
+        delta_filename = get_delta_filename(filename)
+        parse_info_lines(items_info, read_info_lines(delta_filename), delta_filename)
 
     return items_info
 
 
-def get_working_items(items: Iterable[modo.Item], items_info: ItemsInfo) -> tuple[modo.Item, ...]:
-    return tuple(i for i in items if strip_meshref_name(i) in items_info)
+def open_items_info(filename: str) -> ItemsInfo:
+    """Get items info decoded on demand if the info file is indexed and has no delta log, fully loaded otherwise"""
+    if not filename:
+        raise ValueError('File name is not specified.')
+
+    if not is_index_valid(filename) or has_delta(filename):
+        return load_items_info(filename)
+
+    return IndexedItemsInfo(filename=filename, is_binary=is_binary_info(filename))
+
+
+def get_info_filenames(path: str) -> list[str]:
+    filenames = modo.dialogs.fileOpen('text', multi=True, path=path)
+    if not filenames:
+        return []
+    if isinstance(filenames, str):
+        return [filenames]
+    return list(filenames)
+
+
+def is_first_wins() -> bool:
+    return get_user_value(USERVAL_NAME_FIRST_WINS) == 1
 
 
-def process_items(items: Iterable[modo.Item], items_info: ItemsInfo, full_hierarchy: bool):
+def open_items_info_files(filenames: Sequence[str], first_wins: bool = False) -> ItemsInfo:
+    """Get items info of the single file decoded on demand, merged items info of the loaded files otherwise"""
+    if len(filenames) == 1:
+        return open_items_info(filenames[0])
+    return load_merged_items_info(filenames, first_wins)
+
+
+def load_merged_items_info(filenames: Sequence[str], first_wins: bool = False) -> ItemsInfo:
+    """Parse the info files concurrently, merge them in the file order
+
+    Args:
+        filenames (Sequence[str]): info file names
+        first_wins (bool): keep the record of the first file listing the item, the last file wins otherwise
+
+    Returns:
+        ItemsInfo: merged items info
+    """
+    tables = load_items_info_files(filenames)
+    if len(tables) == 1:
+        return tables[0]
+
+    merged = ItemsInfo()
+    for table in (tables if first_wins else reversed(tables)):
+        for row in table.get_recorded_rows():
+            if table.get_name(row) not in merged:
+                merged.copy_record(table, row)
+
+    return merged
+
+
+def load_items_info_files(filenames: Sequence[str]) -> list[ItemsInfo]:
+    """Parse the info files in the bounded worker pool, results keep the file order
+
+    Workers are spawned, not forked: a forked copy of the host process inherits the locks held by its other threads.
+    A single file, or a pool whose workers fail to start, is parsed on the calling thread.
+    """
+    workers = min(len(filenames), os.cpu_count() or 1, MAX_PARSE_WORKERS)
+    if workers > 1:
+        try:
+            with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('spawn')) as executor:
+                return list(executor.map(load_items_info, filenames))
+        except (BrokenProcessPool, OSError) as error:
+            print(f'Parse workers failed to start, the info files are parsed one after another: {error}')
+
+    return [load_items_info(filename) for filename in filenames]
+
+
+def parse_info_lines(items_info: ItemsInfo, info_lines: Iterable[tuple[int, str]], filename: str) -> list[int]:
+    """Add records of the numbered text info lines to the items info, get rows of the records in the file order"""
+    rows: list[int] = []
+    row = 0
+    last_name = None
+    for line_number, info_line in info_lines:
+        info_line = info_line.strip()
+        if not info_line:
+            continue
+        if info_line.startswith(COMMENT_PREFIX):
+            check_format_header(filename, line_number, info_line)
+            continue
+        try:
+            item_name, data_tag, data_line = info_line.split(TAG_SEPARATOR)
+            handler = INFO_LINE_HANDLERS[data_tag]
+        except (ValueError, KeyError):
+            raise ValueError(f'{filename}:{line_number}: malformed info line <{info_line}>') from None
+
+        if item_name != last_name:
+            last_name = item_name
+            row = items_info.add_record(item_name)
+            rows.append(row)
+        try:
+            handler(items_info, row, data_line)
+        except ValueError as error:
+            raise ValueError(f'{filename}:{line_number}: malformed {data_tag} value <{data_line}>: {error}') from None
+
+    return rows
+
+
+@dataclass
+class IndexedItemsInfo(ItemsInfo):
+    """Items info view of the indexed info file
+
+    Records are decoded on the first lookup of the item name, together with their ancestors
+    not decoded yet. The rest of the file is never read.
+    The index and the info file are opened and mapped on the first lookup and kept open until close.
+    """
+    filename: str = ''
+    is_binary: bool = False
+    decoded_entries: set[int] = field(default_factory=set)
+    index: Optional[InfoIndex] = field(default=None, repr=False, compare=False)
+    data_file: Optional[BinaryIO] = field(default=None, repr=False, compare=False)
+    data: Optional[mmap.mmap] = field(default=None, repr=False, compare=False)
+
+    def __contains__(self, name: str) -> bool:
+        return super().__contains__(name) or self.load_record(name)
+
+    def open(self) -> InfoIndex:
+        if self.index is None:
+            self.index = InfoIndex(self.filename)
+            self.data_file = open_file(self.filename, 'rb')
+            self.data = mmap.mmap(self.data_file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self.index
+
+    def close(self):
+        if self.data is not None:
+            self.data.close()
+            self.data = None
+        if self.data_file is not None:
+            self.data_file.close()
+            self.data_file = None
+        if self.index is not None:
+            self.index.close()
+            self.index = None
+
+    def load_record(self, name: str) -> bool:
+        index = self.open()
+        for entry in index.find(name):
+            if entry not in self.decoded_entries:
+                self.read_entry(index, entry)
+            if super().__contains__(name):
+                return True
+
+        return False
+
+    def read_entry(self, index: InfoIndex, entry: int):
+        """Decode the entry record and its ancestors up to the first one decoded before"""
+        entries = [entry]
+        for parent_entry in index.iter_ancestors(entry):
+            if parent_entry in self.decoded_entries:
+                break
+            entries.append(parent_entry)
+        self.decoded_entries.update(entries)
+        spans = [index.get_span(i) for i in entries]
+        data: mmap.mmap = self.data  # type: ignore
+
+        if self.is_binary:
+            read_info_binary_rows(data, self.filename, self, (offset for offset, _ in spans))
+            return
+
+        encoding = locale.getpreferredencoding(False)
+        for offset, length in spans:
+            record = data[offset:offset + length].decode(encoding)
+            parse_info_lines(self, enumerate(record.split('\n'), 1), f'{self.filename}@{offset}')
+
+
+def check_format_header(filename: str, line_number: int, info_line: str):
+    """Reject info files written in a newer format, files without header are legacy full hierarchy files"""
+    tag, _, version = info_line[len(COMMENT_PREFIX):].partition(TAG_SEPARATOR)
+    if tag != FORMAT:
+        return
+    if not version.isdigit() or int(version) > FORMAT_VERSION:
+        raise ValueError(f'{filename}:{line_number}: unsupported info format version <{version}>')
+
+
+def get_working_items(
+    items: Iterable[modo.Item], items_info: ItemsInfo, item_keys: Optional[ItemKeyCache] = None
+) -> tuple[modo.Item, ...]:
+    if item_keys is None:
+        item_keys = ItemKeyCache()
+    return tuple(i for i in items if item_keys.get_name(i) in items_info)
+
+
+@dataclass
+class ItemNameIndex():
+    """Locator items by name for one load, items created during the load are added
+
+    The index starts with the known items, the whole scene is indexed on the first lookup that misses them.
+    """
+    items: dict[str, modo.Item] = field(default_factory=dict)
+    misses: int = 0
+    scene_indexed: bool = False
+
+    def add(self, name: str, item: modo.Item):
+        self.items.setdefault(name, item)
+
+    def get(self, *names: str) -> Optional[modo.Item]:
+        """Get the item of the first name found, index the scene if none of the names is known yet"""
+        item = self.find(names)
+        if item is None and not self.scene_indexed:
+            self.index_scene()
+            item = self.find(names)
+        return item
+
+    def find(self, names: Iterable[str]) -> Optional[modo.Item]:
+        for name in names:
+            item = self.items.get(name)
+            if item is not None:
+                return item
+        return None
+
+    def index_scene(self):
+        self.scene_indexed = True
+        for item in modo.Scene().items(itype=c.LOCATOR_TYPE, superType=True):
+            self.add(item.name, item)
+
+
+def get_item_name_index(items: Iterable[modo.Item] = ()) -> ItemNameIndex:
+    """Get the name index knowing the items and their ancestors, the parents to resolve are usually among them"""
+    name_index = ItemNameIndex()
     for item in items:
-        item_set_position(item, items_info[strip_meshref_name(item)].pos)
-        item_set_rotation(item, items_info[strip_meshref_name(item)].rot)
-        item_set_scale(item, items_info[strip_meshref_name(item)].scl)
+        name_index.add(item.name, item)
+        for parent in item.parents:
+            name_index.add(parent.name, parent)
+
+    return name_index
+
+
+@dataclass
+class ApplyPlan():
+    """Info rows to apply in parents-first order, each row is resolved, parented and transformed once"""
+    rows: list[int] = field(default_factory=list)
+    links: dict[int, int] = field(default_factory=dict)
+    items: dict[int, list[modo.Item]] = field(default_factory=dict)
+
 
-        parents: list[modo.Item] = []
-        if full_hierarchy:
-            hierarchy = items_info[strip_meshref_name(item)].hierarchy
+def get_apply_plan(
+    items: Iterable[modo.Item], items_info: ItemsInfo, full_hierarchy: bool, item_keys: ItemKeyCache
+) -> ApplyPlan:
+    """Build deduplicated parent graph of the items and their saved ancestors
+
+    Args:
+        items (Iterable[modo.Item]): working items
+        items_info (ItemsInfo): items info
+        full_hierarchy (bool): link the whole saved ancestor chain if enabled, the direct parent only otherwise
+        item_keys (ItemKeyCache): item keys of the command
+
+    Raises:
+        KeyError: if a linked parent has no info record
+
+    Returns:
+        ApplyPlan: rows ordered by depth, parent and parent index, links from child to parent rows
+    """
+    plan = ApplyPlan()
+    for item in items:
+        row = items_info.get_row(item_keys.get_name(item))
+        plan.items.setdefault(row, []).append(item)
+
+    for row in plan.items:
+        hierarchy = items_info.iter_hierarchy(row)
+        if not full_hierarchy:
+            hierarchy = islice(hierarchy, 1)
+        child_row = row
+        for parent_row in hierarchy:
+            if child_row in plan.links:
+                break
+            if not items_info.recorded[parent_row]:
+                raise KeyError(items_info.get_name(parent_row))
+            plan.links[child_row] = parent_row
+            child_row = parent_row
+
+    depths: dict[int, int] = dict()
+    for row in chain(plan.items, plan.links.values()):
+        unknown: list[int] = []
+        top = row
+        while top not in depths and top in plan.links:
+            unknown.append(top)
+            top = plan.links[top]
+        depth = depths.setdefault(top, 0)
+        for child_row in reversed(unknown):
+            depth += 1
+            depths[child_row] = depth
+
+    plan.rows = sorted(
+        depths, key=lambda row: (depths[row], plan.links.get(row, -1), items_info.parent_indices[row], row)
+    )
+    return plan
+
+
+def get_apply_operations(plan: ApplyPlan, items_info: ItemsInfo, name_index: ItemNameIndex) -> OperationPlan:
+    """Plan resolving or creating the plan items, linking them to their parents and restoring their transforms
+
+    Parenting keeps the local transforms, so the transforms are set after the whole hierarchy is linked
+    and the siblings inserted next to each other are linked in one call.
+    """
+    operations = OperationPlan()
+    refs: dict[int, list[ItemRef]] = dict()
+    for row in plan.rows:
+        name = items_info.get_name(row)
+        targets = plan.items.get(row)
+        if targets is None:
+            scene, itype = items_info.get_scene(row), items_info.get_type(row)
+            refs[row] = [get_item_ref(operations, name_index, name, scene, itype)]
+        else:
+            refs[row] = [operations.add_item(target, name) for target in targets]
+
+        parent_row = plan.links.get(row)
+        if parent_row is not None:
+            operations.reparent(refs[row], refs[parent_row][0], items_info.parent_indices[row], inplace=False)
+
+    for row in plan.rows:
+        pos, rot, scl = items_info.get_transforms(row)
+        for ref in refs[row]:
+            operations.set_transforms(ref, pos, rot, scl)
+
+    return operations
+
+
+def get_process_operations(
+    items: Iterable[modo.Item],
+    items_info: ItemsInfo,
+    full_hierarchy: bool,
+    name_index: ItemNameIndex,
+    item_keys: ItemKeyCache,
+) -> OperationPlan:
+    return get_apply_operations(get_apply_plan(items, items_info, full_hierarchy, item_keys), items_info, name_index)
+
+
+def process_items(
+    items: Iterable[modo.Item],
+    items_info: ItemsInfo,
+    full_hierarchy: bool,
+    name_index: Optional[ItemNameIndex] = None,
+    item_keys: Optional[ItemKeyCache] = None,
+) -> ItemNameIndex:
+    """Restore transforms and parents of the items, every item and ancestor is applied once, parents first
+
+    Returns:
+        ItemNameIndex: name index used to resolve the parents, with the missed lookups count
+    """
+    if name_index is None:
+        items = list(items)
+        name_index = get_item_name_index(items)
+    if item_keys is None:
+        item_keys = ItemKeyCache()
+
+    with phase('plan'):
+        operations = get_process_operations(items, items_info, full_hierarchy, name_index, item_keys)
+    with phase('execute', len(operations)):
+        created = execute_plan(operations)
+    for ref, item in created.items():
+        name_index.add(operations.created[ref], item)
+
+    return name_index
+
+
+def get_meshref_locator_operations(
+    items: Iterable[modo.Item], tolerance: float, item_keys: Optional[ItemKeyCache] = None
+) -> OperationPlan:
+    """Plan parenting the meshref items with not zero transforms to new locators taking over their transforms
+
+    Items are planned parents first, a planned item passes its children to its locator
+    right after itself, so the locator of a child is linked to the locator of its parent.
+    The locator takes the item place and local transforms, so nothing is parented in place,
+    except for the items with pivots or extra transform items, their locators are parented in place.
+    """
+    if item_keys is None:
+        item_keys = ItemKeyCache()
+    meshrefs: dict[str, modo.Item] = dict()
+    for item in items:
+        if item_keys.get(item)[2]:
+            meshrefs.setdefault(item.id, item)
+    transforms = read_transforms(list(meshrefs.values()))
+    candidates = [
+        (item_id, item, split_row(transforms, row))
+        for row, ((item_id, item), is_zero) in enumerate(zip(meshrefs.items(), get_zero_mask(transforms, tolerance)))
+        if not is_zero
+    ]
+    orders = read_rotation_orders([item for _, item, _ in candidates])
+    custom_stacks = read_custom_stacks([item for _, item, _ in candidates])
+    depths = [len(item.parents) for _, item, _ in candidates]
+
+    operations = OperationPlan()
+    locators: dict[str, ItemRef] = dict()
+    for candidate in sorted(range(len(candidates)), key=depths.__getitem__):
+        item_id, item, item_transforms = candidates[candidate]
+        name = str(item.name)
+        ref = operations.add_item(item, name)
+        parent = item.parent
+        index = get_parent_index(item)
+        parent_ref: Optional[ItemRef] = None
+        if parent:
+            parent_ref = locators.get(parent.id)
+            if parent_ref is None:
+                parent_ref = operations.add_item(parent)
+            else:
+                index += 1
+
+        locator = operations.create(c.LOCATOR_TYPE, f'{name}{LOCATOR_SUFFIX}')
+        children = [operations.add_item(child) for child in item.children()]
+        if custom_stacks[candidate]:
+            # pivots and extra transform items are not in the channels, the locator takes the item world in place
+            operations.reparent((locator,), ref, inplace=False)
+            operations.reparent((locator,), parent_ref, index)
+            operations.reparent((ref,), locator)
+            operations.reparent(children, locator, 1)
         else:
-            hierarchy = items_info[strip_meshref_name(item)].hierarchy[:1]
-        for parent_name in hierarchy:
-            parents.append(
-                get_item(parent_name, items_info[parent_name].scene, items_info[parent_name].itype)
+            operations.reparent((locator,), parent_ref, index, inplace=False)
+            operations.set_changed_transforms(
+                locator, IDENTITY_TRANSFORMS, convert_rotation_order(item_transforms, orders[candidate])
             )
+            operations.reparent((ref,), locator, inplace=False)
+            operations.set_changed_transforms(ref, item_transforms, IDENTITY_TRANSFORMS)
+            operations.reparent(children, locator, 1, inplace=False)
+        locators[item_id] = locator
 
-        if not parents:
-            continue
+    return operations
 
-        child = item
-        for parent in parents:
-            parent_items_to(
-                (child,),
-                parent,
-                items_info[strip_meshref_name(child)].parent_index,
-                inplace=False
-            )
 
-            item_set_position(parent, items_info[strip_meshref_name(parent)].pos)
-            item_set_rotation(parent, items_info[strip_meshref_name(parent)].rot)
-            item_set_scale(parent, items_info[strip_meshref_name(parent)].scl)
+def meshref_transform_to_locator(
+    items: Iterable[modo.Item], tolerance: float, item_keys: Optional[ItemKeyCache] = None
+):
+    with phase('plan'):
+        operations = get_meshref_locator_operations(items, tolerance, item_keys)
+    with phase('execute', len(operations)):
+        execute_plan(operations)
 
-            child = parent
 
+def read_info_lines(filename: str, chunk_size: int = CHUNK_SIZE) -> Iterator[tuple[int, str]]:
+    """Read the info file in large chunks, yield numbered lines without keeping the whole file in memory"""
+    with open_info_text(filename, chunk_size) as file:
+        line_number = 0
+        tail = ''
+        while True:
+            chunk = file.read(chunk_size)
+            if not chunk:
+                break
+            lines = (tail + chunk).split('\n')
+            tail = lines.pop()
+            for line in lines:
+                line_number += 1
+                yield line_number, line
+        if tail:
+            yield line_number + 1, tail
 
-def meshref_transform_to_locator(items: Iterable[modo.Item], tolerance: float):
-    for item in items:
-        if not is_meshref(item):
-            continue
 
-        if is_zero_transforms(item, tolerance):
-            continue
+def is_gzip_info(filename: str) -> bool:
+    with open_file(filename, 'rb') as file:
+        return file.read(len(GZIP_MAGIC)) == GZIP_MAGIC
 
-        new_loc = modo.Scene().addItem(itype=c.LOCATOR_TYPE, name=f'{item.name}{LOCATOR_SUFFIX}')
-        parent_items_to((new_loc,), item, inplace=False)
-        parent_items_to((new_loc,), item.parent, get_parent_index(item), inplace=True)
-        parent_items_to((item,), new_loc, inplace=True)
-        parent_items_to(item.children(), new_loc, index=1, inplace=True)
-
-
-def load_info_lines(filename: str) -> list[str]:
-    with open(filename) as file:
-        return file.readlines()
-
-
-def extract_info_line(info_line: str, items_info: ItemsInfo):
-    item_name, data_tag, data_line = info_line.split(TAG_SEPARATOR)
-    if item_name not in items_info:
-        items_info[item_name] = ItemInfo()
-    items_info[item_name].name = item_name
-    if data_tag == SCENE:
-        items_info[item_name].scene = data_line
-    if data_tag == TYPE:
-        items_info[item_name].itype = data_line
-    if data_tag == IS_MESHREF:
-        items_info[item_name].is_meshref = data_line == 'True'
-    if data_tag == HIERARCHY:
-        if data_line:
-            names = data_line.split(NAME_SEPARATOR)
-            items_info[item_name].hierarchy.extend(names)
-    if data_tag == PARENT_INDEX:
-        items_info[item_name].parent_index = int(data_line)
-    if data_tag == POS:
-        items_info[item_name].pos = modo.Vector3([float(i) for i in data_line.split(' ')])
-    if data_tag == ROT:
-        items_info[item_name].rot = modo.Vector3([float(i) for i in data_line.split(' ')])
-    if data_tag == SCL:
-        items_info[item_name].scl = modo.Vector3([float(i) for i in data_line.split(' ')])
-
-
-def get_item(name: str, meshref_scene: str, itype: str) -> modo.Item:
-    if not name:
-        raise ValueError('No item name provided.')
 
-    try:
-        return get_item_by_meshref_name(name, meshref_scene)
+def open_info_text(filename: str, chunk_size: int = CHUNK_SIZE) -> TextIO:
+    if is_gzip_info(filename):
+        return open_file(filename, 'rt', open_function=gzip.open)
+    return open_file(filename, buffering=chunk_size)
 
-    except LookupError:
-        print(f'Warning: Item <{name}> not found. Creating new one.')
-        return modo.Scene().addItem(itype, name)
 
+def parse_vector(data_line: str) -> array:
+    vector = array('d', [float(i) for i in data_line.split(' ')])
+    if len(vector) != 3:
+        raise ValueError(f'3 values expected, got {len(vector)}')
+    return vector
 
-def get_item_by_meshref_name(name: str, meshref_scene: str) -> modo.Item:
-    try:
-        return modo.Scene().item(f'{name} ({meshref_scene})')
-    except LookupError:
-        return modo.Scene().item(name)
 
+def set_scene(items_info: ItemsInfo, row: int, data_line: str):
+    items_info.scenes[row] = items_info.intern(data_line)
 
-def get_transforms(item: modo.Item) -> Transforms:
-    pos = modo.Vector3()
-    pos.x = lx.eval(f'transform.channel pos.X ? item:{{{item.id}}}')
-    pos.y = lx.eval(f'transform.channel pos.Y ? item:{{{item.id}}}')
-    pos.z = lx.eval(f'transform.channel pos.Z ? item:{{{item.id}}}')
-    rot = modo.Vector3()
-    rot.x = lx.eval(f'transform.channel rot.X ? item:{{{item.id}}}')
-    rot.y = lx.eval(f'transform.channel rot.Y ? item:{{{item.id}}}')
-    rot.z = lx.eval(f'transform.channel rot.Z ? item:{{{item.id}}}')
-    scl = modo.Vector3()
-    scl.x = lx.eval(f'transform.channel scl.X ? item:{{{item.id}}}')
-    scl.y = lx.eval(f'transform.channel scl.Y ? item:{{{item.id}}}')
-    scl.z = lx.eval(f'transform.channel scl.Z ? item:{{{item.id}}}')
 
-    return (pos, rot, scl)
+def set_type(items_info: ItemsInfo, row: int, data_line: str):
+    items_info.types[row] = items_info.intern(data_line)
 
 
-def is_zero_transforms(item: modo.Item, tolerance: float) -> bool:
-    pos, rot, scl = get_transforms(item)
+def set_is_meshref(items_info: ItemsInfo, row: int, data_line: str):
+    items_info.meshrefs[row] = data_line == 'True'
 
-    if not pos.equals(modo.Vector3(), tolerance):
-        return False
 
-    if not rot.equals(modo.Vector3(), tolerance):
-        return False
+def set_hierarchy(items_info: ItemsInfo, row: int, data_line: str):
+    items_info.set_hierarchy(row, data_line.split(NAME_SEPARATOR) if data_line else ())
+
+
+def set_parent(items_info: ItemsInfo, row: int, data_line: str):
+    items_info.set_parent(row, data_line)
+
+
+def set_removed(items_info: ItemsInfo, row: int, data_line: str):
+    items_info.recorded[row] = False
+    items_info.set_parent(row, '')
+
+
+def set_parent_index(items_info: ItemsInfo, row: int, data_line: str):
+    items_info.parent_indices[row] = int(data_line)
+
+
+def set_pos(items_info: ItemsInfo, row: int, data_line: str):
+    items_info.set_transforms(row, POS_COLUMN, parse_vector(data_line))
+
+
+def set_rot(items_info: ItemsInfo, row: int, data_line: str):
+    items_info.set_transforms(row, ROT_COLUMN, parse_vector(data_line))
+
+
+def set_scl(items_info: ItemsInfo, row: int, data_line: str):
+    items_info.set_transforms(row, SCL_COLUMN, parse_vector(data_line))
+
+
+INFO_LINE_HANDLERS: dict[str, Callable[[ItemsInfo, int, str], None]] = {
+    SCENE: set_scene,
+    TYPE: set_type,
+    IS_MESHREF: set_is_meshref,
+    HIERARCHY: set_hierarchy,
+    PARENT: set_parent,
+    PARENT_INDEX: set_parent_index,
+    POS: set_pos,
+    ROT: set_rot,
+    SCL: set_scl,
+    REMOVED: set_removed,
+}
+
+
+def get_item_ref(
+    operations: OperationPlan, name_index: ItemNameIndex, name: str, meshref_scene: str, itype: str
+) -> ItemRef:
+    """Get the plan reference of the item by name, plan creating a new item if there is no such item"""
+    if not name:
+        raise ValueError('No item name provided.')
+
+    try:
+        return operations.add_item(get_item_by_meshref_name(name_index, name, meshref_scene), name)
+
+    except LookupError:
+        print(f'Warning: Item <{name}> not found. Creating new one.')
+        name_index.misses += 1
+        return operations.create(itype, name)
+
+
+def get_item_by_meshref_name(name_index: ItemNameIndex, name: str, meshref_scene: str) -> modo.Item:
+    """Get item by the meshref name 'name (meshref scene)', by the bare name otherwise
 
-    return scl.equals(modo.Vector3(1, 1, 1), tolerance)
+    Raises:
+        LookupError: if there is no item with either name
+    """
+    item = name_index.get(f'{name} ({meshref_scene})', name)
+    if item is None:
+        raise LookupError(name)
+    return item
 
 
-def is_transforms_matched(transforms1: Transforms, transfroms2: Transforms, tolerance: float) -> bool:
-    return all(v1.equals(v2, tolerance) for v1, v2 in zip(transforms1, transfroms2))
+def report_missed_lookups(name_index: ItemNameIndex):
+    if name_index.misses:
+        print(f'Warning: {name_index.misses} item lookups missed, new items created.')
 
 
 if __name__ == '__main__':
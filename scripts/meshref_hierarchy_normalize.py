@@ -13,18 +13,18 @@
 import modo
 import modo.constants as c
 
-from h3d_meshref_hierarchy_setup.scripts.meshref_hierarchy_unparent import normalize_hierarchy
+from h3d_meshref_hierarchy_setup.scripts.meshref_hierarchy_unparent import normalize_hierarchies
+from h3d_meshref_hierarchy_setup.scripts.profiling import profile_command, phase
 
 
+@profile_command
 def main() -> None:
     roots = modo.Scene().selectedByType(itype=c.LOCATOR_TYPE, superType=True)
     if not roots:
         return
 
-    updated_roots: set[modo.Item] = set()
-    for root in roots:
-        updated_root = normalize_hierarchy(root)
-        updated_roots.add(updated_root)
+    with phase('normalize', len(roots)):
+        updated_roots = dict.fromkeys(normalize_hierarchies(roots))
 
     modo.Scene().deselect()
     for root in updated_roots:
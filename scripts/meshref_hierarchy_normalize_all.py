@@ -9,20 +9,22 @@
 # at an mesh and mesh instance items
 
 import modo
-import modo.constants as c
 
-from h3d_meshref_hierarchy_setup.scripts.meshref_hierarchy_unparent import normalize_hierarchy
+from h3d_meshref_hierarchy_setup.scripts.meshref_hierarchy_unparent import normalize_hierarchies
+from h3d_meshref_hierarchy_setup.scripts.scene_snapshot import take_snapshot
+from h3d_meshref_hierarchy_setup.scripts.profiling import profile_command, phase
 
 
+@profile_command
 def main() -> None:
-    roots = [root for root in modo.Scene().items(itype=c.LOCATOR_TYPE, superType=True) if root.children()]
+    with phase('collect'):
+        snapshot = take_snapshot(transforms=False)
+        roots = snapshot.get_items(row for row in range(len(snapshot)) if snapshot.has_children(row))
     if not roots:
         return
 
-    updated_roots: set[modo.Item] = set()
-    for root in roots:
-        updated_root = normalize_hierarchy(root)
-        updated_roots.add(updated_root)
+    with phase('normalize', len(roots)):
+        updated_roots = dict.fromkeys(normalize_hierarchies(roots, snapshot))
 
     modo.Scene().deselect()
     for root in updated_roots:
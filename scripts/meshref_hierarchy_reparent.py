@@ -0,0 +1,182 @@
+#!/usr/bin/python
+# ================================
+# (C)2026 Dmytro Holub
+# heap3d@gmail.com
+# --------------------------------
+# modo python
+# EMAG
+# hierarchy reparent tool restores meshes flattened by the unparent tool to their hierarchies
+# using the hierarchy info stored in the [R] root and [M] mesh description tags
+# usage:
+# 1. run Reparent Meshes command to restore all flattened meshes
+# 2. or select flattened meshes and run Reparent Selected Meshes command
+
+from typing import Iterable, Optional
+
+import lx
+import modo
+import modo.constants as c
+
+from h3d_utilites.scripts.h3d_utils import (
+    parent_items_to,
+    get_description_tag,
+    item_set_position,
+    item_set_rotation,
+    item_set_scale,
+)
+
+import h3d_meshref_hierarchy_setup.scripts.h3d_kit_constants as h3dc
+from h3d_meshref_hierarchy_setup.scripts.transforms_reader import Transforms, split_row
+from h3d_meshref_hierarchy_setup.scripts.scene_snapshot import SceneSnapshot, take_snapshot, NO_PARENT
+from h3d_meshref_hierarchy_setup.scripts.profiling import profile_command, phase
+
+
+MESH_TYPES_INT = (
+    c.MESH_TYPE,
+    c.MESHINST_TYPE,
+)
+MESH_INFO_LINES = 4
+
+MeshInfo = tuple[str, Transforms]
+
+
+def get_roots_index(snapshot: SceneSnapshot) -> dict[str, int]:
+    """Map hierarchy ids stored in the [R] root description tags to the root rows, the first root wins
+
+    Args:
+        snapshot (SceneSnapshot): snapshot of the scene
+
+    Returns:
+        dict[str, int]: root rows by hierarchy id
+    """
+    roots_index: dict[str, int] = dict()
+    for row, name in enumerate(snapshot.names):
+        if not str(name).startswith(h3dc.ROOT_PREFIX):
+            continue
+        hierarchy_id = get_description_tag(snapshot.items[row])
+        if not hierarchy_id:
+            continue
+        if hierarchy_id in roots_index:
+            print(f'Warning: duplicate hierarchy id <{hierarchy_id}> at <{name}>, skipped.')
+            continue
+        roots_index[hierarchy_id] = row
+
+    return roots_index
+
+
+def parse_mesh_info(description: str) -> Optional[MeshInfo]:
+    """Parse the [M] mesh description tag written by the unparent tool
+
+    Args:
+        description (str): 'hierarchy id\\npx py pz\\nrx ry rz\\nsx sy sz'
+
+    Returns:
+        Optional[MeshInfo]: hierarchy id and local transforms, None if the description is not a mesh info
+    """
+    lines = description.split('\n') if description else []
+    if len(lines) != MESH_INFO_LINES:
+        return None
+
+    hierarchy_id, *vectors = lines
+    try:
+        pos, rot, scl = (tuple(float(value) for value in vector.split(' ')) for vector in vectors)
+    except ValueError:
+        return None
+    if not len(pos) == len(rot) == len(scl) == 3:
+        return None
+
+    return hierarchy_id, (pos, rot, scl)  # type: ignore
+
+
+def get_flattened_rows(snapshot: SceneSnapshot, rows: Optional[Iterable[int]] = None) -> list[int]:
+    """Get [M] mesh rows at the scene root in the scene order"""
+    if rows is None:
+        rows = snapshot.get_bucket(*MESH_TYPES_INT)
+    return [
+        row for row in rows
+        if snapshot.types[row] in MESH_TYPES_INT
+        and snapshot.parents[row] == NO_PARENT
+        and str(snapshot.names[row]).startswith(h3dc.MESH_PREFIX)
+    ]
+
+
+def reparent_meshes(snapshot: SceneSnapshot, mesh_rows: Iterable[int]) -> list[modo.Item]:
+    """Parent flattened meshes back to their hierarchy roots and restore recorded local transforms
+
+    Args:
+        snapshot (SceneSnapshot): snapshot of the scene with transforms
+        mesh_rows (Iterable[int]): flattened mesh rows
+
+    Returns:
+        list[modo.Item]: restored meshes
+    """
+    with phase('collect'):
+        roots_index = get_roots_index(snapshot)
+        meshes_by_root: dict[int, list[int]] = dict()
+        mesh_transforms: dict[int, Transforms] = dict()
+        missed: list[str] = []
+        for row in mesh_rows:
+            mesh_info = parse_mesh_info(get_description_tag(snapshot.items[row]))
+            if not mesh_info:
+                continue
+            hierarchy_id, transforms = mesh_info
+            root_row = roots_index.get(hierarchy_id)
+            if root_row is None:
+                missed.append(hierarchy_id)
+                continue
+            meshes_by_root.setdefault(root_row, []).append(row)
+            mesh_transforms[row] = transforms
+
+    with phase('reparent', len(mesh_transforms)):
+        for root_row, rows in meshes_by_root.items():
+            index = len(snapshot.get_children(root_row))
+            parent_items_to(snapshot.get_items(rows), snapshot.items[root_row], index, inplace=False)
+
+    with phase('transforms', len(mesh_transforms)):
+        for row, (pos, rot, scl) in mesh_transforms.items():
+            item = snapshot.items[row]
+            current_pos, current_rot, current_scl = split_row(snapshot.transforms, row)
+            if pos != current_pos:
+                item_set_position(item, pos)
+            if rot != current_rot:
+                item_set_rotation(item, rot)
+            if scl != current_scl:
+                item_set_scale(item, scl)
+
+    if missed:
+        print(f'Warning: no root found for {len(missed)} meshes, hierarchy ids: {sorted(set(missed))}')
+
+    return snapshot.get_items(mesh_transforms)
+
+
+def default_action() -> list[modo.Item]:
+    snapshot = take_snapshot()
+    return reparent_meshes(snapshot, get_flattened_rows(snapshot))
+
+
+def selected_action() -> list[modo.Item]:
+    snapshot = take_snapshot()
+    selected_rows = snapshot.get_rows(modo.Scene().selectedByType(itype=c.LOCATOR_TYPE, superType=True))
+    return reparent_meshes(snapshot, get_flattened_rows(snapshot, selected_rows))
+
+
+@profile_command
+def main() -> None:
+    arg = ''
+    if lx.args():
+        arg = lx.args()[0]  # type: ignore
+
+    actions = {
+        h3dc.CMD_SELECTED: selected_action,
+    }
+
+    action = actions.get(arg, default_action)
+    restored = action()
+
+    modo.Scene().deselect()
+    for item in restored:
+        item.select()
+
+
+if __name__ == "__main__":
+    main()
@@ -10,21 +10,21 @@
 # 1. remove unnecessary elements from hierarchy
 # 2. run Unparent Meshes command
 
-from typing import Iterable
+from array import array
+import hashlib
+from typing import Iterable, Optional, Sequence
 
 import lx
 import modo
 import modo.constants as c
 
-from h3d_utilites.scripts.h3d_utils import get_parent_index
-
 import h3d_meshref_hierarchy_setup.scripts.h3d_kit_constants as h3dc
-from h3d_utilites.scripts.h3d_utils import (
-    parent_items_to,
-    itype_int,
-    set_description_tag,
-    get_description_tag,
+from h3d_meshref_hierarchy_setup.scripts.transforms_reader import Transforms, split_row
+from h3d_meshref_hierarchy_setup.scripts.scene_snapshot import SceneSnapshot, take_snapshot, NO_PARENT
+from h3d_meshref_hierarchy_setup.scripts.scene_operations import (
+    ItemRef, OperationPlan, execute_plan, is_dry_run_arg, print_plan
 )
+from h3d_meshref_hierarchy_setup.scripts.profiling import profile_command, phase
 
 MESH_TYPES_INT = (
     c.MESH_TYPE,
@@ -32,85 +32,161 @@ MESH_TYPES_INT = (
 )
 
 
-def normalize_hierarchy(root: modo.Item) -> modo.Item:
-    """Replace mesh items with children by locators, parent original meshes to locators
+def normalize_hierarchies(roots: Sequence[modo.Item], snapshot: Optional[SceneSnapshot] = None) -> list[modo.Item]:
+    """Replace mesh items with children by locators in all specified hierarchies in one pass,
+    nested hierarchies are processed once
 
     Args:
-        root (modo.Item): root of existing hierarchy
+        roots (Sequence[modo.Item]): roots of existing hierarchies
+        snapshot (Optional[SceneSnapshot]): snapshot of the scene, taken from the scene if not specified
 
     Returns:
-        modo.Item: root of updated hierarchy
+        list[modo.Item]: roots of updated hierarchies in the order of the specified roots,
+        a root nested in a root listed before it is returned as is, like with the roots normalized one by one
     """
-    # original_root_parent_index = get_parent_index(root)
-    # original_root_parent = root.parent
-    mesh_candidates = {i for i in root.children(recursive=True, itemType=c.MESH_TYPE) if i.children()}
-    meshinst_candidates = {i for i in root.children(recursive=True, itemType=c.MESHINST_TYPE) if i.children()}
-    replace_candidates = mesh_candidates.union(meshinst_candidates)
-
-    root_is_mesh = itype_int(root.type) in MESH_TYPES_INT
-    root_has_children = bool(root.children())
-    if root_is_mesh and root_has_children:
-        replace_candidates.add(root)
+    if not snapshot:
+        snapshot = take_snapshot(transforms=False)
+    root_rows = snapshot.get_rows(roots)
+    candidates = get_replace_candidates(snapshot, root_rows)
+    if not candidates:
+        return list(roots)
+
+    with phase('plan'):
+        operations, locator_refs = get_normalize_operations(snapshot, candidates)
+    with phase('execute', len(operations)):
+        created = execute_plan(operations)
+    locators = {row: created[ref] for row, ref in locator_refs.items()}
+
+    updated_rows = get_updated_root_rows(snapshot, candidates, root_rows)
+    updated_roots: list[modo.Item] = []
+    for root, row in zip(roots, root_rows):
+        if row not in updated_rows:
+            updated_roots.append(root)
+        elif row in locators:
+            updated_roots.append(locators[row])
+        elif snapshot.parents[row] != NO_PARENT:
+            parent_row = snapshot.parents[row]
+            updated_roots.append(locators.get(parent_row, snapshot.items[parent_row]))
+        else:
+            updated_roots.append(root)
 
-    if not replace_candidates:
-        return root
+    return updated_roots
 
-    for mesh in replace_candidates:
-        mesh_parent_index = get_parent_index(mesh)
-        locator = modo.Scene().addItem(itype=c.LOCATOR_TYPE)
-        locator.name = mesh.name + " loc"
 
-        for item in mesh.children():
-            item.setParent(locator)
+def get_normalize_operations(
+    snapshot: SceneSnapshot, candidates: Iterable[int]
+) -> tuple[OperationPlan, dict[int, ItemRef]]:
+    """Plan replacing the candidate meshes by locators taking over their place, transforms and children
 
-        locator.setParent(mesh)
-        parent_items_to((locator,), mesh.parent, mesh_parent_index)
-        parent_items_to((mesh,), locator, mesh_parent_index)
+    Args:
+        snapshot (SceneSnapshot): snapshot of the scene with hierarchy
+        candidates (Iterable[int]): replace candidate rows, parents go first
 
-    updated_root = root.parent
-    if not updated_root:
-        return root
+    Returns:
+        tuple[OperationPlan, dict[int, ItemRef]]: planned operations, created locator references by candidate row
+    """
+    operations = OperationPlan()
+    locators: dict[int, ItemRef] = dict()
+    for row in candidates:
+        mesh = get_row_ref(operations, snapshot, row)
+        parent_row = snapshot.parents[row]
+        parent: Optional[ItemRef] = None
+        if parent_row != NO_PARENT:
+            parent = locators.get(parent_row)
+            if parent is None:
+                parent = get_row_ref(operations, snapshot, parent_row)
+        elif snapshot.items[row].parent:
+            parent = operations.add_item(snapshot.items[row].parent)
+        # replaced parent keeps its mesh as the first child
+        index = snapshot.parent_indices[row] + (parent_row in locators)
+
+        locator = operations.create(c.LOCATOR_TYPE, f'{snapshot.names[row]} {h3dc.PARENT_LOC_SFX}')
+        children = [get_row_ref(operations, snapshot, i) for i in snapshot.get_children(row)]
+        operations.reparent(children, locator, inplace=False)
+        operations.reparent((locator,), mesh, inplace=False)
+        operations.reparent((locator,), parent, index)
+        operations.reparent((mesh,), locator)
+        locators[row] = locator
+
+    return operations, locators
+
+
+def get_row_ref(operations: OperationPlan, snapshot: SceneSnapshot, row: int) -> ItemRef:
+    return operations.add_item(snapshot.items[row], str(snapshot.names[row]))
+
+
+def get_replace_candidates(snapshot: SceneSnapshot, root_rows: Iterable[int]) -> list[int]:
+    """Get mesh and mesh instance rows with children in the hierarchies, parents go first
 
-    # if not updated_root == original_root_parent:
-    #     parent_items_to((updated_root,), original_root_parent, original_root_parent_index)
+    Args:
+        snapshot (SceneSnapshot): snapshot of the scene with hierarchy
+        root_rows (Iterable[int]): hierarchy root rows
 
-    return updated_root
+    Returns:
+        list[int]: replace candidate rows, subtrees of nested roots are visited once
+    """
+    root_rows = dict.fromkeys(root_rows)
+    top_rows = [row for row in root_rows if not any(i in root_rows for i in snapshot.get_ancestors(row))]
+    candidates: list[int] = []
+    for top_row in top_rows:
+        stack = [top_row]
+        while stack:
+            row = stack.pop()
+            children = snapshot.get_children(row)
+            if not children:
+                continue
+            if snapshot.types[row] in MESH_TYPES_INT:
+                candidates.append(row)
+            stack.extend(reversed(children))
+
+    return candidates
+
+
+def get_updated_root_rows(snapshot: SceneSnapshot, candidates: Iterable[int], root_rows: Sequence[int]) -> set[int]:
+    """Get root rows updated by the normalization, each candidate updates the first listed root it belongs to
+
+    A root nested in a root listed before it has nothing left to update, like with the roots normalized one by one.
+    """
+    root_order = {row: order for order, row in reversed(list(enumerate(root_rows)))}
+    updated_rows: set[int] = set()
+    for row in candidates:
+        owners = [root_order[i] for i in (row, *snapshot.get_ancestors(row)) if i in root_order]
+        if owners:
+            updated_rows.add(root_rows[min(owners)])
 
+    return updated_rows
 
-def add_prefix_to_name(item: modo.Item, prefix: str) -> None:
-    """Adds given prefix to the specified item name
 
-    Args:
-        item (modo.Item): item to change the name
-        prefix (str): prefix to add to the item name
-    """
-    try:
-        if not str(item.name).startswith(prefix):
-            item.name = prefix + item.name
-    except RuntimeError:
-        print(f'{item.name} : Failed to change item name.')
+def plan_prefix(operations: OperationPlan, ref: ItemRef, prefix: str) -> None:
+    """Plan adding the prefix to the planned item name if the name has no such prefix"""
+    name = operations.get_name(ref)
+    if not name.startswith(prefix):
+        operations.rename(ref, prefix + name)
 
 
-def store_parent_info(item: modo.Item) -> None:
-    """Store hierarchy info about specified item as parent:
+def plan_parent_info(operations: OperationPlan, ref: ItemRef, scenename: str) -> str:
+    """Plan storing hierarchy info about the item as parent:
         - parent prefix in the item name
         - unique hierarchy id in the description tag
 
     Args:
-        item (modo.Item): parent item to store info about
+        operations (OperationPlan): plan to add the operations to
+        ref (ItemRef): parent item to store info about
+        scenename (str): current scene name
+
+    Returns:
+        str: hierarchy id of the parent
     """
-    scenename = modo.Scene().name
-    if not scenename:
-        hierarchy_id = item.name
-    else:
-        hierarchy_id = scenename + "/" + item.name
+    name = operations.get_name(ref)
+    hierarchy_id = scenename + "/" + name if scenename else name
 
-    set_description_tag(item=item, text=hierarchy_id)
-    add_prefix_to_name(item=item, prefix=h3dc.ROOT_PREFIX)
+    operations.set_description(ref, hierarchy_id)
+    plan_prefix(operations, ref, h3dc.ROOT_PREFIX)
+    return hierarchy_id
 
 
-def store_mesh_info(item: modo.Item) -> None:
-    """Store hierarchy info about specified mesh item as child:
+def plan_mesh_info(operations: OperationPlan, ref: ItemRef, hierarchy_id: str, transforms: Transforms) -> str:
+    """Plan storing hierarchy info about the mesh item as child:
         - child prefix in the mesh name
         - hierarchy id pointed to the corresponding parent item
         - [px py pz]: position values
@@ -118,98 +194,254 @@ def store_mesh_info(item: modo.Item) -> None:
         - [sx sy sz]: scale values
 
     Args:
-        item (modo.Item): mesh item to store info about
+        operations (OperationPlan): plan to add the operations to
+        ref (ItemRef): mesh item to store info about
+        hierarchy_id (str): hierarchy id of the mesh parent
+        transforms (Transforms): mesh item transforms
+
+    Returns:
+        str: description of the mesh
     """
-    if not item.parent:
-        return
-    hierarchy_id = get_description_tag(item.parent)
-    px = lx.eval(f'transform.channel pos.X ? item:{{{item.id}}}')
-    py = lx.eval(f'transform.channel pos.Y ? item:{{{item.id}}}')
-    pz = lx.eval(f'transform.channel pos.Z ? item:{{{item.id}}}')
-    rx = lx.eval(f'transform.channel rot.X ? item:{{{item.id}}}')
-    ry = lx.eval(f'transform.channel rot.Y ? item:{{{item.id}}}')
-    rz = lx.eval(f'transform.channel rot.Z ? item:{{{item.id}}}')
-    sx = lx.eval(f'transform.channel scl.X ? item:{{{item.id}}}')
-    sy = lx.eval(f'transform.channel scl.Y ? item:{{{item.id}}}')
-    sz = lx.eval(f'transform.channel scl.Z ? item:{{{item.id}}}')
+    (px, py, pz), (rx, ry, rz), (sx, sy, sz) = transforms
     pos_values = f'{px} {py} {pz}'
     rot_values = f'{rx} {ry} {rz}'
     scl_values = f'{sx} {sy} {sz}'
 
     description = f'{hierarchy_id}\n{pos_values}\n{rot_values}\n{scl_values}'
-    set_description_tag(item=item, text=description)
-    add_prefix_to_name(item=item, prefix=h3dc.MESH_PREFIX)
+    operations.set_description(ref, description)
+    plan_prefix(operations, ref, h3dc.MESH_PREFIX)
+    return description
 
 
-def unparent_hierarchy(root: modo.Item) -> None:
-    """Unparent all meshes from hierarchy and store information about them
+def plan_unparent_hierarchy(
+    operations: OperationPlan, snapshot: SceneSnapshot, root_row: int, flattened_rows: set[int]
+) -> None:
+    """Plan storing information about the hierarchy meshes and their parents and unparenting the meshes
 
     Args:
-        root (modo.Item): root of hierarchy
+        operations (OperationPlan): plan to add the operations to
+        snapshot (SceneSnapshot): snapshot of the scene with transforms
+        root_row (int): root row of hierarchy
+        flattened_rows (set[int]): mesh rows unparented by the plan already, updated in place
     """
-    meshes = [
-        i
-        for i in root.children(recursive=True)
-        if (itype_int(i.type) == c.MESH_TYPE or itype_int(i.type) == c.MESHINST_TYPE)
+    mesh_rows = [
+        i for i in snapshot.get_descendants(root_row)
+        if snapshot.types[i] in MESH_TYPES_INT and i not in flattened_rows
     ]
-    if not meshes:
+    if not mesh_rows:
         return
 
-    parents: set[modo.Item] = {root, }
-    for mesh in meshes:
-        if not mesh.parent:
+    parent_rows: dict[int, None] = {root_row: None}
+    for mesh_row in mesh_rows:
+        if snapshot.parents[mesh_row] == NO_PARENT:
+            continue
+        parent_rows[snapshot.parents[mesh_row]] = None
+
+    scenename = modo.Scene().name
+    # planned description tags, a mesh reads the hierarchy id from the current description of its parent
+    descriptions: dict[int, str] = dict()
+    for row in parent_rows:
+        descriptions[row] = plan_parent_info(operations, get_row_ref(operations, snapshot, row), scenename)
+    for mesh_row in mesh_rows:
+        parent_row = snapshot.parents[mesh_row]
+        if parent_row == NO_PARENT:
             continue
-        parents.add(mesh.parent)
+        mesh = get_row_ref(operations, snapshot, mesh_row)
+        transforms = split_row(snapshot.transforms, mesh_row)
+        descriptions[mesh_row] = plan_mesh_info(operations, mesh, descriptions[parent_row], transforms)
 
-    for parent in parents:
-        store_parent_info(parent)
+    flattened_rows.update(mesh_rows)
+    operations.reparent(
+        [get_row_ref(operations, snapshot, i) for i in mesh_rows], None, get_flatten_index(snapshot, root_row)
+    )
 
-    for mesh in meshes:
-        store_mesh_info(mesh)
 
-    flattened_meshes: set[modo.Item] = {i for i in meshes if i.parent}
-    if flattened_meshes:
-        for flatten_mesh in flattened_meshes:
-            index = get_parent_index(flatten_mesh)
-            parent_items_to(items=flattened_meshes, parent=None, index=index)
+def get_top_row(snapshot: SceneSnapshot, row: int) -> int:
+    ancestors = snapshot.get_ancestors(row)
+    return ancestors[-1] if ancestors else row
 
 
-def get_normalized_hierarchies(roots: Iterable[modo.Item]) -> set[modo.Item]:
-    hierarchies: set[modo.Item] = {i for i in roots if i.children()}
-    normalized_hierarchies: set[modo.Item] = set()
-    for hierarchy in hierarchies:
-        if not hierarchy.name.startswith(h3dc.ROOT_PREFIX):
-            normalized_hierarchy = normalize_hierarchy(hierarchy)
-        else:
-            normalized_hierarchy = hierarchy
-        normalized_hierarchies.add(normalized_hierarchy)
+def get_flatten_index(snapshot: SceneSnapshot, row: int) -> int:
+    """Get the scene root position right after the top level ancestor of the specified row"""
+    return snapshot.parent_indices[get_top_row(snapshot, row)] + 1
+
+
+def split_hierarchies(roots: Iterable[modo.Item], snapshot: SceneSnapshot) -> tuple[list[modo.Item], list[modo.Item]]:
+    """Get processed and unprocessed hierarchies of the roots, roots without children are skipped"""
+    hierarchies = [i for i in dict.fromkeys(roots) if snapshot.has_children(snapshot.get_row(i))]
+    processed = [i for i in hierarchies if i.name.startswith(h3dc.ROOT_PREFIX)]
+    unprocessed = [i for i in hierarchies if not i.name.startswith(h3dc.ROOT_PREFIX)]
+
+    return processed, unprocessed
+
+
+def get_normalized_hierarchies(roots: Iterable[modo.Item], snapshot: SceneSnapshot) -> set[modo.Item]:
+    processed, unprocessed = split_hierarchies(roots, snapshot)
+
+    return set(processed).union(normalize_hierarchies(unprocessed, snapshot))
+
+
+def print_unparent_plans(roots: Iterable[modo.Item], snapshot: SceneSnapshot, stamp: bool = False) -> None:
+    """Print the normalize and unparent plans without changing the scene
+
+    The unparent plan is made for the current hierarchies, the hierarchies to normalize get new locators first.
+    """
+    processed, unprocessed = split_hierarchies(roots, snapshot)
+    candidates = get_replace_candidates(snapshot, snapshot.get_rows(unprocessed))
+    print_plan('Normalize', get_normalize_operations(snapshot, candidates)[0])
+    print_plan('Unparent', get_unparent_operations(processed + unprocessed, snapshot, stamp))
+
+
+def default_action(dry_run: bool = False):
+    with phase('collect'):
+        snapshot = take_snapshot(transforms=dry_run)
+        roots = snapshot.get_items(snapshot.get_roots())
+    if dry_run:
+        print_unparent_plans(roots, snapshot)
+        return
+    with phase('normalize', len(roots)):
+        normalized_hierarchies = get_normalized_hierarchies(roots, snapshot)
+
+    unparent_hierarchies(normalized_hierarchies)
+
+
+def hierarchy_action(dry_run: bool = False):
+    with phase('collect'):
+        snapshot = take_snapshot(transforms=dry_run)
+        rows = set(snapshot.get_rows(modo.Scene().selectedByType(itype=c.LOCATOR_TYPE, superType=True)))
+        children: set[int] = set()
+        for row in rows:
+            children.update(i for i in snapshot.get_descendants(row) if snapshot.types[i] in MESH_TYPES_INT)
+        rows.update(children)
+        roots = snapshot.get_items({snapshot.parents[i] for i in rows if snapshot.parents[i] != NO_PARENT})
+    if dry_run:
+        print_unparent_plans(roots, snapshot)
+        return
+    with phase('normalize', len(roots)):
+        normalized_hierarchies = get_normalized_hierarchies(roots, snapshot)
+
+    unparent_hierarchies(normalized_hierarchies)
+
+
+def incremental_action(dry_run: bool = False):
+    with phase('collect'):
+        snapshot = take_snapshot()
+        root_rows = [row for row in snapshot.get_roots() if snapshot.has_children(row)]
+        changed_rows = [row for row in root_rows if not is_hierarchy_unchanged(snapshot, row)]
+        roots = snapshot.get_items(changed_rows)
+    print(f'{len(root_rows) - len(changed_rows)} unchanged hierarchies skipped, {len(changed_rows)} to process.')
+    if not roots:
+        return
+    if dry_run:
+        print_unparent_plans(roots, snapshot, stamp=True)
+        return
+    with phase('normalize', len(roots)):
+        normalized_hierarchies = get_normalized_hierarchies(roots, snapshot)
+
+    with phase('collect'):
+        hierarchy_ids = {i.id for hierarchy in normalized_hierarchies for i in (hierarchy, *hierarchy.children(True))}
+        hierarchy_items = [i for i in modo.Scene().items(itype=c.LOCATOR_TYPE, superType=True) if i.id in hierarchy_ids]
+        hierarchies_snapshot = take_snapshot(hierarchy_items)
+    unparent_hierarchies(normalized_hierarchies, hierarchies_snapshot, stamp=True)
+
 
-    return normalized_hierarchies
+def unparent_hierarchies(
+    hierarchies: Iterable[modo.Item], snapshot: Optional[SceneSnapshot] = None, stamp: bool = False
+) -> None:
+    """Unparent meshes of all specified hierarchies
 
+    Args:
+        hierarchies (Iterable[modo.Item]): roots of hierarchies
+        snapshot (Optional[SceneSnapshot]): snapshot containing the hierarchies, taken from the scene if not specified
+        stamp (bool): mark hierarchies as processed with the fingerprint of the resulting hierarchy if enabled
+    """
+    with phase('collect'):
+        if not snapshot:
+            snapshot = take_snapshot()
+    with phase('plan'):
+        operations = get_unparent_operations(hierarchies, snapshot, stamp)
+    with phase('execute', len(operations)):
+        execute_plan(operations)
+
+
+def get_unparent_operations(
+    hierarchies: Iterable[modo.Item], snapshot: SceneSnapshot, stamp: bool = False
+) -> OperationPlan:
+    """Plan unparenting meshes of all specified hierarchies
+
+    Args:
+        hierarchies (Iterable[modo.Item]): roots of hierarchies
+        snapshot (SceneSnapshot): snapshot containing the hierarchies, with transforms
+        stamp (bool): plan marking hierarchies as processed with the fingerprint of the resulting hierarchy if enabled
+
+    Returns:
+        OperationPlan: planned operations
+    """
+    # bottom-up scene root order keeps precomputed flatten indices of the remaining hierarchies valid
+    rows = sorted(
+        snapshot.get_rows(hierarchies),
+        key=lambda row: (snapshot.parent_indices[get_top_row(snapshot, row)], row),
+        reverse=True,
+    )
+    operations = OperationPlan()
+    flattened_rows: set[int] = set()
+    for row in rows:
+        plan_unparent_hierarchy(operations, snapshot, row, flattened_rows)
+
+    if stamp:
+        for row in rows:
+            hierarchy_rows = [i for i in get_hierarchy_rows(snapshot, row) if i not in flattened_rows]
+            fingerprint = get_fingerprint(snapshot, hierarchy_rows)
+            plan_processed_mark(operations, get_row_ref(operations, snapshot, row), fingerprint)
+
+    return operations
+
+
+def get_hierarchy_rows(snapshot: SceneSnapshot, row: int) -> list[int]:
+    return [row, *snapshot.get_descendants(row)]
+
+
+def get_fingerprint(snapshot: SceneSnapshot, rows: Iterable[int]) -> str:
+    """Hash of the hierarchy membership, structure and local transforms
+
+    Args:
+        snapshot (SceneSnapshot): snapshot of the scene with hierarchy and transforms
+        rows (Iterable[int]): hierarchy rows, the root first, depth first order
+
+    Returns:
+        str: hex digest
+    """
+    fingerprint = hashlib.sha1()
+    for row in rows:
+        parent = snapshot.parents[row]
+        parent_id = snapshot.ids[parent] if parent != NO_PARENT else ''
+        fingerprint.update(f'{snapshot.ids[row]}\t{parent_id}\t{snapshot.types[row]}\n'.encode())
+        fingerprint.update(array('d', snapshot.get_transforms_row(row)).tobytes())
+
+    return fingerprint.hexdigest()
+
+
+def get_processed_mark(item: modo.Item) -> str:
+    try:
+        return item.readTag(h3dc.PROCESSED_TAG) or ''
+    except LookupError:
+        return ''
 
-def default_action():
-    items: set[modo.Item] = set(modo.Scene().items(itype=c.LOCATOR_TYPE, superType=True))
-    roots: set[modo.Item] = {i for i in items if not i.parents}
-    normalized_hierarchies = get_normalized_hierarchies(roots)
 
-    for normalized_hierarchy in normalized_hierarchies:
-        unparent_hierarchy(normalized_hierarchy)
+def plan_processed_mark(operations: OperationPlan, ref: ItemRef, fingerprint: str) -> None:
+    operations.set_tag(ref, h3dc.PROCESSED_TAG, f'{h3dc.PROCESSED_MARK} {fingerprint}')
 
 
-def hierarchy_action():
-    items: set[modo.Item] = set(modo.Scene().selectedByType(itype=c.LOCATOR_TYPE, superType=True))
-    children: set[modo.Item] = set()
-    for item in items:
-        children.update(item.children(recursive=True, itemType=c.MESH_TYPE))
-        children.update(item.children(recursive=True, itemType=c.MESHINST_TYPE))
-    items.update(children)
-    roots: set[modo.Item] = {i.parent for i in items if i.parent}  # type: ignore
-    normalized_hierarchies = get_normalized_hierarchies(roots)
+def is_hierarchy_unchanged(snapshot: SceneSnapshot, row: int) -> bool:
+    """Check if the hierarchy was processed and neither its items nor their transforms changed since then"""
+    mark = get_processed_mark(snapshot.items[row])
+    if not mark.startswith(h3dc.PROCESSED_MARK):
+        return False
 
-    for normalized_hierarchy in normalized_hierarchies:
-        unparent_hierarchy(normalized_hierarchy)
+    return mark == f'{h3dc.PROCESSED_MARK} {get_fingerprint(snapshot, get_hierarchy_rows(snapshot, row))}'
 
 
+@profile_command
 def main() -> None:
     arg = ''
     if lx.args():
@@ -217,10 +449,11 @@ def main() -> None:
 
     actions = {
         h3dc.CMD_HIERARCHY: hierarchy_action,
+        h3dc.CMD_INCREMENTAL: incremental_action,
     }
 
     action = actions.get(arg, default_action)
-    action()
+    action(is_dry_run_arg())
 
 
 if __name__ == "__main__":
@@ -7,7 +7,7 @@
 # EMAG
 # Parent selected items to a new locator. The new locator will be named and aligned to the last selected item.
 
-from typing import Iterable
+from typing import Iterable, Optional
 
 import modo
 import modo.constants as c
@@ -15,8 +15,16 @@ import modo.constants as c
 from h3d_utilites.scripts.h3d_utils import parent_items_to, get_parent_index, match_pos_rot
 
 from h3d_meshref_hierarchy_setup.scripts.h3d_kit_constants import PARENT_LOC_SFX
+from h3d_meshref_hierarchy_setup.scripts.scene_snapshot import take_snapshot, get_items_with_ancestors
+from h3d_meshref_hierarchy_setup.scripts.scene_operations import write_changed_transforms
+from h3d_meshref_hierarchy_setup.scripts.transforms_math import (
+    Matrix, IDENTITY_TRANSFORMS, WorldMatrices, compose, multiply, get_local_transforms, get_pos_rot_matrix
+)
+from h3d_meshref_hierarchy_setup.scripts.transforms_reader import split_row
+from h3d_meshref_hierarchy_setup.scripts.profiling import profile_command
 
 
+@profile_command
 def main():
     selected = modo.Scene().selectedByType(itype=c.LOCATOR_TYPE, superType=True)
     if not selected:
@@ -29,13 +37,48 @@ def main():
 
 
 def create_parent(items: Iterable[modo.Item], head_item: modo.Item) -> modo.Item:
+    """Parent the items to a new locator aligned to the head item position and rotation
+
+    The locator and item local transforms are computed from the world matrices of one snapshot
+    and written directly, the world transforms of the items are kept without parenting in place.
+    The world matrices are composed of the pos/rot/scl channels only: the locator is matched to the head item
+    and the items are parented in place if pivots or extra transform items take part in their world transforms.
+    """
+    items = list(items)
+    snapshot = take_snapshot(
+        get_items_with_ancestors([*items, head_item]), rotation_orders=True, transform_stacks=True
+    )
+    worlds = WorldMatrices(snapshot)
+    head_row = snapshot.get_row(head_item)
+
     parent_loc_name = f'{head_item.name} {PARENT_LOC_SFX}'
     parent_loc = modo.Scene().addItem(itype=c.LOCATOR_TYPE, name=parent_loc_name)
-    match_pos_rot(parent_loc, head_item)
-    parent_items_to((parent_loc,), head_item.parent, get_parent_index(head_item))
+    parent_loc_world: Optional[Matrix] = None
+    if worlds.is_exact(head_row):
+        head_parent_world = worlds.get_parent(head_row)
+        parent_loc_local = get_local_transforms(get_pos_rot_matrix(worlds.get(head_row)), head_parent_world)
+        # the world the locator really gets, the sheared parent world can't be matched exactly
+        parent_loc_world = compose(*parent_loc_local)
+        if head_parent_world is not None:
+            parent_loc_world = multiply(head_parent_world, parent_loc_world)
+        parent_items_to((parent_loc,), head_item.parent, get_parent_index(head_item), inplace=False)
+        write_changed_transforms(parent_loc, IDENTITY_TRANSFORMS, parent_loc_local)
+    else:
+        match_pos_rot(parent_loc, head_item)
+        parent_items_to((parent_loc,), head_item.parent, get_parent_index(head_item))
 
     for item in items:
-        parent_items_to((item,), parent_loc, get_parent_index(item))
+        row = snapshot.get_row(item)
+        if parent_loc_world is None or not worlds.is_exact(row):
+            parent_items_to((item,), parent_loc, get_parent_index(item))
+            continue
+
+        parent_items_to((item,), parent_loc, get_parent_index(item), inplace=False)
+        write_changed_transforms(
+            item,
+            split_row(snapshot.transforms, row),
+            get_local_transforms(worlds.get(row), parent_loc_world, snapshot.get_rotation_order(row)),
+        )
 
     return parent_loc
 
@@ -0,0 +1,166 @@
+#!/usr/bin/python
+# ================================
+# (C)2026 Dmytro Holub
+# heap3d@gmail.com
+# --------------------------------
+# modo python
+# EMAG
+# opt-in hot path instrumentation: per-phase timers and lx.eval / parenting / item creation / file I/O counters
+# enable with the h3d_mhs_profile user value, the summary is printed to the event log after the command
+
+import functools
+import os
+import sys
+import time
+from typing import Any, Callable, Optional
+
+import lx
+import modo
+
+import h3d_utilites.scripts.h3d_utils as h3du
+from h3d_utilites.scripts.h3d_utils import get_user_value
+
+
+USERVAL_NAME_PROFILE = 'h3d_mhs_profile'
+KIT_MODULE_PREFIXES = ('scripts.', 'h3d_meshref_hierarchy_setup.scripts.')
+PHASE_PREFIX = 'phase:'
+
+COUNT = 0
+TOTAL = 1
+MAX = 2
+ITEMS = 3
+
+enabled = False
+records: dict[str, list[float]] = dict()
+
+
+def record(name: str, elapsed: float, items: int = 0):
+    stats = records.setdefault(name, [0, 0.0, 0.0, 0])
+    stats[COUNT] += 1
+    stats[TOTAL] += elapsed
+    stats[MAX] = max(stats[MAX], elapsed)
+    stats[ITEMS] += items
+
+
+class phase():
+    """Time a named phase of the command, does nothing unless profiling is enabled
+
+    Args:
+        name (str): phase name: collect, normalize, store info, flatten, write, ...
+        items (int): number of items processed in the phase, used for the items per second value
+    """
+
+    def __init__(self, name: str, items: int = 0):
+        self.name = name
+        self.items = items
+        self.start = 0.0
+
+    def __enter__(self):
+        if enabled:
+            self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *args):
+        if enabled:
+            record(f'{PHASE_PREFIX}{self.name}', time.perf_counter() - self.start, self.items)
+
+
+def timed(name: str, function: Callable) -> Callable:
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            record(name, time.perf_counter() - start)
+
+    return wrapper
+
+
+def open_file(filename: str, *args, open_function: Callable = open, **kwargs) -> Any:
+    """Open a kit file with open_function, counted as file I/O only while profiling is enabled
+
+    Args:
+        filename (str): file to open, the rest of the arguments are passed to open_function
+        open_function (Callable): open or gzip.open
+    """
+    if not enabled:
+        return open_function(filename, *args, **kwargs)
+    return timed('open', open_function)(filename, *args, **kwargs)
+
+
+def get_kit_modules() -> list[Any]:
+    return [module for name, module in list(sys.modules.items()) if name.startswith(KIT_MODULE_PREFIXES)]
+
+
+def install_wrappers(command_module: Any) -> list[tuple[Any, str, Any]]:
+    """Replace hot SDK entry points with timed wrappers, return (owner, attribute, original) to restore"""
+    targets: list[tuple[Any, str, str]] = [
+        (lx, 'eval', 'lx.eval'),
+        (modo.Scene, 'addItem', 'modo.Scene.addItem'),
+        (h3du, 'parent_items_to', 'parent_items_to'),
+    ]
+    for module in (*get_kit_modules(), command_module):
+        if getattr(module, 'parent_items_to', None) is h3du.parent_items_to:
+            targets.append((module, 'parent_items_to', 'parent_items_to'))
+
+    originals: list[tuple[Any, str, Any]] = []
+    wrappers: dict[int, Callable] = dict()
+    wrapped: set[tuple[int, str]] = set()
+    for owner, attribute, name in targets:
+        if (id(owner), attribute) in wrapped:
+            continue
+        wrapped.add((id(owner), attribute))
+        original = getattr(owner, attribute)
+        if id(original) not in wrappers:
+            wrappers[id(original)] = timed(name, original)
+        originals.append((owner, attribute, original))
+        setattr(owner, attribute, wrappers[id(original)])
+
+    return originals
+
+
+def restore_wrappers(originals: list[tuple[Any, str, Any]]):
+    for owner, attribute, original in reversed(originals):
+        setattr(owner, attribute, original)
+
+
+def print_summary(command: str, elapsed: float):
+    print(f'Profile <{command}>: {elapsed:.3f}s')
+    for name, stats in sorted(records.items(), key=lambda i: (not i[0].startswith(PHASE_PREFIX), -i[1][TOTAL])):
+        count, total, max_time, items = stats
+        line = f'  {name:<24} {int(count):>8} calls {total:>9.3f}s total {max_time * 1000:>9.3f}ms max'
+        if items and total:
+            line += f' {int(items):>8} items {items / total:>11.0f} items/s'
+        print(line)
+
+
+def profile_command(function: Callable) -> Callable:
+    """Profile the decorated command main() if the profile user value is enabled"""
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        global enabled
+        if enabled or get_user_value(USERVAL_NAME_PROFILE) != 1:
+            return function(*args, **kwargs)
+
+        records.clear()
+        enabled = True
+        command_module = sys.modules.get(function.__module__)
+        originals = install_wrappers(command_module)
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            restore_wrappers(originals)
+            enabled = False
+            print_summary(get_command_name(command_module, function), elapsed)
+
+    return wrapper
+
+
+def get_command_name(command_module: Any, function: Callable) -> str:
+    filename: Optional[str] = getattr(command_module, '__file__', None)
+    if not filename:
+        return function.__qualname__
+    return os.path.splitext(os.path.basename(filename))[0]
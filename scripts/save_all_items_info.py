@@ -10,13 +10,15 @@
 import modo
 import modo.constants as c
 
-from scripts.save_item_info import save_items_info
+from scripts.save_item_info import save_items_info, is_binary_arg, is_gzip_arg, is_delta_arg
+from scripts.profiling import profile_command
 
 
+@profile_command
 def main():
     items: list[modo.Item] = modo.Scene().items(itype=c.LOCATOR_TYPE, superType=True)
 
-    save_items_info(items)
+    save_items_info(items, is_binary_arg(), is_gzip_arg(), is_delta_arg(), whole_scene=True)
 
 
 if __name__ == '__main__':
@@ -7,74 +7,99 @@
 # modo python
 # save transform info for selected meshref items to file
 
-from dataclasses import dataclass, field
+import gzip
+import locale
 import os
-from typing import Iterable
+import queue
+import threading
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import BinaryIO, Iterable, Iterator, Optional, Sequence
 
+import lx
 import modo
 import modo.constants as c
 from modo import dialogs
 
-from h3d_utilites.scripts.h3d_utils import (
-    item_get_scale, item_get_position, item_get_rotation, get_parent_index
+import scripts.h3d_kit_constants as h3dc
+from scripts.scene_snapshot import (
+    SceneSnapshot, take_snapshot, get_items_with_ancestors, NO_PARENT, MESHREF_ID_SEPARATOR
+)
+from scripts.transforms_reader import WIDTH, read_transforms, split_row
+from scripts.item_info_table import ItemInfoTable, InfoRecord
+from scripts.item_info_binary import write_info_binary
+from scripts.item_info_index import Span, write_info_index, remove_info_index
+from scripts.item_info_delta import (
+    get_delta_filename, is_delta_base, remove_delta, get_record_fingerprint, get_fingerprints, read_fingerprints,
+    write_fingerprints,
 )
-from scripts.select_meshref_meshes import is_meshref
+from scripts.profiling import profile_command, phase, open_file
 
 
 SCENE = 'scene'
 TYPE = 'type'
 IS_MESHREF = 'is_meshref'
 HIERARCHY = 'hierarchy'
+PARENT = 'parent'
 PARENT_INDEX = 'parent_index'
 POS = 'pos'
 ROT = 'rot'
 SCL = 'scl'
+REMOVED = 'removed'
 NAME_SEPARATOR = r' \/ '
 TAG_SEPARATOR = '::'
+FORMAT = 'format'
+FORMAT_VERSION = 2
+FORMAT_HEADER = f'#{FORMAT}{TAG_SEPARATOR}{FORMAT_VERSION}\n'
+BATCH_SIZE = 4096
+QUEUE_SIZE = 8
+BUFFER_SIZE = 1 << 20
+GZIP_LEVEL = 6
+RECORD_NAME = 0
+RECORD_PARENT = 4
 
-
-@dataclass
-class ItemInfo():
-    name = ''
-    itype = ''
-    is_meshref = False
-    scene = ''
-    parents: list[modo.Item] = field(default_factory=lambda: [])
-    hierarchy: list[str] = field(default_factory=lambda: [])
-    parent_index = 0
-    pos = modo.Vector3()
-    rot = modo.Vector3()
-    scl = modo.Vector3()
+ItemKey = tuple[str, str, bool]
 
 
+@profile_command
 def main():
     items: list[modo.Item] = modo.Scene().selectedByType(itype=c.LOCATOR_TYPE, superType=True)
 
-    save_items_info(items)
+    save_items_info(items, is_binary_arg(), is_gzip_arg(), is_delta_arg())
+
 
+def is_binary_arg() -> bool:
+    return h3dc.CMD_BINARY in (lx.args() or ())
 
-def save_items_info(items: list[modo.Item]):
-    info_lines: list[str] = list()
 
-    parents = set()
-    for item in items:
-        item_info = get_item_info(item, include_parents=True)
-        info_lines.extend(get_item_lines(item_info))
-        parents.update(item_info.parents)
+def is_gzip_arg() -> bool:
+    return h3dc.CMD_GZIP in (lx.args() or ())
 
-    parents = parents.difference(items)
-    for parent in parents:
-        item_info = get_item_info(parent, include_parents=False)
-        info_lines.extend(get_item_lines(item_info))
 
-    if not info_lines:
+def is_delta_arg() -> bool:
+    return h3dc.CMD_DELTA in (lx.args() or ())
+
+
+def save_items_info(
+    items: list[modo.Item], binary: bool = False, compress: bool = False, delta: bool = False, whole_scene: bool = False
+):
+    """Save info records of the items and their ancestors
+
+    Args:
+        items (list[modo.Item]): items to save
+        binary (bool): write the binary info file if enabled
+        compress (bool): write the gzip compressed text info file if enabled
+        delta (bool): append the changes to the delta log if the file was saved with fingerprints before
+        whole_scene (bool): the items are all scene items, the delta log records the items removed from the scene
+    """
+    if not items:
         dialogs.alert(title='Nothing to save', message='Please select meshref items.')
         return
 
     try:
         filename = dialogs.fileSave(
             'text', 'text', fspec='format',
-            path=f'{os.path.dirname(modo.Scene().filename)}/{get_meshref_scene_name(items[0])}')
+            path=f'{os.path.dirname(modo.Scene().filename)}/{ItemKeyCache().get_scene(items[0])}')
     except TypeError:
         dialogs.alert(title='Can\'t locate the scene path.', message='Please save the scene.')
         return
@@ -82,69 +107,276 @@ def save_items_info(items: list[modo.Item]):
     if not filename:
         return
 
-    write_info(filename, info_lines)
+    with phase('collect', len(items)):
+        snapshot = take_snapshot(get_items_with_ancestors(items), transforms=False)
+        keys = get_snapshot_keys(snapshot)
+        record_rows = get_record_rows(snapshot, keys, snapshot.get_rows(items))
+
+    with phase('write', len(record_rows)):
+        records = iter_snapshot_records(snapshot, keys, record_rows)
+        if delta and is_delta_base(filename):
+            write_info_delta(filename, records, whole_scene)
+        elif binary:
+            write_items_info(filename, get_items_info(records), binary=True)
+        else:
+            write_records_info(filename, records, compress)
+
+
+def write_items_info(filename: str, items_info: ItemInfoTable, binary: bool = False, compress: bool = False):
+    """Write the full info file with its index and fingerprints, the delta log of the previous saves is dropped"""
+    if not binary:
+        records = (items_info.get_info_record(row) for row in items_info.get_recorded_rows())
+        write_records_info(filename, records, compress)
+        return
 
+    write_info_binary(filename, items_info)
+    rows = items_info.get_recorded_rows()
+    parents = {items_info.get_name(row): items_info.get_info_record(row)[RECORD_PARENT] for row in rows}
+    write_info_index(filename, {items_info.get_name(row): (row, 0) for row in rows}, parents)
+    write_fingerprints(filename, get_fingerprints(items_info))
+    remove_delta(filename)
 
-def get_item_info(item: modo.Item, include_parents: bool) -> ItemInfo:
-    item_info = ItemInfo()
-    item_info.name = strip_meshref_name(item)
-    item_info.itype = str(item.type)
-    item_info.is_meshref = is_meshref(item)
-    item_info.parent_index = get_parent_index(item)
-    item_info.scene = get_meshref_scene_name(item)
-    item_info.pos = item_get_position(item)
-    item_info.rot = item_get_rotation(item)
-    item_info.scl = item_get_scale(item)
 
-    item_info.parents.clear()
-    if include_parents:
-        item_info.parents.extend(get_item_parents(item))
+def write_records_info(filename: str, records: Iterable[InfoRecord], compress: bool = False):
+    """Write the full text info file with its index and fingerprints, the delta log of the previous saves is dropped"""
+    written = write_info_records(filename, records, compress)
+    if compress:
+        remove_info_index(filename)
+    else:
+        write_info_index(filename, written.spans, written.parents)
+
+    write_fingerprints(filename, written.fingerprints)
+    remove_delta(filename)
+
+
+def write_info_delta(filename: str, records: Iterable[InfoRecord], whole_scene: bool = False):
+    """Append records changed since the last save and the removed records to the delta log of the info file
+
+    Records missing from the save are removed only if the whole scene is saved, a save of the selected items
+    keeps the records of the other items. The fingerprints of the other items are kept for the next delta save.
+    """
+    previous = read_fingerprints(filename)
+    current: dict[str, int] = dict()
+    changed: list[InfoRecord] = []
+    for record in records:
+        fingerprint = current[record[RECORD_NAME]] = get_record_fingerprint(record)
+        if previous.get(record[RECORD_NAME]) != fingerprint:
+            changed.append(record)
+    removed = [name for name in previous if name not in current] if whole_scene else []
+    if changed or removed:
+        with open_file(get_delta_filename(filename), 'a', newline='\n') as file:
+            if not file.tell():
+                file.write(FORMAT_HEADER)
+            for record in changed:
+                file.writelines(get_item_lines(record))
+            for name in removed:
+                file.write(f'{name}{TAG_SEPARATOR}{REMOVED}{TAG_SEPARATOR}\n')
+        write_fingerprints(filename, {**previous, **current} if not whole_scene else current)
+
+    print(f'Delta save: {len(changed)} changed, {len(removed)} removed of {len(current)} records.')
+
+
+def get_record_rows(snapshot: SceneSnapshot, keys: Sequence[ItemKey], rows: Iterable[int]) -> dict[str, int]:
+    """Get snapshot rows of the info records by record name for the rows and their ancestors
+
+    Records are ordered by the first appearance of the name as an item or a parent, the last item of the name wins.
+    """
+    info_rows: dict[int, None] = dict.fromkeys(rows)
+    for row in list(info_rows):
+        info_rows.update(dict.fromkeys(snapshot.get_ancestors(row)))
+
+    record_rows: dict[str, int] = dict()
+    for row in info_rows:
+        record_rows[keys[row][0]] = row
+        parent = snapshot.parents[row]
+        if parent != NO_PARENT:
+            record_rows.setdefault(keys[parent][0], parent)
+
+    return record_rows
+
+
+def iter_snapshot_records(
+    snapshot: SceneSnapshot, keys: Sequence[ItemKey], record_rows: dict[str, int], batch_size: int = BATCH_SIZE
+) -> Iterator[InfoRecord]:
+    """Yield info records of the snapshot rows, transforms are read from the scene batch by batch"""
+    rows = list(record_rows.values())
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start:start + batch_size]
+        transforms = read_transforms(snapshot.get_items(batch))
+        for offset, row in enumerate(batch):
+            name, scene_name, meshref = keys[row]
+            parent = snapshot.parents[row]
+            yield (
+                name,
+                scene_name,
+                str(snapshot.type_names[row]),
+                meshref,
+                keys[parent][0] if parent != NO_PARENT else '',
+                snapshot.parent_indices[row],
+                transforms[offset * WIDTH:(offset + 1) * WIDTH],
+            )
+
+
+def get_items_info(records: Iterable[InfoRecord]) -> ItemInfoTable:
+    """Collect the records into the item info table, table rows follow the record order"""
+    items_info = ItemInfoTable()
+    records = list(records)
+    for record in records:
+        items_info.add_row(record[RECORD_NAME])
+    for record in records:
+        items_info.add_info_record(record)
+
+    return items_info
+
+
+def get_item_lines(record: InfoRecord) -> tuple[str, ...]:
+    name, scene_name, itype, meshref, parent_name, parent_index, transforms = record
+    pos, rot, scl = split_row(transforms, 0)  # type: ignore
+    item_lines = [
+        f'{name}{TAG_SEPARATOR}{SCENE}{TAG_SEPARATOR}{scene_name}\n',
+        f'{name}::{TYPE}::{itype}\n',
+        f'{name}::{IS_MESHREF}::{meshref}\n',
+        f'{name}::{PARENT}::{parent_name}\n',
+        f'{name}::{PARENT_INDEX}::{parent_index}\n',
+        f'{name}::{POS}::{" ".join([str(i) for i in pos])}\n',
+        f'{name}::{ROT}::{" ".join([str(i) for i in rot])}\n',
+        f'{name}::{SCL}::{" ".join([str(i) for i in scl])}\n',
+    ]
+    return tuple(item_lines)
 
-    return item_info
 
+@dataclass
+class WrittenRecords():
+    """Offsets, parents and fingerprints of the written records by name, collected for the index and delta saves"""
+    spans: dict[str, Span] = field(default_factory=dict)
+    parents: dict[str, str] = field(default_factory=dict)
+    fingerprints: dict[str, int] = field(default_factory=dict)
+
+    def add(self, record: InfoRecord, span: Span):
+        name = record[RECORD_NAME]
+        self.spans[name] = span
+        self.parents[name] = record[RECORD_PARENT]
+        self.fingerprints[name] = get_record_fingerprint(record)
+
+
+def write_info_records(filename: str, records: Iterable[InfoRecord], compress: bool = False) -> WrittenRecords:
+    """Write text info records, get byte offset and length, parent and fingerprint of the record by name
+
+    Records are formatted in batches while the previous batches are written on the writer thread,
+    offsets of the compressed file are the offsets of the uncompressed text.
+    """
+    written = WrittenRecords()
+    write_chunks(filename, iter_record_chunks(records, written), compress)
+
+    return written
+
+
+def iter_record_chunks(
+    records: Iterable[InfoRecord], written: WrittenRecords, batch_size: int = BATCH_SIZE
+) -> Iterator[bytes]:
+    """Yield encoded text info batches of the records, collect the written records on the way"""
+    encoding = locale.getpreferredencoding(False)
+    header = FORMAT_HEADER.encode(encoding)
+    offset = len(header)
+    yield header
+
+    records = iter(records)
+    while batch := list(islice(records, batch_size)):
+        chunk: list[bytes] = []
+        for record in batch:
+            data = ''.join(get_item_lines(record)).encode(encoding)
+            written.add(record, (offset, len(data)))
+            offset += len(data)
+            chunk.append(data)
+        yield b''.join(chunk)
+
+
+def write_chunks(filename: str, chunks: Iterable[bytes], compress: bool = False):
+    """Write chunks on the background thread, the bounded queue keeps memory flat while the chunks are produced
+
+    Raises:
+        OSError: if the file can't be written
+    """
+    chunk_queue: queue.Queue[Optional[bytes]] = queue.Queue(QUEUE_SIZE)
+    errors: list[BaseException] = []
+
+    def write():
+        try:
+            with open_info_file(filename, compress) as file:
+                while (chunk := chunk_queue.get()) is not None:
+                    file.write(chunk)
+        except BaseException as error:
+            errors.append(error)
+            while chunk_queue.get() is not None:
+                pass
+
+    writer = threading.Thread(target=write, name='h3d_mhs_info_writer', daemon=True)
+    writer.start()
+    try:
+        for chunk in chunks:
+            if errors:
+                break
+            chunk_queue.put(chunk)
+    finally:
+        chunk_queue.put(None)
+        writer.join()
 
-def get_item_parents(item: modo.Item) -> tuple[modo.Item, ...]:
-    if item_parents := item.parents:
-        return tuple(item_parents)
-    else:
-        return tuple()
+    if errors:
+        raise errors[0]
 
 
-def get_item_lines(item_info: ItemInfo) -> tuple[str, ...]:
-    hierarchy = NAME_SEPARATOR.join([strip_meshref_name(parent) for parent in item_info.parents])
-    item_lines = [
-        f'{item_info.name}{TAG_SEPARATOR}{SCENE}{TAG_SEPARATOR}{item_info.scene}\n',
-        f'{item_info.name}::{TYPE}::{item_info.itype}\n'
-        f'{item_info.name}::{IS_MESHREF}::{item_info.is_meshref}\n'
-        f'{item_info.name}::{HIERARCHY}::{hierarchy}\n',
-        f'{item_info.name}::{PARENT_INDEX}::{item_info.parent_index}\n',
-        f'{item_info.name}::{POS}::{" ".join([str(i) for i in item_info.pos])}\n',
-        f'{item_info.name}::{ROT}::{" ".join([str(i) for i in item_info.rot])}\n',
-        f'{item_info.name}::{SCL}::{" ".join([str(i) for i in item_info.scl])}\n',
-    ]
-    return tuple(item_lines)
+def open_info_file(filename: str, compress: bool) -> BinaryIO:
+    if compress:
+        return open_file(filename, 'wb', open_function=gzip.open, compresslevel=GZIP_LEVEL)
+    return open_file(filename, 'wb', buffering=BUFFER_SIZE)
+
 
+def get_item_key(name: str, item_id: str, scene_name: str) -> ItemKey:
+    """Work out stripped name, meshref scene name and meshref flag from the item name and id
 
-def write_info(filename: str, info_lines: Iterable[str]):
-    with open(filename, 'w') as file:
-        for line in info_lines:
-            file.write(line)
+    Args:
+        name (str): item name
+        item_id (str): item id, 'meshref scene:item' for meshref items
+        scene_name (str): current scene name without extension, the scene of not meshref items
 
+    Returns:
+        ItemKey: stripped name, meshref scene name, is meshref
+    """
+    if MESHREF_ID_SEPARATOR not in item_id:
+        return name, scene_name, False
 
-def strip_meshref_name(item: modo.Item) -> str:
-    if not is_meshref(item):
-        return item.name
+    meshref_scene = item_id.split(MESHREF_ID_SEPARATOR)[0]
+    return name.split(f' ({meshref_scene})')[0], meshref_scene, True
 
-    scenename = get_meshref_scene_name(item)
 
-    return str(item.name).split(f' ({scenename})')[0]
+def get_scene_name() -> str:
+    return os.path.splitext(modo.Scene().name)[0]
 
 
-def get_meshref_scene_name(item: modo.Item) -> str:
-    if not is_meshref(item):
-        return os.path.splitext(modo.Scene().name)[0]
+def get_snapshot_keys(snapshot: SceneSnapshot) -> list[ItemKey]:
+    """Get the key column of the snapshot, no SDK calls per item"""
+    scene_name = get_scene_name()
+    return [get_item_key(str(name), item_id, scene_name) for name, item_id in zip(snapshot.names, snapshot.ids)]
 
-    return str(item.id).split(':')[0]
+
+@dataclass
+class ItemKeyCache():
+    """Item keys by item id, each item key is worked out once per command"""
+    scene_name: str = field(default_factory=get_scene_name)
+    keys: dict[str, ItemKey] = field(default_factory=dict)
+
+    def get(self, item: modo.Item) -> ItemKey:
+        item_id = item.id
+        key = self.keys.get(item_id)
+        if key is None:
+            key = self.keys[item_id] = get_item_key(str(item.name), item_id, self.scene_name)
+        return key
+
+    def get_name(self, item: modo.Item) -> str:
+        return self.get(item)[0]
+
+    def get_scene(self, item: modo.Item) -> str:
+        return self.get(item)[1]
 
 
 if __name__ == '__main__':
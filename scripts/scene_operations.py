@@ -0,0 +1,288 @@
+#!/usr/bin/python
+# ================================
+# (C)2026 Dmytro Holub
+# heap3d@gmail.com
+# --------------------------------
+# EMAG
+# modo python
+# scene operation plans: the planners describe scene changes as plain operations without touching the scene,
+# the executor applies the whole plan in one pass
+# operations refer to the existing items by index in the plan items and to the created items by their creation key
+
+from collections import Counter
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Callable, ClassVar, Iterable, Iterator, Optional, Union
+
+import lx
+import modo
+
+from h3d_utilites.scripts.h3d_utils import (
+    item_set_position, item_set_rotation, item_set_scale,
+    parent_items_to,
+    set_description_tag,
+)
+
+import h3d_meshref_hierarchy_setup.scripts.h3d_kit_constants as h3dc
+from h3d_meshref_hierarchy_setup.scripts.transforms_reader import Transforms
+
+
+CREATED_PREFIX = '+'
+DRY_RUN_LINES = 1000
+
+ItemRef = Union[int, str]
+Vector = Iterable[float]
+
+
+@dataclass(frozen=True)
+class CreateItem():
+    LABEL: ClassVar[str] = 'create'
+    ref: str
+    itype: Union[int, str]
+    name: str
+
+    def describe(self, get_name: Callable[[ItemRef], str]) -> str:
+        return f'create {self.itype} <{self.name}>'
+
+
+@dataclass(frozen=True)
+class Reparent():
+    LABEL: ClassVar[str] = 'reparent'
+    items: tuple[ItemRef, ...]
+    parent: Optional[ItemRef]
+    index: int = 0
+    inplace: bool = True
+
+    def describe(self, get_name: Callable[[ItemRef], str]) -> str:
+        names = ', '.join(f'<{get_name(i)}>' for i in self.items)
+        parent = f'<{get_name(self.parent)}>' if self.parent is not None else 'scene root'
+        return f'reparent {names} to {parent} at {self.index}{" in place" if self.inplace else ""}'
+
+
+@dataclass(frozen=True)
+class SetTransforms():
+    LABEL: ClassVar[str] = 'set transforms'
+    item: ItemRef
+    pos: Optional[tuple[float, ...]]
+    rot: Optional[tuple[float, ...]]
+    scl: Optional[tuple[float, ...]]
+
+    def describe(self, get_name: Callable[[ItemRef], str]) -> str:
+        vectors = ((name, values) for name, values in (('pos', self.pos), ('rot', self.rot), ('scl', self.scl)))
+        return f'set transforms <{get_name(self.item)}> ' + ' '.join(f'{n} {v}' for n, v in vectors if v is not None)
+
+
+@dataclass(frozen=True)
+class Rename():
+    LABEL: ClassVar[str] = 'rename'
+    item: ItemRef
+    name: str
+
+    def describe(self, get_name: Callable[[ItemRef], str]) -> str:
+        return f'rename <{get_name(self.item)}> to <{self.name}>'
+
+
+@dataclass(frozen=True)
+class SetDescription():
+    LABEL: ClassVar[str] = 'set description'
+    item: ItemRef
+    text: str
+
+    def describe(self, get_name: Callable[[ItemRef], str]) -> str:
+        return f'set description <{get_name(self.item)}>: {self.text!r}'
+
+
+@dataclass(frozen=True)
+class SetTag():
+    LABEL: ClassVar[str] = 'set tag'
+    item: ItemRef
+    tag: str
+    text: str
+
+    def describe(self, get_name: Callable[[ItemRef], str]) -> str:
+        return f'set tag <{get_name(self.item)}> {self.tag}: {self.text!r}'
+
+
+Operation = Union[CreateItem, Reparent, SetTransforms, Rename, SetDescription, SetTag]
+
+
+@dataclass
+class OperationPlan():
+    """Scene operations in the execution order with the existing items they refer to
+
+    The names given on add are the item names before the plan, empty names are read from the items on demand,
+    the planned renames are kept apart so the planners see the names the items will have at their turn.
+    """
+    items: list[modo.Item] = field(default_factory=list)
+    names: list[str] = field(default_factory=list)
+    refs: dict[int, int] = field(default_factory=dict)
+    created: dict[str, str] = field(default_factory=dict)
+    renamed: dict[ItemRef, str] = field(default_factory=dict)
+    operations: list[Operation] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.operations)
+
+    def add_item(self, item: modo.Item, name: str = '') -> int:
+        """Get the reference of the existing item, the same item object is added once"""
+        ref = self.refs.get(id(item))
+        if ref is None:
+            ref = self.refs[id(item)] = len(self.items)
+            self.items.append(item)
+            self.names.append(name)
+        return ref
+
+    def create(self, itype: Union[int, str], name: str) -> str:
+        ref = f'{CREATED_PREFIX}{len(self.created)}'
+        self.created[ref] = name
+        self.operations.append(CreateItem(ref, itype, name))
+        return ref
+
+    def reparent(self, items: Iterable[ItemRef], parent: Optional[ItemRef], index: int = 0, inplace: bool = True):
+        self.operations.append(Reparent(tuple(items), parent, index, inplace))
+
+    def set_transforms(
+        self, item: ItemRef, pos: Optional[Vector] = None, rot: Optional[Vector] = None, scl: Optional[Vector] = None
+    ):
+        """Plan setting the local transforms of the item, the vectors not specified are kept"""
+        self.operations.append(SetTransforms(
+            item,
+            tuple(pos) if pos is not None else None,
+            tuple(rot) if rot is not None else None,
+            tuple(scl) if scl is not None else None,
+        ))
+
+    def set_changed_transforms(self, item: ItemRef, current: Transforms, transforms: Transforms):
+        """Plan setting only the transforms vectors that differ from the current ones"""
+        changed = get_changed_vectors(current, transforms)
+        if any(vector is not None for vector in changed):
+            self.set_transforms(item, *changed)
+
+    def rename(self, item: ItemRef, name: str):
+        self.operations.append(Rename(item, name))
+        self.renamed[item] = name
+
+    def set_description(self, item: ItemRef, text: str):
+        self.operations.append(SetDescription(item, text))
+
+    def set_tag(self, item: ItemRef, tag: str, text: str):
+        self.operations.append(SetTag(item, tag, text))
+
+    def get_name(self, ref: ItemRef) -> str:
+        """Get the planned name of the item"""
+        return self.renamed.get(ref) or self.get_initial_name(ref)
+
+    def get_initial_name(self, ref: ItemRef) -> str:
+        if not isinstance(ref, int):
+            return self.created[ref]
+        if not self.names[ref]:
+            self.names[ref] = str(self.items[ref].name)
+        return self.names[ref]
+
+    def get_stats(self) -> dict[str, int]:
+        """Get operation counts by label and the count of the reparented items"""
+        stats = Counter(operation.LABEL for operation in self.operations)
+        stats['reparented items'] = sum(len(i.items) for i in self.operations if isinstance(i, Reparent))
+        return dict(stats)
+
+    def describe(self) -> Iterator[str]:
+        for operation in self.operations:
+            yield operation.describe(self.get_initial_name)
+
+
+def merge_reparents(operations: Iterable[Operation]) -> Iterator[Operation]:
+    """Join consecutive reparent operations inserting next to each other under the same parent into one"""
+    pending: Optional[Reparent] = None
+    for operation in operations:
+        if isinstance(operation, Reparent):
+            if (
+                pending is not None
+                and pending.parent == operation.parent
+                and pending.inplace == operation.inplace
+                and pending.index + len(pending.items) == operation.index
+            ):
+                pending = Reparent(pending.items + operation.items, pending.parent, pending.index, pending.inplace)
+                continue
+            if pending is not None:
+                yield pending
+            pending = operation
+            continue
+        if pending is not None:
+            yield pending
+            pending = None
+        yield operation
+
+    if pending is not None:
+        yield pending
+
+
+def execute_plan(plan: OperationPlan) -> dict[str, modo.Item]:
+    """Apply the plan operations in order
+
+    Args:
+        plan (OperationPlan): planned operations
+
+    Returns:
+        dict[str, modo.Item]: created items by creation key
+    """
+    created: dict[str, modo.Item] = dict()
+    scene = modo.Scene()
+
+    def resolve(ref: ItemRef) -> modo.Item:
+        return plan.items[ref] if isinstance(ref, int) else created[ref]
+
+    for operation in merge_reparents(plan.operations):
+        if isinstance(operation, CreateItem):
+            created[operation.ref] = scene.addItem(itype=operation.itype, name=operation.name)
+        elif isinstance(operation, Reparent):
+            parent = resolve(operation.parent) if operation.parent is not None else None
+            parent_items_to([resolve(i) for i in operation.items], parent, operation.index, operation.inplace)
+        elif isinstance(operation, SetTransforms):
+            write_transforms(resolve(operation.item), operation.pos, operation.rot, operation.scl)
+        elif isinstance(operation, Rename):
+            item = resolve(operation.item)
+            try:
+                item.name = operation.name
+            except RuntimeError:
+                print(f'{item.name} : Failed to change item name.')
+        elif isinstance(operation, SetDescription):
+            set_description_tag(item=resolve(operation.item), text=operation.text)
+        elif isinstance(operation, SetTag):
+            resolve(operation.item).setTag(operation.tag, operation.text)
+
+    return created
+
+
+def write_transforms(
+    item: modo.Item, pos: Optional[Vector] = None, rot: Optional[Vector] = None, scl: Optional[Vector] = None
+):
+    """Set the local transforms vectors of the item, the vectors not specified are kept"""
+    if pos is not None:
+        item_set_position(item, modo.Vector3(pos))
+    if rot is not None:
+        item_set_rotation(item, modo.Vector3(rot))
+    if scl is not None:
+        item_set_scale(item, modo.Vector3(scl))
+
+
+def get_changed_vectors(current: Transforms, transforms: Transforms) -> list[Optional[tuple[float, ...]]]:
+    """Get the transforms vectors that differ from the current ones, None for the same vectors"""
+    return [tuple(new) if tuple(new) != tuple(old) else None for old, new in zip(current, transforms)]
+
+
+def write_changed_transforms(item: modo.Item, current: Transforms, transforms: Transforms):
+    write_transforms(item, *get_changed_vectors(current, transforms))
+
+
+def is_dry_run_arg() -> bool:
+    return h3dc.CMD_DRY_RUN in (lx.args() or ())
+
+
+def print_plan(title: str, plan: OperationPlan, limit: int = DRY_RUN_LINES):
+    """Print the plan statistics and up to the limit of its operations"""
+    stats = ', '.join(f'{label}: {count}' for label, count in plan.get_stats().items())
+    print(f'{title}: {len(plan)} operations ({stats})')
+    for line in islice(plan.describe(), limit):
+        print(f'    {line}')
+    if len(plan) > limit:
+        print(f'    ... {len(plan) - limit} more operations')
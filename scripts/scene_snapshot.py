@@ -0,0 +1,181 @@
+#!/usr/bin/python
+# ================================
+# (C)2026 Dmytro Holub
+# heap3d@gmail.com
+# --------------------------------
+# modo python
+# EMAG
+# per-invocation scene snapshot: locator-derived items captured in one pass into a columnar table
+
+from array import array
+from dataclasses import dataclass, field
+from typing import Iterable, Optional, Sequence
+
+import modo
+import modo.constants as c
+
+from h3d_utilites.scripts.h3d_utils import get_parent_index, itype_int
+
+from h3d_meshref_hierarchy_setup.scripts.transforms_reader import (
+    WIDTH, DEFAULT_ORDER, read_transforms, read_rotation_orders, read_custom_stacks
+)
+
+
+NO_PARENT = -1
+MESHREF_ID_SEPARATOR = ':'
+
+
+@dataclass
+class SceneSnapshot():
+    items: list[modo.Item] = field(default_factory=list)
+    ids: list[str] = field(default_factory=list)
+    names: list[str] = field(default_factory=list)
+    type_names: list[str] = field(default_factory=list)
+    types: array = field(default_factory=lambda: array('i'))
+    parents: array = field(default_factory=lambda: array('i'))
+    parent_indices: array = field(default_factory=lambda: array('i'))
+    meshrefs: array = field(default_factory=lambda: array('b'))
+    transforms: array = field(default_factory=lambda: array('d'))
+    rotation_orders: array = field(default_factory=lambda: array('B'))
+    custom_stacks: array = field(default_factory=lambda: array('B'))
+    children_offsets: array = field(default_factory=lambda: array('i', (0,)))
+    children_rows: array = field(default_factory=lambda: array('i'))
+    rows_by_id: dict[str, int] = field(default_factory=dict)
+    type_buckets: dict[int, array] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def get_row(self, item: modo.Item) -> int:
+        return self.rows_by_id[item.id]
+
+    def get_rows(self, items: Iterable[modo.Item]) -> list[int]:
+        return [self.rows_by_id[item.id] for item in items if item.id in self.rows_by_id]
+
+    def get_items(self, rows: Iterable[int]) -> list[modo.Item]:
+        return [self.items[row] for row in rows]
+
+    def get_children(self, row: int) -> array:
+        return self.children_rows[self.children_offsets[row]:self.children_offsets[row + 1]]
+
+    def has_children(self, row: int) -> bool:
+        return self.children_offsets[row + 1] > self.children_offsets[row]
+
+    def get_descendants(self, row: int) -> list[int]:
+        """Get all descendant rows of the specified row, depth first in the children order"""
+        descendants: list[int] = []
+        stack = list(reversed(self.get_children(row)))
+        while stack:
+            current = stack.pop()
+            descendants.append(current)
+            stack.extend(reversed(self.get_children(current)))
+
+        return descendants
+
+    def get_ancestors(self, row: int) -> list[int]:
+        """Get ancestor rows of the specified row, the nearest parent first"""
+        ancestors: list[int] = []
+        parent = self.parents[row]
+        while parent != NO_PARENT:
+            ancestors.append(parent)
+            parent = self.parents[parent]
+
+        return ancestors
+
+    def get_roots(self) -> list[int]:
+        return [row for row, parent in enumerate(self.parents) if parent == NO_PARENT]
+
+    def get_bucket(self, *itypes: int) -> list[int]:
+        """Get rows of the specified item types in the scene order"""
+        if len(itypes) == 1:
+            return list(self.type_buckets.get(itypes[0], ()))
+        return sorted(row for itype in itypes for row in self.type_buckets.get(itype, ()))
+
+    def get_meshref_scene_name(self, row: int) -> str:
+        return self.ids[row].split(MESHREF_ID_SEPARATOR)[0]
+
+    def get_transforms_row(self, row: int) -> tuple[float, ...]:
+        return tuple(self.transforms[row * WIDTH:(row + 1) * WIDTH])
+
+    def get_rotation_order(self, row: int) -> int:
+        return self.rotation_orders[row] if self.rotation_orders else DEFAULT_ORDER
+
+    def is_custom_stack(self, row: int) -> bool:
+        return bool(self.custom_stacks[row]) if self.custom_stacks else False
+
+
+def take_snapshot(
+    items: Optional[Sequence[modo.Item]] = None,
+    hierarchy: bool = True,
+    transforms: bool = True,
+    rotation_orders: bool = False,
+    transform_stacks: bool = False,
+) -> SceneSnapshot:
+    """Capture locator-derived items with their types, meshref flags, hierarchy and transforms in one pass
+
+    Args:
+        items (Optional[Sequence[modo.Item]]): items to capture, all locator-derived scene items if not specified
+        hierarchy (bool): capture parent rows, sibling indices and children adjacency if enabled
+        transforms (bool): capture pos/rot/scl transforms if enabled
+        rotation_orders (bool): capture rotation orders if enabled, the default order is used otherwise
+        transform_stacks (bool): flag the items with transform items beyond pos/rot/scl if enabled
+
+    Returns:
+        SceneSnapshot: columnar items table
+    """
+    if items is None:
+        items = modo.Scene().items(itype=c.LOCATOR_TYPE, superType=True)
+
+    snapshot = SceneSnapshot()
+    snapshot.items.extend(items)
+    for row, item in enumerate(snapshot.items):
+        item_id = item.id
+        snapshot.ids.append(item_id)
+        snapshot.rows_by_id[item_id] = row
+        snapshot.names.append(item.name)
+        type_name = item.type
+        snapshot.type_names.append(type_name)
+        itype = itype_int(type_name)
+        snapshot.types.append(itype)
+        snapshot.type_buckets.setdefault(itype, array('i')).append(row)
+        snapshot.meshrefs.append(MESHREF_ID_SEPARATOR in item_id)
+
+    if hierarchy:
+        capture_hierarchy(snapshot)
+
+    if transforms:
+        snapshot.transforms = read_transforms(snapshot.items)
+
+    if rotation_orders:
+        snapshot.rotation_orders = read_rotation_orders(snapshot.items)
+
+    if transform_stacks:
+        snapshot.custom_stacks = read_custom_stacks(snapshot.items)
+
+    return snapshot
+
+
+def get_items_with_ancestors(items: Iterable[modo.Item]) -> list[modo.Item]:
+    """Get the items followed by their ancestors missing from the list, each item once"""
+    items_by_id: dict[str, modo.Item] = {item.id: item for item in items}
+    for item in list(items_by_id.values()):
+        for parent in item.parents:
+            items_by_id.setdefault(parent.id, parent)
+
+    return list(items_by_id.values())
+
+
+def capture_hierarchy(snapshot: SceneSnapshot):
+    for item in snapshot.items:
+        parent = item.parent
+        snapshot.parents.append(snapshot.rows_by_id.get(parent.id, NO_PARENT) if parent else NO_PARENT)
+        snapshot.parent_indices.append(get_parent_index(item))
+
+    children: list[list[int]] = [[] for _ in snapshot.items]
+    for row, parent in enumerate(snapshot.parents):
+        if parent != NO_PARENT:
+            children[parent].append(row)
+    for rows in children:
+        rows.sort(key=lambda child: snapshot.parent_indices[child])
+        snapshot.children_rows.extend(rows)
+        snapshot.children_offsets.append(len(snapshot.children_rows))
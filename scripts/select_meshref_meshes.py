@@ -17,6 +17,9 @@ import lx
 import modo
 import modo.constants as c
 
+from scripts.scene_snapshot import take_snapshot, MESHREF_ID_SEPARATOR
+from scripts.profiling import profile_command
+
 
 ARG_ALL = 'all'
 ARG_SELECTED = 'selected'
@@ -24,6 +27,7 @@ ARG_CHILDREN = 'children'
 ARG_SAME = 'same'
 
 
+@profile_command
 def main():
     selection_options = {
         ARG_ALL: get_all_meshrefs,
@@ -65,20 +69,22 @@ def get_children_meshrefs() -> list[modo.Item]:
 
 
 def get_same_meshrefs() -> list[modo.Item]:
-    meshrefs_scene_names: set[str] = set()
-    same_meshrefs: list[modo.Item] = []
-
-    items = modo.Scene().selectedByType(itype=c.LOCATOR_TYPE, superType=True)
-    for item in items:
-        if not is_meshref(item):
-            continue
-        scene_name = get_meshref_scene_name(item)
-        meshrefs_scene_names.add(scene_name)
+    """Select meshrefs of the same meshref scenes as the selected ones
+
+    Meshref scenes of the selection are queried from the snapshot of the selected items,
+    only the id of each scene item is read to match them.
+    """
+    selected = modo.Scene().selectedByType(itype=c.LOCATOR_TYPE, superType=True)
+    snapshot = take_snapshot(selected, hierarchy=False, transforms=False)
+    meshrefs_scene_names = {
+        snapshot.get_meshref_scene_name(row) for row, meshref in enumerate(snapshot.meshrefs) if meshref
+    }
 
-    for meshref in get_meshrefs_from(get_all_meshrefs()):
-        if get_meshref_scene_name(meshref) not in meshrefs_scene_names:
-            continue
-        same_meshrefs.append(meshref)
+    same_meshrefs: list[modo.Item] = []
+    for item in modo.Scene().items(itype=c.LOCATOR_TYPE, superType=True):
+        scene_name, separator, _ = str(item.id).partition(MESHREF_ID_SEPARATOR)
+        if separator and scene_name in meshrefs_scene_names:
+            same_meshrefs.append(item)
 
     return same_meshrefs
 
@@ -100,17 +106,11 @@ def is_meshref(item: modo.Item) -> bool:
     if not item:
         raise ValueError('No item provided')
 
-    if ':' not in item.id:
+    if MESHREF_ID_SEPARATOR not in item.id:
         return False
 
     return True
 
 
-def get_meshref_scene_name(item: modo.Item) -> str:
-    if not is_meshref(item):
-        raise ValueError(f'Provided item is not a meshref: <{item.name}> <{item}>')
-    return str(item.id).split(':')[0]
-
-
 if __name__ == '__main__':
     main()
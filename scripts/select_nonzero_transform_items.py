@@ -12,9 +12,12 @@ from typing import Iterable
 import modo
 import modo.constants as c
 
-from scripts.load_selected_item_info import is_zero_transforms, TOLERANCE
+from scripts.load_selected_item_info import TOLERANCE
+from scripts.transforms_classify import classify_items
+from scripts.profiling import profile_command
 
 
+@profile_command
 def main():
     items = get_nonzero_items(modo.Scene().items(itype=c.LOCATOR_TYPE, superType=True))
 
@@ -24,11 +27,7 @@ def main():
 
 
 def get_nonzero_items(items: Iterable[modo.Item]) -> list[modo.Item]:
-    return [
-        item
-        for item in items
-        if not is_zero_transforms(item, TOLERANCE)
-    ]
+    return classify_items(items, TOLERANCE)[1]
 
 
 if __name__ == '__main__':
@@ -0,0 +1,52 @@
+#!/usr/bin/python
+# ================================
+# (C)2026 Dmytro Holub
+# heap3d@gmail.com
+# --------------------------------
+# modo python
+# EMAG
+# classify items by zero / nonzero transforms in a single pass over the batched transforms array
+
+from array import array
+from itertools import cycle
+from typing import Iterable
+
+import modo
+
+from h3d_meshref_hierarchy_setup.scripts.transforms_reader import WIDTH, IDENTITY, read_transforms
+
+
+def get_zero_mask(transforms: array, tolerance: float) -> list[bool]:
+    """Get zero transforms flags for every row of the batched transforms array
+
+    Args:
+        transforms (array): flat N x 9 transforms array
+        tolerance (float): max allowed deviation of each channel from the identity transform
+
+    Returns:
+        list[bool]: True for rows with zero position, zero rotation and unit scale
+    """
+    within = [abs(value - identity) <= tolerance for value, identity in zip(transforms, cycle(IDENTITY))]
+    return [all(within[offset:offset + WIDTH]) for offset in range(0, len(within), WIDTH)]
+
+
+def classify_items(items: Iterable[modo.Item], tolerance: float) -> tuple[list[modo.Item], list[modo.Item]]:
+    """Split items into zero and nonzero transforms items
+
+    Args:
+        items (Iterable[modo.Item]): items to classify
+        tolerance (float): max allowed deviation of each channel from the identity transform
+
+    Returns:
+        tuple[list[modo.Item], list[modo.Item]]: zero transforms items, nonzero transforms items
+    """
+    items = tuple(items)  # type: ignore
+    zero_items: list[modo.Item] = []
+    nonzero_items: list[modo.Item] = []
+    for item, is_zero in zip(items, get_zero_mask(read_transforms(items), tolerance)):
+        if is_zero:
+            zero_items.append(item)
+        else:
+            nonzero_items.append(item)
+
+    return zero_items, nonzero_items
@@ -0,0 +1,209 @@
+#!/usr/bin/python
+# ================================
+# (C)2026 Dmytro Holub
+# heap3d@gmail.com
+# --------------------------------
+# modo python
+# EMAG
+# local and world transform matrices composed from and decomposed to pos/rot/scl channel values
+# matrices are affine 3x4: flat row-major tuples with the translation in the fourth column
+# rotation is in degrees like the transform channels, the rotation order names the axes in the order they apply:
+# xyz order is Rz * Ry * Rx
+# only the pos/rot/scl channels are composed: pivots, center offsets and extra transform items
+# (after transform.zero or stacked transforms) are not, WorldMatrices.is_exact tells the rows it can't cover
+
+from dataclasses import dataclass, field
+import math
+from typing import Optional
+
+from h3d_meshref_hierarchy_setup.scripts.transforms_reader import Transforms, Vector, DEFAULT_ORDER, split_row
+from h3d_meshref_hierarchy_setup.scripts.scene_snapshot import SceneSnapshot, NO_PARENT
+
+
+ROTATION_ORDERS = ('xyz', 'xzy', 'yxz', 'yzx', 'zxy', 'zyx')
+ROTATION_AXES = tuple(tuple('xyz'.index(axis) for axis in order) for order in ROTATION_ORDERS)
+IDENTITY_MATRIX = (1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0)
+IDENTITY_TRANSFORMS: Transforms = ((0.0, 0.0, 0.0), (0.0, 0.0, 0.0), (1.0, 1.0, 1.0))
+GIMBAL_EPSILON = 1e-9
+
+Matrix = tuple[float, ...]
+Rotation = tuple[float, ...]
+
+
+def get_axis_rotation(axis: int, angle: float) -> Rotation:
+    """Get row-major 3x3 rotation about the axis, angle in radians"""
+    cos, sin = math.cos(angle), math.sin(angle)
+    if axis == 0:
+        return (1.0, 0.0, 0.0, 0.0, cos, -sin, 0.0, sin, cos)
+    if axis == 1:
+        return (cos, 0.0, sin, 0.0, 1.0, 0.0, -sin, 0.0, cos)
+    return (cos, -sin, 0.0, sin, cos, 0.0, 0.0, 0.0, 1.0)
+
+
+def multiply_rotations(a: Rotation, b: Rotation) -> Rotation:
+    return tuple(
+        a[row * 3] * b[col] + a[row * 3 + 1] * b[3 + col] + a[row * 3 + 2] * b[6 + col]
+        for row in range(3) for col in range(3)
+    )
+
+
+def get_rotation(rot: Vector, order: int = DEFAULT_ORDER) -> Rotation:
+    rotation: Optional[Rotation] = None
+    for axis in ROTATION_AXES[order]:
+        axis_rotation = get_axis_rotation(axis, math.radians(rot[axis]))
+        rotation = axis_rotation if rotation is None else multiply_rotations(axis_rotation, rotation)
+
+    return rotation  # type: ignore
+
+
+def compose(pos: Vector, rot: Vector, scl: Vector, order: int = DEFAULT_ORDER) -> Matrix:
+    """Compose T * R * S matrix from the channel values"""
+    r = get_rotation(rot, order)
+    return (
+        r[0] * scl[0], r[1] * scl[1], r[2] * scl[2], pos[0],
+        r[3] * scl[0], r[4] * scl[1], r[5] * scl[2], pos[1],
+        r[6] * scl[0], r[7] * scl[1], r[8] * scl[2], pos[2],
+    )
+
+
+def decompose(matrix: Matrix, order: int = DEFAULT_ORDER) -> Transforms:
+    """Decompose matrix without shear into the channel values, negative determinant goes to the x scale"""
+    m = matrix
+    scl = [math.sqrt(m[col] ** 2 + m[4 + col] ** 2 + m[8 + col] ** 2) for col in range(3)]
+    if get_determinant(m) < 0.0:
+        scl[0] = -scl[0]
+    r = tuple(m[row * 4 + col] / scl[col] if scl[col] else 0.0 for row in range(3) for col in range(3))
+
+    return (m[3], m[7], m[11]), get_euler(r, order), (scl[0], scl[1], scl[2])
+
+
+def get_euler(r: Rotation, order: int = DEFAULT_ORDER) -> Vector:
+    """Get rotation channel values in degrees of the rotation matrix Rk * Rj * Ri for the order i, j, k"""
+    i, j, k = ROTATION_AXES[order]
+    # odd axis permutations flip the signs of the sines
+    sign = 1.0 if (j - i) % 3 == 1 else -1.0
+    angles = [0.0, 0.0, 0.0]
+    angles[j] = math.asin(max(-1.0, min(1.0, -sign * r[k * 3 + i])))
+    if abs(math.cos(angles[j])) > GIMBAL_EPSILON:
+        angles[i] = math.atan2(sign * r[k * 3 + j], r[k * 3 + k])
+        angles[k] = math.atan2(sign * r[j * 3 + i], r[i * 3 + i])
+    else:
+        angles[i] = math.atan2(-sign * r[j * 3 + k], r[j * 3 + j])
+
+    return (math.degrees(angles[0]), math.degrees(angles[1]), math.degrees(angles[2]))
+
+
+def get_determinant(m: Matrix) -> float:
+    return (
+        m[0] * (m[5] * m[10] - m[6] * m[9])
+        - m[1] * (m[4] * m[10] - m[6] * m[8])
+        + m[2] * (m[4] * m[9] - m[5] * m[8])
+    )
+
+
+def multiply(a: Matrix, b: Matrix) -> Matrix:
+    """Get a * b, b applies first"""
+    result: list[float] = []
+    for row in range(3):
+        a0, a1, a2, a3 = a[row * 4:row * 4 + 4]
+        result.extend((
+            a0 * b[0] + a1 * b[4] + a2 * b[8],
+            a0 * b[1] + a1 * b[5] + a2 * b[9],
+            a0 * b[2] + a1 * b[6] + a2 * b[10],
+            a0 * b[3] + a1 * b[7] + a2 * b[11] + a3,
+        ))
+
+    return tuple(result)
+
+
+def inverse(m: Matrix) -> Matrix:
+    """Invert affine matrix
+
+    Raises:
+        ValueError: if the matrix is singular, zero scale for instance
+    """
+    determinant = get_determinant(m)
+    if not determinant:
+        raise ValueError('Singular transform matrix can\'t be inverted.')
+    a = (
+        (m[5] * m[10] - m[6] * m[9]) / determinant,
+        (m[2] * m[9] - m[1] * m[10]) / determinant,
+        (m[1] * m[6] - m[2] * m[5]) / determinant,
+        (m[6] * m[8] - m[4] * m[10]) / determinant,
+        (m[0] * m[10] - m[2] * m[8]) / determinant,
+        (m[2] * m[4] - m[0] * m[6]) / determinant,
+        (m[4] * m[9] - m[5] * m[8]) / determinant,
+        (m[1] * m[8] - m[0] * m[9]) / determinant,
+        (m[0] * m[5] - m[1] * m[4]) / determinant,
+    )
+    t = (m[3], m[7], m[11])
+    return tuple(
+        value
+        for row in range(3)
+        for value in (*a[row * 3:row * 3 + 3], -sum(a[row * 3 + col] * t[col] for col in range(3)))
+    )
+
+
+def get_local_transforms(world: Matrix, parent_world: Optional[Matrix], order: int = DEFAULT_ORDER) -> Transforms:
+    """Get channel values keeping the world matrix under the parent, the scene root if no parent world specified"""
+    if parent_world is None:
+        return decompose(world, order)
+    return decompose(multiply(inverse(parent_world), world), order)
+
+
+def convert_rotation_order(transforms: Transforms, order: int, new_order: int = DEFAULT_ORDER) -> Transforms:
+    """Get channel values of the same local matrix for the new rotation order"""
+    if order == new_order:
+        return transforms
+    pos, rot, scl = transforms
+    return pos, get_euler(get_rotation(rot, order), new_order), scl
+
+
+def get_pos_rot_matrix(matrix: Matrix) -> Matrix:
+    """Get the matrix with the scale dropped, the way position and rotation are matched to the item"""
+    pos, rot, _ = decompose(matrix)
+    return compose(pos, rot, (1.0, 1.0, 1.0))
+
+
+@dataclass
+class WorldMatrices():
+    """World matrices of the snapshot rows, every ancestor chain is composed once
+
+    The snapshot holds the rows with all of their ancestors, transforms, rotation orders and transform stacks.
+    """
+    snapshot: SceneSnapshot
+    matrices: dict[int, Matrix] = field(default_factory=dict)
+    exact: dict[int, bool] = field(default_factory=dict)
+
+    def get_local(self, row: int) -> Matrix:
+        return compose(*split_row(self.snapshot.transforms, row), self.snapshot.get_rotation_order(row))
+
+    def get(self, row: int) -> Matrix:
+        chain: list[int] = []
+        while row != NO_PARENT and row not in self.matrices:
+            chain.append(row)
+            row = self.snapshot.parents[row]
+
+        world = self.matrices.get(row) if row != NO_PARENT else None
+        for row in reversed(chain):
+            local = self.get_local(row)
+            world = self.matrices[row] = multiply(world, local) if world is not None else local
+
+        return world  # type: ignore
+
+    def get_parent(self, row: int) -> Optional[Matrix]:
+        parent = self.snapshot.parents[row]
+        return self.get(parent) if parent != NO_PARENT else None
+
+    def is_exact(self, row: int) -> bool:
+        """Check the world matrix of the row is covered by the pos/rot/scl channels of the row and its ancestors"""
+        chain: list[int] = []
+        while row != NO_PARENT and row not in self.exact:
+            chain.append(row)
+            row = self.snapshot.parents[row]
+
+        exact = self.exact.get(row, True) if row != NO_PARENT else True
+        for row in reversed(chain):
+            exact = self.exact[row] = exact and not self.snapshot.is_custom_stack(row)
+
+        return exact
@@ -0,0 +1,154 @@
+#!/usr/bin/python
+# ================================
+# (C)2026 Dmytro Holub
+# heap3d@gmail.com
+# --------------------------------
+# modo python
+# EMAG
+# batched transforms reader: reads pos/rot/scl channels for a list of items in a single channel read pass
+
+from array import array
+import math
+from typing import Sequence
+
+import lx
+import lxu.select
+import modo
+
+
+WIDTH = 9
+POS = slice(0, 3)
+ROT = slice(3, 6)
+SCL = slice(6, 9)
+IDENTITY = (0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 1.0, 1.0, 1.0)
+ORDER_CHANNEL = 'order'
+DEFAULT_ORDER = 0
+
+XFRM_CHANNELS = (
+    (lx.symbol.iXFRM_POSITION, ('pos.X', 'pos.Y', 'pos.Z'), POS.start, 1.0),
+    (lx.symbol.iXFRM_ROTATION, ('rot.X', 'rot.Y', 'rot.Z'), ROT.start, math.degrees(1.0)),
+    (lx.symbol.iXFRM_SCALE, ('scl.X', 'scl.Y', 'scl.Z'), SCL.start, 1.0),
+)
+
+Vector = tuple[float, float, float]
+Transforms = tuple[Vector, Vector, Vector]
+
+
+def read_transforms(items: Sequence[modo.Item]) -> array:
+    """Read local transforms of the items using one channel read object for the whole list
+
+    Args:
+        items (Sequence[modo.Item]): items to read transforms from
+
+    Returns:
+        array: flat N x 9 float array, one row per item: px py pz rx ry rz sx sy sz,
+        rotation is in degrees to match the transform.channel command values
+    """
+    transforms = array('d', IDENTITY * len(items))
+    if not items:
+        return transforms
+
+    chan_read = lxu.select.SceneSelection().current().Channels(lx.symbol.s_ACTIONLAYER_EDIT, 0.0)
+    channel_indices: dict[tuple[int, int], tuple[int, ...]] = dict()
+
+    for row, item in enumerate(items):
+        locator = lx.object.Locator(item.internalItem)
+        offset = row * WIDTH
+        for xfrm_type, channel_names, column, factor in XFRM_CHANNELS:
+            try:
+                xfrm = locator.GetTransformItem(xfrm_type)
+            except LookupError:
+                continue
+
+            key = (xfrm_type, xfrm.Type())
+            if key not in channel_indices:
+                channel_indices[key] = tuple(xfrm.ChannelLookup(name) for name in channel_names)
+
+            for axis, channel_index in enumerate(channel_indices[key]):
+                transforms[offset + column + axis] = chan_read.Double(xfrm, channel_index) * factor
+
+    return transforms
+
+
+def read_rotation_orders(items: Sequence[modo.Item]) -> array:
+    """Read rotation order channel values of the items using one channel read object for the whole list
+
+    Args:
+        items (Sequence[modo.Item]): items to read rotation orders from
+
+    Returns:
+        array: one rotation order per item, DEFAULT_ORDER for items without rotation transform
+    """
+    orders = array('B', bytes(len(items)))
+    if not items:
+        return orders
+
+    chan_read = lxu.select.SceneSelection().current().Channels(lx.symbol.s_ACTIONLAYER_EDIT, 0.0)
+    channel_indices: dict[int, int] = dict()
+
+    for row, item in enumerate(items):
+        try:
+            xfrm = lx.object.Locator(item.internalItem).GetTransformItem(lx.symbol.iXFRM_ROTATION)
+        except LookupError:
+            continue
+
+        xfrm_type = xfrm.Type()
+        if xfrm_type not in channel_indices:
+            channel_indices[xfrm_type] = xfrm.ChannelLookup(ORDER_CHANNEL)
+
+        orders[row] = chan_read.Integer(xfrm, channel_indices[xfrm_type])
+
+    return orders
+
+
+def read_custom_stacks(items: Sequence[modo.Item]) -> array:
+    """Flag the items whose transform stack holds more than the pos/rot/scl transform items
+
+    Pivots, center offsets and the transform items added by transform.zero or stacked transforms
+    are not covered by the pos/rot/scl channels, the local matrix of such items can't be composed from them.
+
+    Args:
+        items (Sequence[modo.Item]): items to check
+
+    Returns:
+        array: one flag per item, 1 for the custom transform stack
+    """
+    stacks = array('B', bytes(len(items)))
+    if not items:
+        return stacks
+
+    scene = lxu.select.SceneSelection().current()
+    graph = lx.object.ItemGraph(scene.GraphLookup(lx.symbol.sGRAPH_XFRMCORE))
+
+    for row, item in enumerate(items):
+        internal_item = item.internalItem
+        locator = lx.object.Locator(internal_item)
+        standard_count = 0
+        for xfrm_type, _, _, _ in XFRM_CHANNELS:
+            try:
+                locator.GetTransformItem(xfrm_type)
+            except LookupError:
+                continue
+            standard_count += 1
+
+        stacks[row] = graph.RevCount(internal_item) > standard_count
+
+    return stacks
+
+
+def get_row(transforms: array, row: int) -> tuple[float, ...]:
+    offset = row * WIDTH
+    return tuple(transforms[offset:offset + WIDTH])
+
+
+def split_row(transforms: array, row: int) -> Transforms:
+    values = get_row(transforms, row)
+    return (
+        values[POS],  # type: ignore
+        values[ROT],  # type: ignore
+        values[SCL],  # type: ignore
+    )
+
+
+def get_transforms(item: modo.Item) -> Transforms:
+    return split_row(read_transforms((item,)), 0)
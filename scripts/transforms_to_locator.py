@@ -11,18 +11,39 @@ import modo
 import modo.constants as c
 import lx
 
-from typing import Optional
+from array import array
+from collections import Counter
+from itertools import chain
+from typing import Iterable, Optional
 
-from h3d_utilites.scripts.h3d_utils import get_parent_index
+from h3d_utilites.scripts.h3d_utils import get_parent_index, parent_items_to
 import h3d_meshref_hierarchy_setup.scripts.h3d_kit_constants as h3dc
+from h3d_meshref_hierarchy_setup.scripts.transforms_reader import (
+    Transforms, read_transforms, split_row, get_transforms
+)
+from h3d_meshref_hierarchy_setup.scripts.transforms_math import (
+    Matrix, IDENTITY_TRANSFORMS, WorldMatrices, convert_rotation_order, get_local_transforms
+)
+from h3d_meshref_hierarchy_setup.scripts.scene_snapshot import (
+    SceneSnapshot, take_snapshot, get_items_with_ancestors, NO_PARENT
+)
+from h3d_meshref_hierarchy_setup.scripts.scene_operations import OperationPlan, ItemRef, execute_plan
+from h3d_meshref_hierarchy_setup.scripts.profiling import profile_command, phase
 
 
 LOCATOR_SUFFIX = ' loc'
 ARG_SELECTED = 'selected'
 ARG_FORCED_SELECTED = 'forced'
 ARG_EACH = 'each'
+MATCH_PRECISION = 3
 
+TransformsKey = tuple[float, ...]
+TransformsIndex = dict[TransformsKey, modo.Item]
+# mesh, planned locator to parent the mesh to if any, transforms key of the locator added for the mesh if matched
+DeferredMesh = tuple[modo.Item, Optional[ItemRef], Optional[TransformsKey]]
 
+
+@profile_command
 def main():
     actions = {
         ARG_SELECTED: selected_action,
@@ -38,7 +59,8 @@ def main():
 
     selected = modo.Scene().selected
     action = actions.get(arg, default_action)
-    new_locators = action()
+    with phase('convert', len(selected)):
+        new_locators = action()
 
     modo.Scene().deselect()
     if new_locators:
@@ -80,26 +102,8 @@ def each_action() -> tuple[modo.Item, ...]:
     return tuple(new_locators)
 
 
-def get_transforms(item: modo.Item) -> tuple[
-    tuple[float, float, float],
-    tuple[float, float, float],
-    tuple[float, float, float],
-]:
-    px = lx.eval(f'transform.channel pos.X ? item:{{{item.id}}}')
-    py = lx.eval(f'transform.channel pos.Y ? item:{{{item.id}}}')
-    pz = lx.eval(f'transform.channel pos.Z ? item:{{{item.id}}}')
-    rx = lx.eval(f'transform.channel rot.X ? item:{{{item.id}}}')
-    ry = lx.eval(f'transform.channel rot.Y ? item:{{{item.id}}}')
-    rz = lx.eval(f'transform.channel rot.Z ? item:{{{item.id}}}')
-    sx = lx.eval(f'transform.channel scl.X ? item:{{{item.id}}}')
-    sy = lx.eval(f'transform.channel scl.Y ? item:{{{item.id}}}')
-    sz = lx.eval(f'transform.channel scl.Z ? item:{{{item.id}}}')
-
-    return ((px, py, pz), (rx, ry, rz), (sx, sy, sz))  # type: ignore
-
-
-def is_nonzero_transforms(item: modo.Item) -> bool:
-    pos, rot, scl = get_transforms(item)
+def is_nonzero_transforms(item: modo.Item, transforms: Optional[Transforms] = None) -> bool:
+    pos, rot, scl = transforms if transforms else get_transforms(item)
 
     if any((*pos, *rot)):
         return True
@@ -111,17 +115,7 @@ def is_nonzero_transforms(item: modo.Item) -> bool:
 
 
 def is_transforms_matched(
-    transform1: tuple[
-        tuple[float, float, float],
-        tuple[float, float, float],
-        tuple[float, float, float],
-    ],
-    transform2: tuple[
-        tuple[float, float, float],
-        tuple[float, float, float],
-        tuple[float, float, float],
-    ],
-    precision: int = 3,
+    transform1: Transforms, transform2: Transforms, precision: int = MATCH_PRECISION
 ) -> bool:
     flat1 = [val for transform in transform1 for val in transform]
     flat2 = [val for transform in transform2 for val in transform]
@@ -136,29 +130,31 @@ def is_transforms_matched(
     return True
 
 
-def matched_item(item: modo.Item, items: list[modo.Item]) -> Optional[modo.Item]:
-    item_transforms = get_transforms(item)
-    for itemto in items:
-        itemto_transforms = get_transforms(itemto)
-
-        if is_transforms_matched(item_transforms, itemto_transforms):
-            return itemto
+def get_transforms_key(transforms: Transforms, precision: int = MATCH_PRECISION) -> TransformsKey:
+    """Quantize transforms the same way as is_transforms_matched does, equal keys mean matched transforms"""
+    return tuple(round(val, precision) for transform in transforms for val in transform)
 
-    return None
 
+def get_transforms_index(
+    items: list[modo.Item], precision: int = MATCH_PRECISION, items_transforms: Optional[array] = None
+) -> TransformsIndex:
+    """Build transforms index for the items, the first item wins for the same quantized transforms
 
-def match_item(item: modo.Item, itemto: modo.Item):
-    lx.eval(f'item.match item pos average:false item:{{{item.id}}} itemTo:{{{itemto.id}}}')
-    lx.eval(f'item.match item rot average:false item:{{{item.id}}} itemTo:{{{itemto.id}}}')
-    lx.eval(f'item.match item scl average:false item:{{{item.id}}} itemTo:{{{itemto.id}}}')
-
+    Args:
+        items (list[modo.Item]): items to index
+        precision (int): number of decimal digits to quantize transforms to
+        items_transforms (Optional[array]): pre-read transforms of the items, read from the items if not specified
 
-def parent(item: modo.Item, parent: Optional[modo.Item] = None, inplace: int = 1, position: int = 0):
-    if not parent:
-        lx.eval(f'item.parent item:{{{item.id}}} parent:{{}} position:{{{position}}} inPlace:{{{inplace}}}')
-        return
+    Returns:
+        TransformsIndex: quantized transforms key to item map
+    """
+    if items_transforms is None:
+        items_transforms = read_transforms(items)
+    transforms_index: TransformsIndex = dict()
+    for row, item in enumerate(items):
+        transforms_index.setdefault(get_transforms_key(split_row(items_transforms, row), precision), item)
 
-    lx.eval(f'item.parent item:{{{item.id}}} parent:{{{parent.id}}} position:{{{position}}} inPlace:{{{inplace}}}')
+    return transforms_index
 
 
 def is_hierarchy_setup_item(item: modo.Item) -> bool:
@@ -171,61 +167,183 @@ def is_hierarchy_setup_item(item: modo.Item) -> bool:
     return False
 
 
-def convert_transforms(meshes: list[modo.Mesh], locators: list[modo.Item]) -> list[modo.Item]:
-    working_locators = locators[:]
+def match_item(item: modo.Item, itemto: modo.Item):
+    lx.eval(f'item.match item pos average:false item:{{{item.id}}} itemTo:{{{itemto.id}}}')
+    lx.eval(f'item.match item rot average:false item:{{{item.id}}} itemTo:{{{itemto.id}}}')
+    lx.eval(f'item.match item scl average:false item:{{{item.id}}} itemTo:{{{itemto.id}}}')
+
+
+def take_transforms_snapshot(items: Iterable[modo.Item]) -> SceneSnapshot:
+    """Snapshot of the items and their ancestors with transforms, rotation orders and transform stacks"""
+    return take_snapshot(get_items_with_ancestors(items), rotation_orders=True, transform_stacks=True)
+
+
+def get_snapshot_transforms(snapshot: SceneSnapshot, items: Iterable[modo.Item]) -> array:
+    return array('d', chain.from_iterable(snapshot.get_transforms_row(row) for row in snapshot.get_rows(items)))
+
+
+def get_locator_operations(
+    meshes: list[modo.Item], locators: list[modo.Item], skip_unchanged: bool = False, match: bool = True
+) -> tuple[OperationPlan, list[DeferredMesh]]:
+    """Plan parenting each mesh to the locator with the same transforms, adding the locator if there is no such one
+
+    The operations are grouped: all locators are created, all meshes are moved to their locators,
+    then the new locators are inserted at the sibling indices precomputed from the snapshot
+    and the transforms are written. Inserts next to each other under the same parent merge into one reparent.
+    The new locator takes the mesh place and local transforms, the mesh under the matched locator
+    gets the local transforms keeping its world transforms, nothing is matched or parented in place.
+    The world matrices are composed of the pos/rot/scl channels only, the meshes with pivots or extra
+    transform items in their stack, or under the matched locator with such world, are deferred
+    to convert_deferred_meshes, which matches and parents them in place.
+
+    Args:
+        meshes (list[modo.Item]): meshes to convert
+        locators (list[modo.Item]): locators to match the meshes transforms to
+        skip_unchanged (bool): skip hierarchy setup meshes and meshes with zero transforms if enabled
+        match (bool): parent the meshes to the locators with the same transforms if enabled,
+            add a locator for each mesh otherwise
+
+    Returns:
+        tuple[OperationPlan, list[DeferredMesh]]: planned operations, deferred meshes in the processing order
+    """
+    snapshot = take_transforms_snapshot([*meshes, *locators])
+    worlds = WorldMatrices(snapshot)
+    operations = OperationPlan()
+    # None for the locators added by the deferred meshes
+    transforms_index: dict[TransformsKey, Optional[ItemRef]] = dict()
+    if match:
+        locators_index = get_transforms_index(locators, items_transforms=get_snapshot_transforms(snapshot, locators))
+        transforms_index = {key: operations.add_item(locator) for key, locator in locators_index.items()}
+    # world transforms stay the same, the new locators take the world matrices of their meshes,
+    # only the exact world matrices are kept
+    locator_worlds: dict[ItemRef, Matrix] = dict()
+    # new locators by snapshot parent row with the sibling index of their mesh
+    inserts: list[tuple[int, int, ItemRef]] = []
+    # sibling indices of the meshes leaving their parent with no locator taking the place, by parent row
+    removed: dict[int, list[int]] = dict()
+    # count of the meshes moved in front of the children of the matched locators, by locator row
+    prepended: Counter[int] = Counter()
+    moves: list[tuple[ItemRef, ItemRef]] = []
+    transforms: list[tuple[ItemRef, Transforms, Transforms]] = []
+    deferred: list[DeferredMesh] = []
 
     for mesh in meshes:
-        if is_hierarchy_setup_item(mesh):
+        row = snapshot.get_row(mesh)
+        mesh_transforms = split_row(snapshot.transforms, row)
+        if skip_unchanged and (is_hierarchy_setup_item(mesh) or not is_nonzero_transforms(mesh, mesh_transforms)):
             continue
 
-        if not is_nonzero_transforms(mesh):
+        transforms_key = get_transforms_key(mesh_transforms)
+        if match and transforms_key in transforms_index:
+            locator = transforms_index[transforms_key]
+            if isinstance(locator, int) and locator not in locator_worlds:
+                locator_row = snapshot.get_row(operations.items[locator])
+                if worlds.is_exact(locator_row):
+                    locator_worlds[locator] = worlds.get(locator_row)
+            if locator is None or locator not in locator_worlds or not worlds.is_exact(row):
+                deferred.append((mesh, locator, transforms_key))
+                continue
+
+            if isinstance(locator, int):
+                prepended[snapshot.get_row(operations.items[locator])] += 1
+            removed.setdefault(snapshot.parents[row], []).append(snapshot.parent_indices[row])
+            local = get_local_transforms(worlds.get(row), locator_worlds[locator], snapshot.get_rotation_order(row))
+            transforms.append((operations.add_item(mesh), mesh_transforms, local))
+            moves.append((operations.add_item(mesh), locator))
             continue
 
-        locator = matched_item(mesh, working_locators)
-        if not locator:
-            locator = modo.Scene().addItem(itype=c.LOCATOR_TYPE)
-            locator.name = mesh.name + LOCATOR_SUFFIX
-            match_item(locator, mesh)
-            parent(locator, position=get_parent_index(mesh))
-            working_locators.append(locator)
+        if snapshot.is_custom_stack(row):
+            deferred.append((mesh, None, transforms_key if match else None))
+            transforms_index[transforms_key] = None
+            continue
 
-        parent(mesh, locator)
+        name = str(snapshot.names[row])
+        ref = operations.add_item(mesh, name)
+        locator = operations.create(c.LOCATOR_TYPE, f'{name}{LOCATOR_SUFFIX}')
+        inserts.append((snapshot.parents[row], snapshot.parent_indices[row], locator))
+        if worlds.is_exact(row):
+            locator_worlds[locator] = worlds.get(row)
+        transforms_index[transforms_key] = locator
+        local = convert_rotation_order(mesh_transforms, snapshot.get_rotation_order(row))
+        transforms.append((locator, IDENTITY_TRANSFORMS, local))
+        transforms.append((ref, mesh_transforms, IDENTITY_TRANSFORMS))
+        moves.append((ref, locator))
+
+    for item, locator in moves:
+        operations.reparent((item,), locator, inplace=False)
+
+    for parent_row, index, locator in sorted(
+        (parent_row, get_insert_index(index, removed.get(parent_row, ()), prepended[parent_row]), locator)
+        for parent_row, index, locator in inserts
+    ):
+        parent_ref = operations.add_item(snapshot.items[parent_row]) if parent_row != NO_PARENT else None
+        operations.reparent((locator,), parent_ref, index, inplace=False)
 
-    return working_locators[len(locators):]
+    for item, current, item_transforms in transforms:
+        operations.set_changed_transforms(item, current, item_transforms)
 
+    return operations, deferred
 
-def convert_transforms_forced(meshes: list[modo.Mesh], locators: list[modo.Item]) -> list[modo.Item]:
-    working_locators = locators[:]
 
-    for mesh in meshes:
-        locator = matched_item(mesh, working_locators)
-        if not locator:
-            locator = modo.Scene().addItem(itype=c.LOCATOR_TYPE)
-            locator.name = mesh.name + LOCATOR_SUFFIX
+def get_insert_index(index: int, removed: Iterable[int], prepended: int) -> int:
+    """Get the sibling index of the mesh after the moves: the removed siblings before it shift it back,
+    the meshes moved in front of the children shift it forward"""
+    return index - sum(1 for removed_index in removed if removed_index < index) + prepended
+
+
+def convert_deferred_meshes(
+    deferred: Iterable[DeferredMesh], operations: OperationPlan, created: dict[str, modo.Item]
+) -> list[modo.Item]:
+    """Match the locators to the deferred meshes and parent in place one by one after the plan is executed
+
+    The planned operations keep the world transforms, the deferred meshes are converted against the live scene.
+
+    Returns:
+        list[modo.Item]: added locators
+    """
+    new_locators: list[modo.Item] = []
+    live_locators: dict[TransformsKey, modo.Item] = dict()
+    for mesh, locator_ref, transforms_key in deferred:
+        if locator_ref is not None:
+            locator = operations.items[locator_ref] if isinstance(locator_ref, int) else created[locator_ref]
+        else:
+            locator = live_locators.get(transforms_key) if transforms_key is not None else None
+        if locator is None:
+            locator = modo.Scene().addItem(itype=c.LOCATOR_TYPE, name=f'{mesh.name}{LOCATOR_SUFFIX}')
             match_item(locator, mesh)
-            parent(locator, mesh.parent, position=get_parent_index(mesh))
-            working_locators.append(locator)
+            parent_items_to((locator,), mesh.parent, get_parent_index(mesh))
+            new_locators.append(locator)
+            if transforms_key is not None:
+                live_locators[transforms_key] = locator
+        parent_items_to((mesh,), locator)
+
+    return new_locators
 
-        parent(mesh, locator)
 
-    return working_locators[len(locators):]
+def convert_locator_operations(operations: OperationPlan, deferred: list[DeferredMesh]) -> list[modo.Item]:
+    with phase('execute', len(operations)):
+        created = execute_plan(operations)
+
+    with phase('deferred', len(deferred)):
+        return [*created.values(), *convert_deferred_meshes(deferred, operations, created)]
+
+
+def convert_transforms(meshes: list[modo.Mesh], locators: list[modo.Item]) -> list[modo.Item]:
+    with phase('plan', len(meshes)):
+        operations, deferred = get_locator_operations(meshes, locators, skip_unchanged=True)  # type: ignore
+    return convert_locator_operations(operations, deferred)
+
+
+def convert_transforms_forced(meshes: list[modo.Mesh], locators: list[modo.Item]) -> list[modo.Item]:
+    with phase('plan', len(meshes)):
+        operations, deferred = get_locator_operations(meshes, locators)  # type: ignore
+    return convert_locator_operations(operations, deferred)
 
 
 def convert_transforms_each(meshes: list[modo.Mesh]) -> list[modo.Item]:
-    working_locators = []
-    for mesh in meshes:
-        locator = modo.Scene().addItem(itype=c.LOCATOR_TYPE)
-        locator.name = mesh.name + LOCATOR_SUFFIX
-        match_item(locator, mesh)
-        parent(locator, mesh.parent, position=get_parent_index(mesh))
-        # children = mesh.children()
-        # for child in children:
-        #     parent(child, locator, position=get_parent_index(child))
-        working_locators.append(locator)
-
-        parent(mesh, locator)
-
-    return working_locators
+    with phase('plan', len(meshes)):
+        operations, deferred = get_locator_operations(meshes, [], match=False)  # type: ignore
+    return convert_locator_operations(operations, deferred)
 
 
 def get_meshes():
@@ -0,0 +1,68 @@
+#!/usr/bin/python
+# ================================
+# (C)2026 Dmytro Holub
+# heap3d@gmail.com
+# --------------------------------
+# kit tests
+# EMAG
+# delta saves on the headless backend
+# usage:
+# python -m pytest tests
+
+import contextlib
+import io
+import os
+
+import headless
+
+headless.install()
+
+from headless.fake_modo import Item  # noqa: E402
+from scripts.load_selected_item_info import load_items_info  # noqa: E402
+from scripts.item_info_delta import read_fingerprints  # noqa: E402
+
+
+SAVE_ALL_MODULE = 'scripts.save_all_items_info'
+SAVE_SELECTED_MODULE = 'scripts.save_item_info'
+DELTA_ARG = 'delta'
+
+
+def build_scene(path: str) -> list[Item]:
+    headless.new_scene('delta.lxo', os.path.join(path, 'delta.lxo'))
+    root = headless.add_item(headless.LOCATOR_TYPE, 'root')
+    return [root, *(headless.add_item(headless.MESH_TYPE, f'mesh_{index}', parent=root) for index in range(4))]
+
+
+def save(module: str, filename: str, *args: str) -> str:
+    with contextlib.redirect_stdout(io.StringIO()) as output:
+        headless.run(module, *args, fileSave=filename)
+    return output.getvalue()
+
+
+def test_delta_save_of_selection_keeps_other_records(tmp_path):
+    root, *meshes = build_scene(str(tmp_path))
+    filename = str(tmp_path / 'info.txt')
+    save(SAVE_ALL_MODULE, filename)
+
+    meshes[0]._data.pos = [1.0, 2.0, 3.0]
+    headless.select(meshes[:1])
+    output = save(SAVE_SELECTED_MODULE, filename, DELTA_ARG)
+
+    assert '1 changed, 0 removed' in output
+    items_info = load_items_info(filename)
+    assert set(items_info) == {'root', 'mesh_0', 'mesh_1', 'mesh_2', 'mesh_3'}
+    assert tuple(items_info['mesh_0'].pos) == (1.0, 2.0, 3.0)
+    assert items_info['mesh_3'].hierarchy == ['root']
+    assert set(read_fingerprints(filename)) == set(items_info)
+
+
+def test_delta_save_of_whole_scene_removes_missing_records(tmp_path):
+    root, *meshes = build_scene(str(tmp_path))
+    filename = str(tmp_path / 'info.txt')
+    save(SAVE_ALL_MODULE, filename)
+
+    meshes[-1]._data.name = 'renamed'
+    output = save(SAVE_ALL_MODULE, filename, DELTA_ARG)
+
+    assert '1 changed, 1 removed' in output
+    assert set(load_items_info(filename)) == {'root', 'mesh_0', 'mesh_1', 'mesh_2', 'renamed'}